@@ -1,47 +1,62 @@
 import frappe
 import json
-from ..utils import _require_admin
+from ..utils import _require_admin, list_page
 
 
 @frappe.whitelist()
-def get_all_units(limit_start: int = 0, limit_page_length: int = 20):
+def get_all_units(
+    limit_start: int = 0,
+    limit_page_length: int = 20,
+    cursor: str = None,
+):
     """
     Retrieves a list of all shop units on the platform (for admins).
     """
     _require_admin()
-    return frappe.get_list(
+    return list_page(
         "Shop Unit",
         fields=["name", "shop", "active"],
-        offset=limit_start,
-        limit=limit_page_length,
+        cursor=cursor,
+        limit_start=limit_start,
+        limit_page_length=limit_page_length,
     )
 
 
 @frappe.whitelist()
-def get_all_tags(limit_start: int = 0, limit_page_length: int = 20):
+def get_all_tags(
+    limit_start: int = 0,
+    limit_page_length: int = 20,
+    cursor: str = None,
+):
     """
     Retrieves a list of all shop tags on the platform (for admins).
     """
     _require_admin()
-    return frappe.get_list(
+    return list_page(
         "Shop Tag",
         fields=["name", "shop"],
-        offset=limit_start,
-        limit=limit_page_length,
+        cursor=cursor,
+        limit_start=limit_start,
+        limit_page_length=limit_page_length,
     )
 
 
 @frappe.whitelist()
-def get_all_points(limit_start: int = 0, limit_page_length: int = 20):
+def get_all_points(
+    limit_start: int = 0,
+    limit_page_length: int = 20,
+    cursor: str = None,
+):
     """
     Retrieves a list of all points on the platform (for admins).
     """
     _require_admin()
-    return frappe.get_list(
+    return list_page(
         "Point",
         fields=["name", "user", "points", "reason"],
-        offset=limit_start,
-        limit=limit_page_length,
+        cursor=cursor,
+        limit_start=limit_start,
+        limit_page_length=limit_page_length,
     )
 
 
@@ -88,30 +103,40 @@ def delete_point(point_name):
 
 
 @frappe.whitelist()
-def get_all_translations(limit_start: int = 0, limit_page_length: int = 20):
+def get_all_translations(
+    limit_start: int = 0,
+    limit_page_length: int = 20,
+    cursor: str = None,
+):
     """
     Retrieves a list of all translations on the platform (for admins).
     """
     _require_admin()
-    return frappe.get_list(
+    return list_page(
         "Translation",
         fields=["name", "language", "source_text", "translated_text"],
-        offset=limit_start,
-        limit=limit_page_length,
+        cursor=cursor,
+        limit_start=limit_start,
+        limit_page_length=limit_page_length,
     )
 
 
 @frappe.whitelist()
-def get_all_referrals(limit_start: int = 0, limit_page_length: int = 20):
+def get_all_referrals(
+    limit_start: int = 0,
+    limit_page_length: int = 20,
+    cursor: str = None,
+):
     """
     Retrieves a list of all referrals on the platform (for admins).
     """
     _require_admin()
-    return frappe.get_list(
+    return list_page(
         "Referral",
         fields=["name", "referrer", "referred_user", "referral_code"],
-        offset=limit_start,
-        limit=limit_page_length,
+        cursor=cursor,
+        limit_start=limit_start,
+        limit_page_length=limit_page_length,
     )
 
 
@@ -140,46 +165,57 @@ def delete_referral(referral_name):
 
 
 @frappe.whitelist()
-def get_all_shop_tags(limit_start: int = 0, limit_page_length: int = 20):
+def get_all_shop_tags(
+    limit_start: int = 0,
+    limit_page_length: int = 20,
+    cursor: str = None,
+):
     """
     Retrieves a list of all shop tags on the platform (for admins).
     """
     _require_admin()
-    return frappe.get_list(
+    return list_page(
         "Shop Tag",
         fields=["name", "shop"],
-        offset=limit_start,
-        limit=limit_page_length,
+        cursor=cursor,
+        limit_start=limit_start,
+        limit_page_length=limit_page_length,
     )
 
 
 @frappe.whitelist()
 def get_all_product_extra_groups(
-    limit_start: int = 0, limit_page_length: int = 20
+    limit_start: int = 0,
+    limit_page_length: int = 20,
+    cursor: str = None,
 ):
     """
     Retrieves a list of all product extra groups on the platform (for admins).
     """
     _require_admin()
-    return frappe.get_list(
+    return list_page(
         "Product Extra Group",
         fields=["name", "shop"],
-        offset=limit_start,
-        limit=limit_page_length,
+        cursor=cursor,
+        limit_start=limit_start,
+        limit_page_length=limit_page_length,
     )
 
 
 @frappe.whitelist()
 def get_all_product_extra_values(
-    limit_start: int = 0, limit_page_length: int = 20
+    limit_start: int = 0,
+    limit_page_length: int = 20,
+    cursor: str = None,
 ):
     """
     Retrieves a list of all product extra values on the platform (for admins).
     """
     _require_admin()
-    return frappe.get_list(
+    return list_page(
         "Product Extra Value",
         fields=["name", "product_extra_group", "value", "price"],
-        offset=limit_start,
-        limit=limit_page_length,
+        cursor=cursor,
+        limit_start=limit_start,
+        limit_page_length=limit_page_length,
     )
@@ -1,6 +1,6 @@
 import frappe
 import json
-from ..utils import _require_admin
+from ..utils import _require_admin, list_page
 
 
 @frappe.whitelist()
@@ -90,16 +90,21 @@ def delete_parcel_order_setting(setting_name):
 
 
 @frappe.whitelist()
-def get_all_delivery_zones(limit_start: int = 0, limit_page_length: int = 20):
+def get_all_delivery_zones(
+    limit_start: int = 0,
+    limit_page_length: int = 20,
+    cursor: str = None,
+):
     """
     Retrieves a list of all delivery zones on the platform (for admins).
     """
     _require_admin()
-    return frappe.get_list(
+    return list_page(
         "Delivery Zone",
         fields=["name", "shop"],
-        offset=limit_start,
-        limit=limit_page_length,
+        cursor=cursor,
+        limit_start=limit_start,
+        limit_page_length=limit_page_length,
     )
 
 
@@ -167,29 +172,34 @@ def delete_delivery_vehicle_type(type_name):
 
 @frappe.whitelist()
 def get_all_delivery_man_delivery_zones(
-    limit_start: int = 0, limit_page_length: int = 20
+    limit_start: int = 0,
+    limit_page_length: int = 20,
+    cursor: str = None,
 ):
     """
     Retrieves a list of all delivery man delivery zones on the platform (for admins).
     """
     _require_admin()
-    return frappe.get_list(
+    return list_page(
         "Deliveryman Delivery Zone",
         fields=["name", "deliveryman", "delivery_zone"],
-        offset=limit_start,
-        limit=limit_page_length,
+        cursor=cursor,
+        limit_start=limit_start,
+        limit_page_length=limit_page_length,
     )
 
 
 @frappe.whitelist()
 def get_all_shop_working_days(
-    limit_start: int = 0, limit_page_length: int = 20
+    limit_start: int = 0,
+    limit_page_length: int = 20,
+    cursor: str = None,
 ):
     """
     Retrieves a list of all shop working days on the platform (for admins).
     """
     _require_admin()
-    return frappe.get_list(
+    return list_page(
         "Shop Working Day",
         fields=[
             "name",
@@ -199,22 +209,26 @@ def get_all_shop_working_days(
             "closing_time",
             "is_closed",
         ],
-        offset=limit_start,
-        limit=limit_page_length,
+        cursor=cursor,
+        limit_start=limit_start,
+        limit_page_length=limit_page_length,
     )
 
 
 @frappe.whitelist()
 def get_all_shop_closed_days(
-    limit_start: int = 0, limit_page_length: int = 20
+    limit_start: int = 0,
+    limit_page_length: int = 20,
+    cursor: str = None,
 ):
     """
     Retrieves a list of all shop closed days on the platform (for admins).
     """
     _require_admin()
-    return frappe.get_list(
+    return list_page(
         "Shop Closed Day",
         fields=["name", "shop", "date"],
-        offset=limit_start,
-        limit=limit_page_length,
+        cursor=cursor,
+        limit_start=limit_start,
+        limit_page_length=limit_page_length,
     )
@@ -1,33 +1,43 @@
 import frappe
 import json
-from ..utils import _require_admin
+from ..utils import _require_admin, list_page
 
 
 @frappe.whitelist()
-def get_all_shops(limit_start: int = 0, limit_page_length: int = 20):
+def get_all_shops(
+    limit_start: int = 0,
+    limit_page_length: int = 20,
+    cursor: str = None,
+):
     """
     Retrieves a list of all shops on the platform (for admins).
     """
     _require_admin()
-    return frappe.get_list(
+    return list_page(
         "Shop",
         fields=["name", "shop_name", "user", "shop_type", "is_ecommerce"],
-        offset=limit_start,
-        limit=limit_page_length,
+        cursor=cursor,
+        limit_start=limit_start,
+        limit_page_length=limit_page_length,
     )
 
 
 @frappe.whitelist()
-def get_all_roles(limit_start: int = 0, limit_page_length: int = 20):
+def get_all_roles(
+    limit_start: int = 0,
+    limit_page_length: int = 20,
+    cursor: str = None,
+):
     """
     Retrieves a list of all roles on the platform (for admins).
     """
     _require_admin()
-    return frappe.get_list(
+    return list_page(
         "Role",
         fields=["name", "role_name"],
-        offset=limit_start,
-        limit=limit_page_length,
+        cursor=cursor,
+        limit_start=limit_start,
+        limit_page_length=limit_page_length,
     )
 
 
@@ -71,14 +81,19 @@ def delete_shop(shop_name):
 
 
 @frappe.whitelist()
-def get_all_users(limit_start: int = 0, limit_page_length: int = 20):
+def get_all_users(
+    limit_start: int = 0,
+    limit_page_length: int = 20,
+    cursor: str = None,
+):
     """
     Retrieves a list of all users on the platform (for admins).
     """
     _require_admin()
-    return frappe.get_list(
+    return list_page(
         "User",
         fields=["name", "full_name", "email", "enabled"],
-        offset=limit_start,
-        limit=limit_page_length,
+        cursor=cursor,
+        limit_start=limit_start,
+        limit_page_length=limit_page_length,
     )
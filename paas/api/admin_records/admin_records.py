@@ -1,6 +1,6 @@
 import frappe
 import json
-from ..utils import _require_admin
+from ..utils import _require_admin, list_page
 
 
 @frappe.whitelist()
@@ -10,6 +10,7 @@ def get_all_orders(
     status: str = None,
     from_date: str = None,
     to_date: str = None,
+    cursor: str = None,
 ):
     """
     Retrieves a list of all orders on the platform (for admins).
@@ -22,12 +23,13 @@ def get_all_orders(
     if from_date and to_date:
         filters["creation"] = ["between", [from_date, to_date]]
 
-    orders = frappe.get_list(
+    orders = list_page(
         "Order",
         filters=filters,
         fields=["name", "user", "shop", "grand_total", "status", "creation"],
-        offset=limit_start,
-        limit=limit_page_length,
+        cursor=cursor,
+        limit_start=limit_start,
+        limit_page_length=limit_page_length,
         order_by="creation desc",
     )
     return orders
@@ -40,6 +42,7 @@ def get_all_parcel_orders(
     status: str = None,
     from_date: str = None,
     to_date: str = None,
+    cursor: str = None,
 ):
     """
     Retrieves a list of all parcel orders on the platform (for admins).
@@ -52,7 +55,7 @@ def get_all_parcel_orders(
     if from_date and to_date:
         filters["creation"] = ["between", [from_date, to_date]]
 
-    parcel_orders = frappe.get_list(
+    parcel_orders = list_page(
         "Parcel Order",
         filters=filters,
         fields=[
@@ -63,8 +66,9 @@ def get_all_parcel_orders(
             "delivery_date",
             "deliveryman",
         ],
-        offset=limit_start,
-        limit=limit_page_length,
+        cursor=cursor,
+        limit_start=limit_start,
+        limit_page_length=limit_page_length,
         order_by="creation desc",
     )
     return parcel_orders
@@ -106,12 +110,16 @@ def assign_deliveryman_to_parcel(parcel_order_id, deliveryman_id):
 
 
 @frappe.whitelist()
-def get_all_reviews(limit_start: int = 0, limit_page_length: int = 20):
+def get_all_reviews(
+    limit_start: int = 0,
+    limit_page_length: int = 20,
+    cursor: str = None,
+):
     """
     Retrieves a list of all reviews on the platform (for admins).
     """
     _require_admin()
-    return frappe.get_list(
+    return list_page(
         "Review",
         fields=[
             "name",
@@ -123,8 +131,9 @@ def get_all_reviews(limit_start: int = 0, limit_page_length: int = 20):
             "reviewable_id",
             "published",
         ],
-        offset=limit_start,
-        limit=limit_page_length,
+        cursor=cursor,
+        limit_start=limit_start,
+        limit_page_length=limit_page_length,
         order_by="creation desc",
     )
 
@@ -155,16 +164,21 @@ def delete_admin_review(review_name):
 
 
 @frappe.whitelist()
-def get_all_tickets(limit_start: int = 0, limit_page_length: int = 20):
+def get_all_tickets(
+    limit_start: int = 0,
+    limit_page_length: int = 20,
+    cursor: str = None,
+):
     """
     Retrieves a list of all tickets on the platform (for admins).
     """
     _require_admin()
-    return frappe.get_list(
+    return list_page(
         "Ticket",
         fields=["name", "subject", "status", "creation", "user"],
-        offset=limit_start,
-        limit=limit_page_length,
+        cursor=cursor,
+        limit_start=limit_start,
+        limit_page_length=limit_page_length,
         order_by="creation desc",
     )
 
@@ -185,16 +199,21 @@ def update_admin_ticket(ticket_name, ticket_data):
 
 
 @frappe.whitelist()
-def get_all_order_refunds(limit_start: int = 0, limit_page_length: int = 20):
+def get_all_order_refunds(
+    limit_start: int = 0,
+    limit_page_length: int = 20,
+    cursor: str = None,
+):
     """
     Retrieves a list of all order refunds on the platform (for admins).
     """
     _require_admin()
-    return frappe.get_list(
+    return list_page(
         "Order Refund",
         fields=["name", "order", "status", "cause", "answer"],
-        offset=limit_start,
-        limit=limit_page_length,
+        cursor=cursor,
+        limit_start=limit_start,
+        limit_page_length=limit_page_length,
         order_by="creation desc",
     )
 
@@ -220,12 +239,16 @@ def update_admin_order_refund(refund_name, status, answer=None):
 
 
 @frappe.whitelist()
-def get_all_notifications(limit_start: int = 0, limit_page_length: int = 20):
+def get_all_notifications(
+    limit_start: int = 0,
+    limit_page_length: int = 20,
+    cursor: str = None,
+):
     """
     Retrieves a list of all notifications on the platform (for admins).
     """
     _require_admin()
-    return frappe.get_list(
+    return list_page(
         "Notification Log",
         fields=[
             "name",
@@ -235,19 +258,24 @@ def get_all_notifications(limit_start: int = 0, limit_page_length: int = 20):
             "for_user",
             "creation",
         ],
-        offset=limit_start,
-        limit=limit_page_length,
+        cursor=cursor,
+        limit_start=limit_start,
+        limit_page_length=limit_page_length,
         order_by="creation desc",
     )
 
 
 @frappe.whitelist()
-def get_all_bookings(limit_start: int = 0, limit_page_length: int = 20):
+def get_all_bookings(
+    limit_start: int = 0,
+    limit_page_length: int = 20,
+    cursor: str = None,
+):
     """
     Retrieves a list of all bookings on the platform (for admins).
     """
     _require_admin()
-    return frappe.get_list(
+    return list_page(
         "Booking",
         fields=[
             "name",
@@ -257,8 +285,9 @@ def get_all_bookings(limit_start: int = 0, limit_page_length: int = 20):
             "number_of_guests",
             "status",
         ],
-        offset=limit_start,
-        limit=limit_page_length,
+        cursor=cursor,
+        limit_start=limit_start,
+        limit_page_length=limit_page_length,
         order_by="booking_date desc",
     )
 
@@ -303,27 +332,36 @@ def delete_booking(booking_name):
 
 
 @frappe.whitelist()
-def get_all_order_statuses(limit_start: int = 0, limit_page_length: int = 20):
+def get_all_order_statuses(
+    limit_start: int = 0,
+    limit_page_length: int = 20,
+    cursor: str = None,
+):
     """
     Retrieves a list of all order statuses on the platform (for admins).
     """
     _require_admin()
-    return frappe.get_list(
+    return list_page(
         "Order Status",
         fields=["name", "status_name", "is_active", "sort_order"],
-        offset=limit_start,
-        limit=limit_page_length,
+        cursor=cursor,
+        limit_start=limit_start,
+        limit_page_length=limit_page_length,
         order_by="sort_order",
     )
 
 
 @frappe.whitelist()
-def get_all_request_models(limit_start: int = 0, limit_page_length: int = 20):
+def get_all_request_models(
+    limit_start: int = 0,
+    limit_page_length: int = 20,
+    cursor: str = None,
+):
     """
     Retrieves a list of all request models on the platform (for admins).
     """
     _require_admin()
-    return frappe.get_list(
+    return list_page(
         "Request Model",
         fields=[
             "name",
@@ -333,7 +371,8 @@ def get_all_request_models(limit_start: int = 0, limit_page_length: int = 20):
             "created_by_user",
             "created_at",
         ],
-        offset=limit_start,
-        limit=limit_page_length,
+        cursor=cursor,
+        limit_start=limit_start,
+        limit_page_length=limit_page_length,
         order_by="creation desc",
     )
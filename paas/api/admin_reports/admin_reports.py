@@ -1,6 +1,6 @@
 import frappe
 import json
-from ..utils import _require_admin
+from ..utils import _require_admin, list_page
 
 
 @frappe.whitelist()
@@ -172,28 +172,35 @@ def get_admin_report(
 
 @frappe.whitelist()
 def get_all_wallet_histories(
-    limit_start: int = 0, limit_page_length: int = 20
+    limit_start: int = 0,
+    limit_page_length: int = 20,
+    cursor: str = None,
 ):
     """
     Retrieves a list of all wallet histories on the platform (for admins).
     """
     _require_admin()
-    return frappe.get_list(
+    return list_page(
         "Wallet History",
         fields=["name", "wallet", "type", "price", "status", "created_at"],
-        offset=limit_start,
-        limit=limit_page_length,
+        cursor=cursor,
+        limit_start=limit_start,
+        limit_page_length=limit_page_length,
         order_by="creation desc",
     )
 
 
 @frappe.whitelist()
-def get_all_transactions(limit_start: int = 0, limit_page_length: int = 20):
+def get_all_transactions(
+    limit_start: int = 0,
+    limit_page_length: int = 20,
+    cursor: str = None,
+):
     """
     Retrieves a list of all transactions on the platform (for admins).
     """
     _require_admin()
-    return frappe.get_list(
+    return list_page(
         "Transaction",
         fields=[
             "name",
@@ -204,37 +211,48 @@ def get_all_transactions(limit_start: int = 0, limit_page_length: int = 20):
             "credit",
             "currency",
         ],
-        offset=limit_start,
-        limit=limit_page_length,
+        cursor=cursor,
+        limit_start=limit_start,
+        limit_page_length=limit_page_length,
         order_by="creation desc",
     )
 
 
 @frappe.whitelist()
-def get_all_seller_payouts(limit_start: int = 0, limit_page_length: int = 20):
+def get_all_seller_payouts(
+    limit_start: int = 0,
+    limit_page_length: int = 20,
+    cursor: str = None,
+):
     """
     Retrieves a list of all seller payouts on the platform (for admins).
     """
     _require_admin()
-    return frappe.get_list(
+    return list_page(
         "Seller Payout",
         fields=["name", "shop", "amount", "payout_date", "status"],
-        offset=limit_start,
-        limit=limit_page_length,
+        cursor=cursor,
+        limit_start=limit_start,
+        limit_page_length=limit_page_length,
         order_by="payout_date desc",
     )
 
 
 @frappe.whitelist()
-def get_all_shop_bonuses(limit_start: int = 0, limit_page_length: int = 20):
+def get_all_shop_bonuses(
+    limit_start: int = 0,
+    limit_page_length: int = 20,
+    cursor: str = None,
+):
     """
     Retrieves a list of all shop bonuses on the platform (for admins).
     """
     _require_admin()
-    return frappe.get_list(
+    return list_page(
         "Shop Bonus",
         fields=["name", "shop", "amount", "bonus_date", "reason"],
-        offset=limit_start,
-        limit=limit_page_length,
+        cursor=cursor,
+        limit_start=limit_start,
+        limit_page_length=limit_page_length,
         order_by="bonus_date desc",
     )
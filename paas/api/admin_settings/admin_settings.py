@@ -1,19 +1,24 @@
 import frappe
 import json
-from ..utils import _require_admin
+from ..utils import _require_admin, list_page
 
 
 @frappe.whitelist()
-def get_all_languages(limit_start: int = 0, limit_page_length: int = 20):
+def get_all_languages(
+    limit_start: int = 0,
+    limit_page_length: int = 20,
+    cursor: str = None,
+):
     """
     Retrieves a list of all languages (for admins).
     """
     _require_admin()
-    return frappe.get_list(
+    return list_page(
         "Language",
         fields=["name", "language_name", "enabled"],
-        offset=limit_start,
-        limit=limit_page_length,
+        cursor=cursor,
+        limit_start=limit_start,
+        limit_page_length=limit_page_length,
     )
 
 
@@ -33,16 +38,21 @@ def update_language(language_name, language_data):
 
 
 @frappe.whitelist()
-def get_all_currencies(limit_start: int = 0, limit_page_length: int = 20):
+def get_all_currencies(
+    limit_start: int = 0,
+    limit_page_length: int = 20,
+    cursor: str = None,
+):
     """
     Retrieves a list of all currencies (for admins).
     """
     _require_admin()
-    return frappe.get_list(
+    return list_page(
         "Currency",
         fields=["name", "currency_name", "symbol", "enabled"],
-        offset=limit_start,
-        limit=limit_page_length,
+        cursor=cursor,
+        limit_start=limit_start,
+        limit_page_length=limit_page_length,
     )
 
 
@@ -86,16 +96,21 @@ def update_email_settings(settings_data):
 
 
 @frappe.whitelist()
-def get_all_email_templates(limit_start: int = 0, limit_page_length: int = 20):
+def get_all_email_templates(
+    limit_start: int = 0,
+    limit_page_length: int = 20,
+    cursor: str = None,
+):
     """
     Retrieves a list of all email templates on the platform (for admins).
     """
     _require_admin()
-    return frappe.get_list(
+    return list_page(
         "Email Template",
         fields=["name", "subject", "response"],
-        offset=limit_start,
-        limit=limit_page_length,
+        cursor=cursor,
+        limit_start=limit_start,
+        limit_page_length=limit_page_length,
     )
 
 
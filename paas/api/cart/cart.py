@@ -1,4 +1,8 @@
 import frappe
+import json
+from frappe.utils import cint, flt
+from paas import cart_store
+from paas.stock import get_product_prices
 
 
 @frappe.whitelist()
@@ -10,13 +14,11 @@ def get_cart(shop_id: str):
     if user == "Guest":
         frappe.throw("You must be logged in to view your cart.")
 
-    cart_name = frappe.db.get_value(
-        "Cart", {"owner": user, "shop": shop_id, "status": "Active"}, "name"
-    )
-    if not cart_name:
+    cart = cart_store.get_active_cart(user, shop_id)
+    if not cart:
         return None  # No active cart
 
-    return frappe.get_doc("Cart", cart_name).as_dict()
+    return cart.as_dict()
 
 
 @frappe.whitelist()
@@ -27,123 +29,154 @@ def add_to_cart(
     stock_id: int = None,
     addons: str = None,
     alternative_product: str = None,
-):  # noqa: C901
+):
     """
     Adds an item to the user's cart. Support multi-cart by shop_id.
     accepts item_code (ProductId) or stock_id (Variant).
     addons: JSON string of addons list.
     """
-    import json
+    return apply_cart_ops(
+        shop_id,
+        [
+            {
+                "op": "add",
+                "qty": qty,
+                "item_code": item_code,
+                "stock_id": stock_id,
+                "addons": addons,
+                "alternative_product": alternative_product,
+            }
+        ],
+    )
+
 
+@frappe.whitelist()
+def apply_cart_ops(shop_id: str, ops):
+    """
+    Applies a batch of cart line operations for the current user's cart in
+    the given shop, then recalculates totals and saves once.
+    ops: list (or JSON string) of operations, applied in order:
+        {"op": "add", "item_code", "stock_id", "qty", "addons",
+            "alternative_product"}
+        {"op": "update", "cart_detail", "qty"}  (qty <= 0 removes the line)
+        {"op": "remove", "cart_detail"}
+    """
     user = frappe.session.user
     if user == "Guest":
         frappe.throw("You must be logged in to add items to your cart.")
 
-    if not item_code and not stock_id:
-        frappe.throw("Product or Stock ID required")
-
-    # If item_code not provided, try to find from stock (assuming Stock doctype exists, optional logic)
-    # For now, we rely on item_code being passed.
+    if isinstance(ops, str):
+        ops = json.loads(ops)
 
     # Find or create the Cart document
-    cart_name = frappe.db.get_value(
-        "Cart", {"owner": user, "shop": shop_id, "status": "Active"}, "name"
+    cart = cart_store.get_active_cart(user, shop_id) or cart_store.new_cart(
+        user, shop_id
     )
-    if not cart_name:
-        cart = frappe.get_doc(
-            {
-                "doctype": "Cart",
-                "owner": user,
-                "shop": shop_id,
-                "status": "Active",
-            }
-        ).insert(ignore_permissions=True)
-    else:
-        cart = frappe.get_doc("Cart", cart_name)
-
-    # Decode addons if present
-    addons_data = []
-    if addons:
-        try:
-            addons_data = (
-                json.loads(addons) if isinstance(addons, str) else addons
+
+    _apply_ops(cart, ops or [])
+    _save_cart(cart)
+    return cart.as_dict()
+
+
+def _parse_addons(addons):
+    """Decodes an addons list, treating anything invalid as no addons."""
+    if not addons:
+        return []
+    try:
+        addons = json.loads(addons) if isinstance(addons, str) else addons
+    except ValueError:
+        return []
+    return addons if isinstance(addons, list) else []
+
+
+def _find_mergeable_line(cart, item_code, stock_id):
+    """
+    Returns the cart line a plain (addon-free) add can be merged into:
+    same stock_id if given, otherwise same item without a stock_id.
+    Lines with addons are never merged.
+    """
+    for detail in cart.items:
+        if stock_id:
+            match = cint(detail.stock_id) == cint(stock_id)
+        else:
+            match = detail.item == item_code and not detail.stock_id
+
+        if match and not _parse_addons(detail.addons):
+            return detail
+    return None
+
+
+def _get_cart_line(cart, cart_detail):
+    for detail in cart.items:
+        if detail.name == cart_detail:
+            return detail
+    frappe.throw(
+        f"Cart item {cart_detail} not found in this cart.",
+        frappe.DoesNotExistError,
+    )
+
+
+def _apply_ops(cart, ops):
+    """Applies line operations to the cart in memory."""
+    prices = get_product_prices(
+        [op.get("item_code") for op in ops if op.get("op") == "add"]
+    )
+
+    for op in ops:
+        action = op.get("op")
+        if action == "add":
+            item_code = op.get("item_code")
+            stock_id = op.get("stock_id")
+            if not item_code and not stock_id:
+                frappe.throw("Product or Stock ID required")
+
+            addons_data = _parse_addons(op.get("addons"))
+            existing_item = (
+                None
+                if addons_data
+                else _find_mergeable_line(cart, item_code, stock_id)
             )
-        except Exception:
-            addons_data = []
-
-    # Check if item already exists in cart (matching stock_id and addons)
-    existing_item = None
-
-    # helper for addons comparison
-    def compare_addons(a1, a2):
-        # simplified check: sort by stock_id and compare
-        # a1, a2 are lists of dicts
-        if not a1 and not a2:
-            return True
-        if not a1 or not a2:
-            return False
-        if len(a1) != len(a2):
-            return False
-        # Deep compare implementation needed or just assume new row if complex
-        # For MVP, we will just add a new row if addons are present to avoid
-        # merging complexity
-        return False
-
-    # If no addons, we can try to merge
-    should_merge = len(addons_data) == 0
-
-    if should_merge:
-        for detail in cart.items:
-            # Check match: item_code and stock_id
-            # If stock_id is provided, match it. If not, match item_code only?
-            match = False
-            if stock_id:
-                if detail.stock_id == int(stock_id):
-                    match = True
-            elif item_code:
-                if detail.item == item_code and (not detail.stock_id):
-                    match = True
-
-            if match:
-                # Check if existing item has addons. If yes, don't merge (since
-                # we have no addons)
-                existing_addons = (
-                    json.loads(detail.addons) if detail.addons else []
-                )
-                if not existing_addons:
-                    existing_item = detail
-                    break
-
-    if existing_item:
-        existing_item.quantity += int(qty)
-    else:
-        # Get Price
-        price = 0
-        if item_code:
-            price = (
-                frappe.db.get_value("Product", item_code, "price") or 0
-            )  # field name might be diff
-        # If stock_id, might want to fetch specific price
-
-        cart.append(
-            "items",
-            {
-                "item": item_code,  # Ensure item_code is provided by Caller
-                "quantity": qty,
-                "price": price,
-                "stock_id": stock_id,
-                "addons": json.dumps(addons_data) if addons_data else None,
-                "bonus": 0,
-                "alternative_product": alternative_product,
-            },
-        )
 
-    cart.save(ignore_permissions=True)
+            if existing_item:
+                existing_item.quantity += cint(op.get("qty"))
+            else:
+                product = prices.get(item_code) or frappe._dict()
+                cart.append(
+                    "items",
+                    {
+                        "item": item_code,
+                        "quantity": cint(op.get("qty")),
+                        "price": flt(product.price),
+                        "stock_id": stock_id,
+                        "addons": (
+                            json.dumps(addons_data) if addons_data else None
+                        ),
+                        "bonus": 0,
+                        "alternative_product": op.get("alternative_product"),
+                    },
+                )
+        elif action == "update":
+            detail = _get_cart_line(cart, op.get("cart_detail"))
+            if cint(op.get("qty")) > 0:
+                detail.quantity = cint(op.get("qty"))
+            else:
+                cart.remove(detail)
+        elif action == "remove":
+            cart.remove(_get_cart_line(cart, op.get("cart_detail")))
+        else:
+            frappe.throw(f"Unknown cart operation: {action}")
+
+
+def _set_cart_total(cart):
+    cart.total_price = sum(
+        flt(detail.price) * cint(detail.quantity) for detail in cart.items
+    )
 
-    # Recalculate totals
-    calculate_cart_totals(cart.name)
 
-    return cart.as_dict()
+def _save_cart(cart):
+    """Recalculates the total and writes the cart and its lines once."""
+    _set_cart_total(cart)
+    cart_store.save_cart(cart)
 
 
 @frappe.whitelist()
@@ -156,8 +189,12 @@ def remove_from_cart(cart_detail_name: str):
     if user == "Guest":
         frappe.throw("You must be logged in to modify your cart.")
 
-    cart_detail = frappe.get_doc("Cart Detail", cart_detail_name)
-    cart = frappe.get_doc("Cart", cart_detail.parent)
+    cart = cart_store.find_line_cart(user, cart_detail_name)
+    if not cart:
+        frappe.throw(
+            f"Cart item {cart_detail_name} not found.",
+            frappe.DoesNotExistError,
+        )
 
     if cart.owner != user:
         frappe.throw(
@@ -166,11 +203,8 @@ def remove_from_cart(cart_detail_name: str):
         )
 
     # Remove the item
-    cart.remove(cart_detail)
-    cart.save(ignore_permissions=True)
-
-    # Recalculate totals
-    calculate_cart_totals(cart.name)
+    _apply_ops(cart, [{"op": "remove", "cart_detail": cart_detail_name}])
+    _save_cart(cart)
     return {"status": "success", "message": "Item removed from cart."}
 
 
@@ -186,13 +220,8 @@ def calculate_cart_totals(cart_name: str):
     """
     Helper function to recalculate the total price of a cart.
     """
-    cart = frappe.get_doc("Cart", cart_name)
-    total_price = 0
-    for detail in cart.items:
-        total_price += detail.price * detail.quantity
-
-    cart.total_price = total_price
-    cart.save(ignore_permissions=True)
+    cart = cart_store.get_cart(cart_name)
+    _save_cart(cart)
 
 
 @frappe.whitelist()
@@ -225,7 +254,7 @@ def insert_cart(cart: dict, lang: str = "en"):
     """
     Inserts items into an existing cart.
     """
-    cart_doc = frappe.get_doc("Cart", cart.get("cart_id"))
+    cart_doc = cart_store.persist_cart(cart.get("cart_id"), evict=True)
     for item in cart.get("items", []):
         cart_doc.append(
             "items",
@@ -244,7 +273,7 @@ def insert_cart_with_group(cart: dict, lang: str = "en"):
     """
     Inserts items into an existing group cart.
     """
-    cart_doc = frappe.get_doc("Cart", cart.get("cart_id"))
+    cart_doc = cart_store.persist_cart(cart.get("cart_id"), evict=True)
     for item in cart.get("items", []):
         cart_doc.append(
             "items",
@@ -273,7 +302,7 @@ def get_cart_in_group(
     """
     Retrieves a group cart.
     """
-    return frappe.get_doc("Cart", cart_id)
+    return cart_store.get_cart(cart_id)
 
 
 @frappe.whitelist()
@@ -281,7 +310,9 @@ def delete_cart(cart_id: int, lang: str = "en"):
     """
     Deletes a cart.
     """
-    frappe.delete_doc("Cart", cart_id, ignore_permissions=True)
+    cart_store.discard_cart(cart_id)
+    if frappe.db.exists("Cart", cart_id):
+        frappe.delete_doc("Cart", cart_id, ignore_permissions=True)
     return {"status": "success"}
 
 
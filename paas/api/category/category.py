@@ -1,6 +1,7 @@
 import frappe
 import json
 import uuid
+from paas.settings_cache import get_settings
 
 
 @frappe.whitelist()
@@ -137,7 +138,7 @@ def create_category(category_data):
     if frappe.db.exists("Category", {"uuid": category_uuid}):
         frappe.throw("Category with this UUID already exists.")
 
-    paas_settings = frappe.get_single("Permission Settings")
+    paas_settings = get_settings("Permission Settings")
     initial_status = (
         "Approved" if paas_settings.auto_approve_categories else "Pending"
     )
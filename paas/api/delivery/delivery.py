@@ -1,29 +1,5 @@
 import frappe
-
-
-def is_point_in_polygon(point, polygon):
-    """
-    Checks if a point is inside a polygon using the Ray-Casting algorithm.
-    `point` should be a dict with 'latitude' and 'longitude'.
-    `polygon` should be a list of dicts, each with 'latitude' and 'longitude'.
-    """
-    x, y = point["latitude"], point["longitude"]
-    n = len(polygon)
-    inside = False
-
-    p1x, p1y = polygon[0]["latitude"], polygon[0]["longitude"]
-    for i in range(n + 1):
-        p2x, p2y = polygon[i % n]["latitude"], polygon[i % n]["longitude"]
-        if y > min(p1y, p2y):
-            if y <= max(p1y, p2y):
-                if x <= max(p1x, p2x):
-                    if p1y != p2y:
-                        xinters = (y - p1y) * (p2x - p1x) / (p2y - p1y) + p1x
-                    if p1x == p2x or x <= xinters:
-                        inside = not inside
-        p1x, p1y = p2x, p2y
-
-    return inside
+from paas.geometry import point_in_polygon
 
 
 @frappe.whitelist(allow_guest=True)
@@ -48,9 +24,8 @@ def check_delivery_zone(shop_id: str, latitude: float, longitude: float):
 
     delivery_zone = frappe.get_doc("Delivery Zone", {"shop": shop_id})
     polygon = delivery_zone.get("coordinates")
-    point = {"latitude": latitude, "longitude": longitude}
 
-    if is_point_in_polygon(point, polygon):
+    if point_in_polygon(float(latitude), float(longitude), polygon):
         return {
             "status": "success",
             "message": "Address is within the delivery zone.",
@@ -1,6 +1,14 @@
 import frappe
 import json
+import math
 from frappe.utils import flt
+from paas.api.utils import parse_coordinates
+from paas.geometry import (
+    distance_fees,
+    haversine_km,
+    point_in_polygon,
+    to_vertices,
+)
 
 
 @frappe.whitelist()
@@ -59,92 +67,209 @@ def check_delivery_availability(lat, lng, shop_id=None):
     lat = flt(lat)
     lng = flt(lng)
 
-    filters = {}
-    if shop_id:
-        filters["shop"] = shop_id
+    zones = get_delivery_zone_index().lookup(lat, lng, shop=shop_id)
+    if not zones:
+        return []
 
-    zones = frappe.get_list(
-        "Delivery Zone",
-        filters=filters,
-        fields=["name", "shop", "address", "coordinates"],
+    shops = {
+        shop.name: shop
+        for shop in frappe.get_all(
+            "Shop",
+            filters={"name": ["in", list({zone.shop for zone in zones})]},
+            fields=[
+                "name",
+                "shop_name",
+                "location",
+                "latitude",
+                "longitude",
+                "price",
+                "price_per_km",
+                "min_amount",
+            ],
+        )
+    }
+
+    zones = [zone for zone in zones if zone.shop in shops]
+    prices = calculate_delivery_prices(
+        lat, lng, [shops[zone.shop] for zone in zones]
     )
 
     available_shops = []
+    for zone, price in zip(zones, prices):
+        shop = shops[zone.shop]
+        available_shops.append(
+            {
+                "shop": shop.name,
+                "shop_title": shop.shop_name,
+                "delivery_price": float(price),
+            }
+        )
+
+    return available_shops
+
 
-    for zone in zones:
-        if not zone.coordinates:
-            continue
-
-        try:
-            polygon = json.loads(zone.coordinates)
-            if is_point_in_polygon(lat, lng, polygon):
-                shop = frappe.get_doc("Shop", zone.shop)
-                price_info = calculate_delivery_price(lat, lng, shop)
-                available_shops.append(
-                    {
-                        "shop": shop.name,
-                        "shop_title": shop.shop_name,
-                        "delivery_price": price_info,
-                    }
+# Redis key holding the current index version; bumped on Delivery Zone changes.
+ZONE_INDEX_VERSION_KEY = "paas:delivery_zone_index_version"
+
+# Grid cell size in degrees (~11 km of latitude).
+ZONE_GRID_CELL = 0.1
+
+# Zones spanning more grid cells than this are only bbox-checked.
+ZONE_GRID_MAX_CELLS = 400
+
+# Compiled indexes per site for this worker process.
+_zone_indexes = {}
+
+
+def _grid_cell(lat, lng):
+    return (
+        math.floor(lng / ZONE_GRID_CELL),
+        math.floor(lat / ZONE_GRID_CELL),
+    )
+
+
+class DeliveryZoneIndex:
+    """
+    Parsed delivery-zone polygons with precomputed bounding boxes, bucketed
+    into a uniform lat/lng grid. A lookup only ray-casts the zones whose
+    bounding box covers the point's grid cell.
+    """
+
+    def __init__(self, zones, version=None):
+        self.version = version
+        self.zones = []
+        self.grid = {}
+        self.wide = []
+
+        for zone in zones:
+            polygon = to_vertices(zone.coordinates)
+            if len(polygon) < 3:
+                continue
+
+            min_lng, min_lat = polygon.min(axis=0)
+            max_lng, max_lat = polygon.max(axis=0)
+            self._add(
+                frappe._dict(
+                    name=zone.name,
+                    shop=zone.shop,
+                    delivery_fee=zone.delivery_fee,
+                    polygon=polygon,
+                    bbox=(min_lng, min_lat, max_lng, max_lat),
                 )
-        except Exception:
-            continue
+            )
 
-    return available_shops
+    def _add(self, zone):
+        position = len(self.zones)
+        self.zones.append(zone)
+
+        min_lng, min_lat, max_lng, max_lat = zone.bbox
+        x0, y0 = _grid_cell(min_lat, min_lng)
+        x1, y1 = _grid_cell(max_lat, max_lng)
+
+        if (x1 - x0 + 1) * (y1 - y0 + 1) > ZONE_GRID_MAX_CELLS:
+            self.wide.append(position)
+            return
+
+        for x in range(x0, x1 + 1):
+            for y in range(y0, y1 + 1):
+                self.grid.setdefault((x, y), []).append(position)
 
+    def candidates(self, lat, lng, shop=None):
+        """Zones whose bounding box contains the point, in index order."""
+        positions = set(self.grid.get(_grid_cell(lat, lng), ()))
+        positions.update(self.wide)
 
-def is_point_in_polygon(lat, lng, polygon):
+        for position in sorted(positions):
+            zone = self.zones[position]
+            if shop and zone.shop != shop:
+                continue
+
+            min_lng, min_lat, max_lng, max_lat = zone.bbox
+            if min_lng <= lng <= max_lng and min_lat <= lat <= max_lat:
+                yield zone
+
+    def lookup(self, lat, lng, shop=None):
+        """Zones that contain the point."""
+        return [
+            zone
+            for zone in self.candidates(lat, lng, shop=shop)
+            if point_in_polygon(lat, lng, zone.polygon)
+        ]
+
+
+def get_delivery_zone_index():
     """
-    Ray-casting algorithm to check if point is in polygon.
-    Polygon is list of [lng, lat] coordinates (GeoJSON standard).
-    lat: Y, lng: X
+    Returns the compiled zone index for the current site, rebuilding it
+    when another process has bumped the index version.
     """
-    inside = False
-    j = len(polygon) - 1
-    for i in range(len(polygon)):
-        xi, yi = polygon[i][0], polygon[i][1]  # xi=Lng, yi=Lat
-        xj, yj = polygon[j][0], polygon[j][1]  # xj=Lng, yj=Lat
+    version = frappe.cache.get_value(ZONE_INDEX_VERSION_KEY)
+    index = _zone_indexes.get(frappe.local.site)
 
-        # Check intersection with ray along X-axis (Lng)
-        # We compare Y (Lat) coords
-        intersect = ((yi > lat) != (yj > lat)) and (
-            lng < (xj - xi) * (lat - yi) / (yj - yi) + xi
+    if index is None or index.version != version:
+        zones = frappe.get_all(
+            "Delivery Zone",
+            fields=["name", "shop", "delivery_fee", "coordinates"],
+            order_by="modified desc",
         )
-        if intersect:
-            inside = not inside
-        j = i
-    return inside
+        index = DeliveryZoneIndex(zones, version=version)
+        _zone_indexes[frappe.local.site] = index
+
+    return index
+
+
+def _bump_zone_index_version():
+    frappe.cache.set_value(
+        ZONE_INDEX_VERSION_KEY, frappe.generate_hash(length=10)
+    )
+
+
+def invalidate_zone_index(doc=None, method=None, *args):
+    """
+    doc_events handler for Delivery Zone. The version is bumped now and
+    again once the transaction commits or rolls back, so no process keeps
+    an index built from uncommitted data.
+    """
+    _bump_zone_index_version()
+    frappe.db.after_commit.add(_bump_zone_index_version)
+    frappe.db.after_rollback.add(_bump_zone_index_version)
 
 
 def calculate_delivery_price(lat, lng, shop):
     """
     Calculates delivery price based on shop settings.
     """
-    # Basic distance calculation (Haversine or simple Euclidean for now)
-    # Ideally use Google Maps API or OSRM, but for now simple math
-    shop_lat = 0
-    shop_lng = 0
-
-    if shop.location:
-        try:
-            loc = json.loads(shop.location)
-            if isinstance(loc, dict) and "features" in loc:  # GeoJSON
-                coords = loc["features"][0]["geometry"]["coordinates"]
-                shop_lat, shop_lng = coords[1], coords[0]
-        except Exception:
-            pass
-
-    # Placeholder distance (in km) - implementing Haversine
-    import math
-
-    R = 6371  # Earth radius in km
-    dLat = math.radians(lat - shop_lat)
-    dLon = math.radians(lng - shop_lng)
-    a = math.sin(dLat / 2) * math.sin(dLat / 2) + math.cos(
-        math.radians(shop_lat)
-    ) * math.cos(math.radians(lat)) * math.sin(dLon / 2) * math.sin(dLon / 2)
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-    distance = R * c
-
-    price = shop.price + (distance * shop.price_per_km)
-    return max(price, shop.min_amount)
+    return float(calculate_delivery_prices(lat, lng, [shop])[0])
+
+
+def calculate_delivery_prices(lat, lng, shops):
+    """
+    Calculates delivery prices from one location to many shops in a single
+    vectorized pass. Returns an array aligned with shops.
+    """
+    origins = [_shop_coordinates(shop) for shop in shops]
+    distances = haversine_km(
+        [origin[0] for origin in origins],
+        [origin[1] for origin in origins],
+        lat,
+        lng,
+    )
+    return distance_fees(
+        distances,
+        base=[shop.price for shop in shops],
+        per_km=[shop.price_per_km for shop in shops],
+        minimum=[shop.min_amount for shop in shops],
+    )
+
+
+def _shop_coordinates(shop):
+    """
+    Returns the shop's (lat, lng), preferring the indexed columns and
+    falling back to the stored location. Unknown locations map to (0, 0).
+    """
+    if shop.get("latitude") is not None and shop.get("longitude") is not None:
+        return flt(shop.latitude), flt(shop.longitude)
+
+    shop_lat, shop_lng = parse_coordinates(shop.get("location"))
+    if shop_lat is None:
+        return 0, 0
+    return shop_lat, shop_lng
@@ -1,76 +1,52 @@
 import frappe
 import json
-import requests
-from paas.api.utils import api_response
+from paas.api.notification.push import send_push
+from paas.api.utils import _require_admin, api_response, list_page
+from paas.settings_cache import get_settings
 
 
 @frappe.whitelist()
 def send_push_notification(
-    user: str, title: str, body: str, data: dict = None
+    user: str | list, title: str, body: str, data: dict = None
 ):
     """
-    Sends a push notification to a specific user via FCM.
+    Sends a push notification via FCM to a user. Sending to a list of users
+    at once (e.g. broadcasts) is for System Managers only; server-side code
+    should call push.send_push directly. Tokens FCM reports as dead are
+    removed.
     """
-    try:
-        settings = frappe.get_single("Push Notification Settings")
-        if not settings.server_key:
-            frappe.log_error(
-                "FCM Server Key is missing in Push Notification Settings",
-                "Push Notification Error",
-            )
-            return {"status": "failed", "message": "Server key missing."}
-
-        tokens = frappe.get_all(
-            "Device Token", filters={"user": user}, pluck="device_token"
+    users = user
+    if isinstance(user, str):
+        users = frappe.parse_json(user) if user.startswith("[") else [user]
+    if len(users) != 1:
+        _require_admin()
+    if isinstance(data, str):
+        data = frappe.parse_json(data)
+
+    if not get_settings("Push Notification Settings").server_key:
+        frappe.log_error(
+            "FCM Server Key is missing in Push Notification Settings",
+            "Push Notification Error",
         )
-        if not tokens:
-            return {
-                "status": "failed",
-                "message": "No device tokens found for user.",
-            }
-
-        headers = {
-            "Authorization": f"key={settings.server_key}",
-            "Content-Type": "application/json",
-        }
+        return {"status": "failed", "message": "Server key missing."}
 
-        success_count = 0
-        failure_count = 0
-
-        for token in tokens:
-            payload = {
-                "to": token,
-                "notification": {"title": title, "body": body},
-                "data": data or {},
-            }
-
-            try:
-                response = requests.post(
-                    "https://fcm.googleapis.com/fcm/send",
-                    headers=headers,
-                    json=payload,
-                    timeout=5,
-                )
-                if response.status_code == 200:
-                    success_count += 1
-                else:
-                    failure_count += 1
-                    frappe.log_error(f"FCM Error for {token}: {
-                        response.text}", "Push Notification Error")
-            except Exception as e:
-                failure_count += 1
-                frappe.log_error(f"Request Error for {token}: {
-                    str(e)}", "Push Notification Error")
+    try:
+        stats = send_push(users, title, body, data)
+    except Exception as e:
+        frappe.log_error(frappe.get_traceback(), "Push Notification Exception")
+        return {"status": "error", "message": str(e)}
 
+    if not stats["tokens"]:
         return {
-            "status": "success",
-            "message": f"Sent: {success_count}, Failed: {failure_count}",
-            "details": {"sent": success_count, "failed": failure_count},
+            "status": "failed",
+            "message": "No device tokens found for user.",
         }
 
-    except Exception as e:
-        frappe.log_error(frappe.get_traceback(), "Push Notification Exception")
-        return {"status": "error", "message": str(e)}
+    return {
+        "status": "success",
+        "message": f"Sent: {stats['sent']}, Failed: {stats['failed']}",
+        "details": stats,
+    }
 
 
 @frappe.whitelist()
@@ -78,7 +54,7 @@ def get_default_sms_payload():
     """
     Returns the default SMS payload from Push Notification Settings.
     """
-    settings = frappe.get_single("Push Notification Settings")
+    settings = get_settings("Push Notification Settings")
 
     payload = {
         "default": True,
@@ -212,9 +188,11 @@ def update_notification_settings(type: str, active: int):
 
 
 @frappe.whitelist()
-def get_user_notifications(start=0, limit=20):
+def get_user_notifications(start=0, limit=20, cursor=None):
     """
     Retrieves the list of notifications for the currently logged-in user.
+    Pass cursor (empty for the first page) to page by next_cursor instead
+    of start.
     """
     user = frappe.session.user
     if user == "Guest":
@@ -223,7 +201,7 @@ def get_user_notifications(start=0, limit=20):
             frappe.AuthenticationError,
         )
 
-    return frappe.get_all(
+    return list_page(
         "Notification Log",
         filters={"user": user},
         fields=[
@@ -235,8 +213,10 @@ def get_user_notifications(start=0, limit=20):
             "read",
         ],
         order_by="creation desc",
-        offset=start,
-        limit=limit,
+        cursor=cursor,
+        limit_start=start,
+        limit_page_length=limit,
+        getter=frappe.get_all,
     )
 
 
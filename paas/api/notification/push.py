@@ -0,0 +1,132 @@
+# Copyright (c) 2025 ROKCT INTELLIGENCE (PTY) LTD
+# For license information, please see license.txt
+
+"""
+Push notification fan-out over FCM.
+
+All device tokens for the target users are read in one query and sent
+as FCM multicast messages of up to FCM_BATCH_SIZE registration ids each.
+The batches are posted concurrently over a pooled keep-alive session.
+FCM returns a result per token. Tokens it reports as unregistered or
+invalid are deleted from Device Token, so later sends skip them.
+
+Only the HTTP calls run on the pool threads. Database access and error
+logging stay on the calling thread.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import frappe
+import requests
+from requests.adapters import HTTPAdapter
+from paas.settings_cache import get_settings
+
+FCM_SEND_URL = "https://fcm.googleapis.com/fcm/send"
+
+# FCM accepts at most 1000 registration ids per multicast message.
+FCM_BATCH_SIZE = 1000
+FCM_CONCURRENCY = 8
+
+# (connect, read) seconds
+FCM_TIMEOUT = (5, 10)
+
+# Per-token errors meaning the token will never be delivered to again.
+DEAD_TOKEN_ERRORS = ("NotRegistered", "InvalidRegistration")
+
+_session = None
+
+
+def _get_session():
+    global _session
+    if _session is None:
+        adapter = HTTPAdapter(pool_maxsize=FCM_CONCURRENCY, max_retries=0)
+        _session = requests.Session()
+        _session.mount("https://", adapter)
+    return _session
+
+
+def _post_batch(headers, message, tokens):
+    """Runs on a pool thread; returns (response, error)."""
+    try:
+        response = _get_session().post(
+            FCM_SEND_URL,
+            headers=headers,
+            json={**message, "registration_ids": tokens},
+            timeout=FCM_TIMEOUT,
+        )
+        return response, None
+    except requests.RequestException as e:
+        return None, e
+
+
+def get_device_tokens(users):
+    """Distinct device tokens registered for the users."""
+    tokens = frappe.get_all(
+        "Device Token",
+        filters={"user": ["in", list(users)]},
+        pluck="device_token",
+    )
+    return list(dict.fromkeys(token for token in tokens if token))
+
+
+def send_push(users, title, body, data=None):
+    """
+    Sends a notification to every device of the users. Returns counts of
+    sent and failed tokens and of dead tokens pruned.
+    """
+    settings = get_settings("Push Notification Settings")
+    if not settings.server_key:
+        frappe.throw("FCM Server Key is missing in Push Notification Settings")
+
+    tokens = get_device_tokens(users)
+    stats = {"sent": 0, "failed": 0, "pruned": 0, "tokens": len(tokens)}
+    if not tokens:
+        return stats
+
+    headers = {
+        "Authorization": f"key={settings.server_key}",
+        "Content-Type": "application/json",
+    }
+    message = {
+        "notification": {"title": title, "body": body},
+        "data": data or {},
+    }
+    batches = [
+        tokens[i:i + FCM_BATCH_SIZE]
+        for i in range(0, len(tokens), FCM_BATCH_SIZE)
+    ]
+
+    with ThreadPoolExecutor(
+        max_workers=min(FCM_CONCURRENCY, len(batches))
+    ) as pool:
+        outcomes = list(
+            pool.map(
+                lambda batch: _post_batch(headers, message, batch), batches
+            )
+        )
+
+    dead_tokens = []
+    for batch, (response, error) in zip(batches, outcomes):
+        if error is not None or response.status_code != 200:
+            stats["failed"] += len(batch)
+            frappe.log_error(
+                f"FCM batch of {len(batch)} failed: "
+                f"{error or response.text}",
+                "Push Notification Error",
+            )
+            continue
+
+        results = response.json().get("results") or []
+        for token, result in zip(batch, results):
+            if "error" not in result:
+                stats["sent"] += 1
+                continue
+            stats["failed"] += 1
+            if result["error"] in DEAD_TOKEN_ERRORS:
+                dead_tokens.append(token)
+
+    if dead_tokens:
+        frappe.db.delete("Device Token", {"device_token": ["in", dead_tokens]})
+        stats["pruned"] = len(dead_tokens)
+
+    return stats
@@ -1,7 +1,16 @@
 import frappe
 import json
 from frappe.model.document import Document
-from paas.api.utils import api_response
+from paas import cart_store
+from paas.api.utils import api_response, get_page
+from paas.pricing import quote_cart
+from paas.settings_cache import get_settings
+from paas.stock import (
+    get_product_prices,
+    release_order_stock,
+    reserve_order_stock,
+    resolve_order_lines,
+)
 
 
 @frappe.whitelist(allow_guest=True)
@@ -25,7 +34,7 @@ def create_order(order_data):
             )
 
     # Check for hierarchical auto-approval
-    paas_settings = frappe.get_single("Permission Settings")
+    paas_settings = get_settings("Permission Settings")
 
     # Validate phone number if required by admin settings
     if paas_settings.require_phone_for_order and not order_data.get("phone"):
@@ -42,15 +51,17 @@ def create_order(order_data):
 
     # If cart_id is provided and order_items is missing, load items from cart
     if order_data.get("cart_id") and not order_data.get("order_items"):
-        cart = frappe.get_doc("Cart", order_data.get("cart_id"))
+        # Checkout persists the hot cart so the order sees its final state
+        cart = cart_store.persist_cart(order_data.get("cart_id"), evict=True)
+        prices = get_product_prices([item.item for item in cart.items])
         order_items = []
         for item in cart.items:
-            product_doc = frappe.get_doc("Product", item.item)
+            product = prices.get(item.item) or frappe._dict()
             order_items.append(
                 {
                     "product": item.item,
                     "quantity": item.quantity,
-                    "price": item.price or product_doc.price,
+                    "price": item.price or product.price,
                     "alternative_product": item.alternative_product,
                 }
             )
@@ -83,61 +94,12 @@ def create_order(order_data):
         }
     )
 
-    for item in order_data.get("order_items", []):
-        product_id = item.get("product")
-        quantity = item.get("quantity")
-        alt_product_id = item.get("alternative_product")
-
-        # Real-time Stock Check & Auto-Substitution
-        is_substituted = 0
-        original_product = None
-
-        # Check stock for primary product
-        stock_qty = (
-            frappe.db.get_value(
-                "Stock",
-                {"shop": order_data.get("shop"), "product": product_id},
-                "quantity",
-            )
-            or 0
-        )
-
-        if stock_qty <= 0 and alt_product_id:
-            # Check stock for alternative product
-            alt_stock_qty = (
-                frappe.db.get_value(
-                    "Stock",
-                    {
-                        "shop": order_data.get("shop"),
-                        "product": alt_product_id,
-                    },
-                    "quantity",
-                )
-                or 0
-            )
-            if alt_stock_qty > 0:
-                original_product = product_id
-                product_id = alt_product_id
-                is_substituted = 1
-
-        # Fetch current price for the chosen product (primary or substituted)
-        current_price = (
-            frappe.db.get_value("Product", product_id, "price") or 0
-        )
-        cost_price = frappe.db.get_value("Product", product_id, "cost") or 0
-
-        order.append(
-            "order_items",
-            {
-                "product": product_id,
-                "quantity": quantity,
-                "price": current_price,
-                "cost_price": cost_price,
-                "alternative_product": alt_product_id,
-                "is_substituted": is_substituted,
-                "original_product": original_product,
-            },
-        )
+    # Real-time Stock Check & Auto-Substitution, resolved for all lines
+    # at once
+    for line in resolve_order_lines(
+        order_data.get("shop"), order_data.get("order_items", [])
+    ):
+        order.append("order_items", line)
 
     # Store the quoted total from frontend for refund calculation
     order.quoted_total = order_data.get("quoted_total") or 0
@@ -219,24 +181,29 @@ def deposit_to_wallet(user, amount, note):
 
 
 @frappe.whitelist()
-def list_orders(limit_start: int = 0, limit_page_length: int = 20):
+def list_orders(
+    limit_start: int = 0, limit_page_length: int = 20, cursor: str = None
+):
     """
     Retrieves a list of orders for the current user.
+    Pass cursor (empty for the first page) to page by next_cursor instead
+    of limit_start.
     """
     user = frappe.session.user
     if user == "Guest":
         frappe.throw("You must be logged in to view your orders.")
 
-    orders = frappe.get_list(
+    orders, next_cursor = get_page(
         "Order",
         filters={"user": user},
         fields=["name", "shop", "total_price", "status", "creation"],
-        offset=limit_start,
-        limit=limit_page_length,
+        cursor=cursor,
+        limit_start=limit_start,
+        limit_page_length=limit_page_length,
         order_by="creation desc",
         ignore_permissions=True,
     )
-    return api_response(data=orders)
+    return api_response(data=orders, next_cursor=next_cursor)
 
 
 @frappe.whitelist()
@@ -294,37 +261,10 @@ def update_order_status(order_id: str, status: str):  # noqa: C901
             ', '.join(valid_statuses)}")
 
     previous_status = order.status
-    order.status = status
-    order.save(ignore_permissions=True)
 
-    # Subtract stock when order is Accepted (and wasn't already)
+    # Reserve stock when order is Accepted (and wasn't already)
     if status == "Accepted" and previous_status != "Accepted":
-        for item in order.order_items:
-            # Check if product tracks stock
-            product_doc = frappe.get_doc("Product", item.product)
-            if product_doc.track_stock:
-                # Find the Stock record for this shop and product
-                stock_name = frappe.db.get_value(
-                    "Stock",
-                    {"shop": order.shop, "product": item.product},
-                    "name",
-                )
-                if stock_name:
-                    stock_doc = frappe.get_doc("Stock", stock_name)
-                    stock_doc.quantity -= item.quantity
-                    stock_doc.save(ignore_permissions=True)
-                else:
-                    # Optional: Create stock record if missing? checking with user pref "stocks belong to sellers"
-                    # For now, let's log or create if not exists
-                    frappe.get_doc(
-                        {
-                            "doctype": "Stock",
-                            "shop": order.shop,
-                            "product": item.product,
-                            "quantity": -item.quantity,  # Allow negative logic if started from 0
-                            "price": item.price,  # Init price
-                        }
-                    ).insert(ignore_permissions=True)
+        reserve_order_stock(order)
 
     # Restore stock if order is Cancelled/Rejected from a status that deducted
     # stock
@@ -333,18 +273,10 @@ def update_order_status(order_id: str, status: str):  # noqa: C901
         "Prepared",
         "Delivered",
     ]:  # Assuming these are downstream of Accepted
-        for item in order.order_items:
-            product_doc = frappe.get_doc("Product", item.product)
-            if product_doc.track_stock:
-                stock_name = frappe.db.get_value(
-                    "Stock",
-                    {"shop": order.shop, "product": item.product},
-                    "name",
-                )
-                if stock_name:
-                    stock_doc = frappe.get_doc("Stock", stock_name)
-                    stock_doc.quantity += item.quantity
-                    stock_doc.save(ignore_permissions=True)
+        release_order_stock(order)
+
+    order.status = status
+    order.save(ignore_permissions=True)
 
     return api_response(
         data=order.as_dict(), message="Order status updated successfully."
@@ -466,158 +398,22 @@ def get_order_statuses():
 @frappe.whitelist()
 def get_calculate(
     cart_id, address=None, coupon_code=None, tips=0, delivery_type="Delivery"
-):  # noqa: C901
+):
     if isinstance(address, str) and address:
         try:
             address = json.loads(address)
         except Exception:
             address = None
 
-    cart = frappe.get_doc("Cart", cart_id)
-    shop = frappe.get_doc("Shop", cart.shop)
-
-    # 1. Calculate Product Totals
-    product_tax = 0
-    product_total = 0
-    subtotal_buffer = 0  # To track price protection for alternatives
-    discount = 0
-    calculated_products = []
-
-    for item in cart.items:
-        # Using 'Product' instead of 'Item' as per project conventions
-        product_doc = frappe.get_doc("Product", item.item)
-
-        item_price = product_doc.price or 0
-
-        # Pay-Max Logic: Use alternative price if higher
-        effective_price = item_price
-        if item.alternative_product:
-            alt_price = (
-                frappe.db.get_value(
-                    "Product", item.alternative_product, "price"
-                )
-                or 0
-            )
-            if alt_price > item_price:
-                effective_price = alt_price
-                subtotal_buffer += (alt_price - item_price) * (
-                    item.quantity or 0
-                )
-
-        item_qty = item.quantity or 0
-        item_tax = (effective_price * (product_doc.tax or 0) / 100) * item_qty
-        item_discount = (
-            effective_price * (item.discount_percentage or 0) / 100
-        ) * item_qty
-
-        item_total = (effective_price * item_qty) - item_discount + item_tax
-
-        product_total += effective_price * item_qty
-        product_tax += item_tax
-        discount += item_discount
-
-        calculated_products.append(
-            {
-                "id": product_doc.name,
-                "price": effective_price,
-                "original_price": item_price,
-                "qty": item_qty,
-                "tax": item_tax,
-                "shop_tax": 0,  # Placeholder or specific shop tax per item
-                "discount": item_discount,
-                "price_without_tax": effective_price,
-                "total_price": item_total,
-                "is_buffered": effective_price > item_price,
-            }
-        )
-
-    # 2. Calculate Delivery Fee
-    delivery_fee = 0
-    if delivery_type == "Delivery" and address:
-        from math import radians, sin, cos, sqrt, atan2
-
-        def haversine(lat1, lon1, lat2, lon2):
-            R = 6371  # Radius of Earth in kilometers
-            dLat = radians(lat2 - lat1)
-            dLon = radians(lon2 - lon1)
-            lat1 = radians(lat1)
-            lat2 = radians(lat2)
-            a = sin(dLat / 2) ** 2 + cos(lat1) * cos(lat2) * sin(dLon / 2) ** 2
-            c = 2 * atan2(sqrt(a), sqrt(1 - a))
-            return R * c
-
-        if (
-            shop.latitude
-            and shop.longitude
-            and address.get("latitude")
-            and address.get("longitude")
-        ):
-            distance = haversine(
-                shop.latitude,
-                shop.longitude,
-                address["latitude"],
-                address["longitude"],
-            )
-            delivery_fee = (
-                distance * shop.price_per_km if shop.price_per_km else 0
-            )
-
-    # 3. Calculate Shop Tax
-    # Total tax on the whole order from the shop's tax setting
-    shop_tax = (product_total - discount) * (shop.tax / 100) if shop.tax else 0
-
-    # 4. Get Service Fee from Permission Settings
-    paas_settings = frappe.get_single("Permission Settings")
-    service_fee = paas_settings.service_fee or 0
-
-    # 5. Apply Coupon
-    coupon_price = 0
-    if coupon_code:
-        try:
-            # Check for coupon linked to this shop or global
-            coupon_doc = frappe.db.get_value(
-                "Coupon",
-                {"coupon_code": coupon_code, "shop": cart.shop},
-                [
-                    "name",
-                    "coupon_type",
-                    "discount_percentage",
-                    "discount_amount",
-                ],
-                as_dict=True,
-            )
-            if coupon_doc:
-                if coupon_doc.coupon_type == "Percentage":
-                    coupon_price = (product_total - discount) * (
-                        coupon_doc.discount_percentage / 100
-                    )
-                else:  # Fixed Amount
-                    coupon_price = coupon_doc.discount_amount
-        except Exception:
-            pass
-
-    # 6. Calculate Final Total
-    order_total = (
-        (product_total - discount)
-        + delivery_fee
-        + shop_tax
-        + service_fee
-        - coupon_price
-        + float(tips)
-    )
+    cart = cart_store.get_cart(cart_id)
 
     # Return in the format expected by GetCalculateModel
     return api_response(
-        data={
-            "total_tax": product_tax,
-            "price": product_total,
-            "total_shop_tax": shop_tax,
-            "total_price": max(order_total, 0),
-            "total_discount": discount + coupon_price,
-            "delivery_fee": delivery_fee,
-            "service_fee": service_fee,
-            "tips": float(tips),
-            "coupon_price": coupon_price,
-            "subtotal_buffer": subtotal_buffer,
-        }
+        data=quote_cart(
+            cart,
+            address=address,
+            coupon_code=coupon_code,
+            tips=tips,
+            delivery_type=delivery_type,
+        )
     )
@@ -1,6 +1,8 @@
 import frappe
 import json
 from paas.api.utils import api_response
+from paas.geometry import distance_fees
+from paas.settings_cache import get_settings
 
 
 @frappe.whitelist()
@@ -32,7 +34,7 @@ def create_parcel_order(order_data):  # noqa: C901
             )
 
     # Get Permission Settings for auto-approval
-    paas_settings = frappe.get_single("Permission Settings")
+    paas_settings = get_settings("Permission Settings")
     initial_status = (
         "Accepted" if paas_settings.auto_approve_parcel_orders else "New"
     )
@@ -292,22 +294,63 @@ def haversine(lat1, lon1, lat2, lon2):
     return _haversine(lat1, lon1, lat2, lon2)
 
 
-@frappe.whitelist(allow_guest=True)
-def calculate_price(type_id, address_from, address_to):
+def _parse_route(address_from, address_to):
     """
-    Calculates the delivery price based on distance and parcel type settings.
-    address_from/to: JSON strings or dicts with latitude/longitude.
+    Returns (lat1, lon1, lat2, lon2) from two address payloads
+    (JSON strings or dicts with latitude/longitude).
+    Raises ValueError, TypeError or AttributeError on bad input.
     """
     if isinstance(address_from, str):
         address_from = json.loads(address_from)
     if isinstance(address_to, str):
         address_to = json.loads(address_to)
 
+    return (
+        float(address_from.get("latitude") or address_from.get("lat")),
+        float(address_from.get("longitude") or address_from.get("long")),
+        float(address_to.get("latitude") or address_to.get("lat")),
+        float(address_to.get("longitude") or address_to.get("long")),
+    )
+
+
+def _quote_parcel_types(settings, km):
+    """
+    Prices one route against many Parcel Order Settings in a single
+    vectorized pass.
+    """
+    delivery_fees = distance_fees(
+        km, per_km=[setting.price_per_km for setting in settings]
+    )
+    prices = distance_fees(
+        km,
+        base=[setting.price for setting in settings],
+        per_km=[setting.price_per_km for setting in settings],
+    )
+
+    eta = f"{max(15, int(km * 3))}-{max(20, int(km * 4))} min"
+    return [
+        {
+            "type_id": setting.name,
+            "type": setting.get("type"),
+            "price": round(float(price), 2),
+            "delivery_fee": round(float(delivery_fee), 2),
+            "km": round(km, 2),
+            "time": eta,
+        }
+        for setting, price, delivery_fee in zip(
+            settings, prices, delivery_fees
+        )
+    ]
+
+
+@frappe.whitelist(allow_guest=True)
+def calculate_price(type_id, address_from, address_to):
+    """
+    Calculates the delivery price based on distance and parcel type settings.
+    address_from/to: JSON strings or dicts with latitude/longitude.
+    """
     try:
-        lat1 = float(address_from.get("latitude") or address_from.get("lat"))
-        lon1 = float(address_from.get("longitude") or address_from.get("long"))
-        lat2 = float(address_to.get("latitude") or address_to.get("lat"))
-        lon2 = float(address_to.get("longitude") or address_to.get("long"))
+        lat1, lon1, lat2, lon2 = _parse_route(address_from, address_to)
     except (ValueError, TypeError, AttributeError):
         # Fallback if coordinates missing or invalid
         return api_response(
@@ -322,22 +365,53 @@ def calculate_price(type_id, address_from, address_to):
     km = haversine(lat1, lon1, lat2, lon2)
 
     # Fetch rates from Parcel Order Setting
-    setting = frappe.get_doc("Parcel Order Setting", type_id)
-    base_price = float(setting.price or 0)
-    per_km = float(setting.price_per_km or 0)
+    setting = frappe.db.get_value(
+        "Parcel Order Setting",
+        type_id,
+        ["name", "type", "price", "price_per_km"],
+        as_dict=True,
+    )
+    if not setting:
+        frappe.throw(
+            f"Parcel Order Setting {type_id} not found.",
+            frappe.DoesNotExistError,
+        )
 
-    total_price = base_price + (km * per_km)
+    quote = _quote_parcel_types([setting], km)[0]
 
     return api_response(
         data={
-            "price": round(total_price, 2),
-            "delivery_fee": round(km * per_km, 2),
-            "km": round(km, 2),
-            "time": f"{max(15, int(km * 3))}-{max(20, int(km * 4))} min",
+            "price": quote["price"],
+            "delivery_fee": quote["delivery_fee"],
+            "km": quote["km"],
+            "time": quote["time"],
         }
     )
 
 
+@frappe.whitelist(allow_guest=True)
+def calculate_prices(address_from, address_to):
+    """
+    Quotes a route against every Parcel Order Setting at once, so the app
+    can show all parcel types with prices in one call.
+    """
+    try:
+        lat1, lon1, lat2, lon2 = _parse_route(address_from, address_to)
+    except (ValueError, TypeError, AttributeError):
+        return api_response(
+            data=[], message="Invalid coordinates", status_code=400
+        )
+
+    settings = frappe.get_all(
+        "Parcel Order Setting",
+        fields=["name", "type", "price", "price_per_km"],
+        order_by="name asc",
+    )
+
+    km = haversine(lat1, lon1, lat2, lon2)
+    return api_response(data=_quote_parcel_types(settings, km))
+
+
 @frappe.whitelist()
 def add_parcel_review(parcel_id: str, rating: int, review: str = None):
     """
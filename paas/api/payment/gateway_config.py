@@ -0,0 +1,107 @@
+# Copyright (c) 2025 ROKCT INTELLIGENCE (PTY) LTD
+# For license information, please see license.txt
+
+"""
+Process-level registry of payment gateway configuration.
+
+PaaS Payment Gateway keeps its credentials as key/value rows. The
+Flutterwave Settings single keeps a password field. Both are loaded into
+a GatewayConfig once per worker. Like paas.settings_cache, each entry is
+tagged with a per-gateway version held in Redis. Saving a gateway bumps
+the version through doc_events, so a burst of callbacks costs one Redis
+read per gateway instead of a document load and a settings rebuild.
+"""
+
+from dataclasses import dataclass, field
+from functools import partial
+
+import frappe
+
+# Redis hash of gateway config versions, one field per gateway.
+GATEWAY_CONFIG_VERSION_KEY = "paas:gateway_config_version"
+
+# Gateways configured by a single doctype rather than PaaS Payment Gateway.
+SINGLE_GATEWAYS = {"Flutterwave": "Flutterwave Settings"}
+
+# (site, gateway) -> (version, GatewayConfig)
+_configs = {}
+
+
+@dataclass(frozen=True)
+class GatewayConfig:
+    gateway: str
+    enabled: bool = False
+    is_sandbox: bool = False
+    success_redirect_url: str | None = None
+    failure_redirect_url: str | None = None
+    settings: dict[str, str] = field(default_factory=dict)
+
+    def get(self, key: str, default=None):
+        """Returns a gateway setting, or default if it is unset."""
+        value = self.settings.get(key)
+        return default if value is None else value
+
+
+def get_gateway_config(gateway: str) -> GatewayConfig:
+    """Returns a gateway's configuration from the process cache."""
+    version = frappe.cache.hget(GATEWAY_CONFIG_VERSION_KEY, gateway)
+    key = (frappe.local.site, gateway)
+    cached = _configs.get(key)
+
+    if cached is None or cached[0] != version:
+        cached = (version, _load_gateway_config(gateway))
+        _configs[key] = cached
+
+    return cached[1]
+
+
+def _load_gateway_config(gateway):
+    if gateway in SINGLE_GATEWAYS:
+        doc = frappe.get_single(SINGLE_GATEWAYS[gateway])
+        return GatewayConfig(
+            gateway=gateway,
+            enabled=bool(doc.enabled),
+            success_redirect_url=doc.success_redirect_url,
+            failure_redirect_url=doc.failure_redirect_url,
+            settings={
+                "public_key": doc.public_key,
+                "secret_key": doc.get_password(
+                    "secret_key", raise_exception=False
+                ),
+            },
+        )
+
+    doc = frappe.get_doc("PaaS Payment Gateway", gateway)
+    return GatewayConfig(
+        gateway=gateway,
+        enabled=bool(doc.enabled),
+        is_sandbox=bool(doc.is_sandbox),
+        success_redirect_url=doc.success_redirect_url,
+        failure_redirect_url=doc.failure_redirect_url,
+        settings={row.key: row.value for row in doc.settings},
+    )
+
+
+def _bump_gateway_version(gateway):
+    frappe.cache.hset(
+        GATEWAY_CONFIG_VERSION_KEY, gateway, frappe.generate_hash(length=10)
+    )
+
+
+def invalidate_gateway_config(doc, method=None):
+    """
+    doc_events handler for PaaS Payment Gateway and Flutterwave Settings.
+    As with cached settings, the version is bumped again once the
+    transaction ends.
+    """
+    gateway = next(
+        (
+            name
+            for name, doctype in SINGLE_GATEWAYS.items()
+            if doctype == doc.doctype
+        ),
+        doc.name,
+    )
+    _bump_gateway_version(gateway)
+    frappe.db.after_commit.add(partial(_bump_gateway_version, gateway))
+    frappe.db.after_rollback.add(partial(_bump_gateway_version, gateway))
@@ -0,0 +1,699 @@
+# Copyright (c) 2025 ROKCT INTELLIGENCE (PTY) LTD
+# For license information, please see license.txt
+
+"""
+Payment gateway adapters.
+
+Each gateway implements PaymentGateway: initiate a checkout for a
+document, verify a queued callback payload, charge a saved card token and
+refund a payment. Adapters register themselves by name, which is the
+PaaS Payment Gateway name and the Saved Card gateway. get_gateway returns
+an adapter with its cached GatewayConfig. Methods a gateway does not
+support raise NotImplementedError.
+
+FakeGateway is an in-process gateway for load tests and benchmarks. It
+is only available on sites with fake_payment_gateway set in site config.
+"""
+
+import hashlib
+import random
+import time
+from urllib.parse import quote_plus
+
+import frappe
+from paas.api.payment import http_client
+from paas.api.payment.gateway_config import GatewayConfig, get_gateway_config
+
+# name -> PaymentGateway subclass
+_gateways = {}
+
+
+def register_gateway(cls):
+    """Class decorator adding an adapter to the registry under cls.name."""
+    _gateways[cls.name] = cls
+    return cls
+
+
+def get_gateway(name: str, raise_exception=True):
+    """Returns the adapter registered for a gateway name."""
+    cls = _gateways.get(name)
+    if cls is None:
+        if raise_exception:
+            frappe.throw(f"Unsupported payment gateway {name}.")
+        return None
+    return cls()
+
+
+class PaymentGateway:
+    name = None
+
+    def __init__(self):
+        self._config = None
+
+    @property
+    def config(self) -> GatewayConfig:
+        """The gateway's configuration, loaded on first use."""
+        if self._config is None:
+            self._config = self.load_config()
+        return self._config
+
+    def load_config(self) -> GatewayConfig:
+        return get_gateway_config(self.name)
+
+    def supports(self, method: str) -> bool:
+        """True if the adapter implements an interface method."""
+        return getattr(type(self), method) is not getattr(
+            PaymentGateway, method
+        )
+
+    def initiate(self, doctype: str, docname: str) -> dict:
+        """Starts a checkout for a document and returns where to send
+        the customer."""
+        raise NotImplementedError
+
+    def verify(self, data: dict):
+        """Verifies a callback payload from the webhook inbox and updates
+        the transaction and order."""
+        raise NotImplementedError
+
+    def charge_token(self, token, amount, currency, description, user):
+        """Charges a saved card token and returns the gateway response."""
+        raise NotImplementedError
+
+    def refund(self, reference: str, amount=None) -> dict:
+        """Refunds a payment in full, or amount of it."""
+        raise NotImplementedError
+
+    def _create_transaction(self, doctype, docname, reference, amount):
+        frappe.get_doc(
+            {
+                "doctype": "Transaction",
+                "payable_type": doctype,
+                "payable_id": docname,
+                "payment_reference": reference,
+                "amount": amount,
+                "status": "Pending",
+            }
+        ).insert(ignore_permissions=True)
+
+    def _settle_transaction(self, transaction, paid):
+        """Marks a transaction and, when paid, its order as Paid."""
+        transaction.status = "Paid" if paid else "Failed"
+        if paid:
+            order = frappe.get_doc("Order", transaction.payable_id)
+            order.status = "Paid"
+            order.save(ignore_permissions=True)
+        transaction.save(ignore_permissions=True)
+
+
+@register_gateway
+class FlutterwaveGateway(PaymentGateway):
+    name = "Flutterwave"
+    api_url = "https://api.flutterwave.com/v3"
+
+    def _headers(self):
+        return {
+            "Authorization": f"Bearer {self.config.get('secret_key')}",
+            "Content-Type": "application/json",
+        }
+
+    def initiate(self, doctype, docname):  # noqa: C901
+        user = frappe.session.user
+        if user == "Guest":
+            frappe.throw("You must be logged in to make a payment.")
+
+        try:
+            doc = frappe.get_doc(doctype, docname)
+            # Check authorization - for Order it's 'user', for Parcel Order
+            # it's 'user'
+            if doc.user != user:
+                frappe.throw(
+                    "You are not authorized to pay for this document.",
+                    frappe.PermissionError,
+                )
+
+            if doc.payment_status == "Paid":
+                frappe.throw("This document has already been paid for.")
+
+            if not self.config.enabled:
+                frappe.throw("Flutterwave payments are not enabled.")
+
+            # Prepare the request to Flutterwave
+            tx_ref = f"{doc.name}-{frappe.utils.now_datetime().strftime('%Y%m%d%H%M%S')}"
+
+            # Get customer details
+            customer_email = frappe.db.get_value("User", user, "email")
+            customer_phone = frappe.db.get_value("User", user, "phone")
+            customer_full_name = frappe.db.get_value(
+                "User", user, "full_name"
+            )
+
+            # Handle potential grand_total vs total_price naming differences
+            amount = doc.get("grand_total") or doc.get("total_price") or 0
+
+            payload = {
+                "tx_ref": tx_ref,
+                "amount": amount,
+                "currency": doc.get("currency")
+                or frappe.db.get_single_value("System Settings", "currency"),
+                "redirect_url": f"{
+                    frappe.utils.get_url()}/api/method/paas.api.flutterwave_callback",
+                "customer": {
+                    "email": customer_email,
+                    "phonenumber": customer_phone,
+                    "name": customer_full_name,
+                },
+                "customizations": {
+                    "title": f"Payment for {doctype} {doc.name}",
+                    "logo": frappe.get_website_settings("website_logo"),
+                },
+            }
+
+            # Make the request to Flutterwave
+            response = http_client.gateway_post(
+                self.name,
+                f"{self.api_url}/payments",
+                json=payload,
+                headers=self._headers(),
+            )
+            response.raise_for_status()
+            response_data = response.json()
+
+            if response_data.get("status") == "success":
+                # Update the document with the transaction reference
+                doc.custom_payment_transaction_id = tx_ref
+                doc.save(ignore_permissions=True)
+                frappe.db.commit()
+
+                return {"payment_url": response_data["data"]["link"]}
+            else:
+                frappe.log_error(f"Flutterwave initiation failed: {
+                    response_data.get('message')}", "Flutterwave Error")
+                frappe.throw("Failed to initiate payment with Flutterwave.")
+
+        except Exception as e:
+            frappe.db.rollback()
+            frappe.log_error(
+                frappe.get_traceback(), "Flutterwave Payment Initiation Failed"
+            )
+            frappe.throw(f"An error occurred during payment initiation: {e}")
+
+    def verify(self, data):
+        status = data.get("status")
+        tx_ref = data.get("tx_ref")
+        transaction_id = data.get("transaction_id")
+
+        order_id = tx_ref.split("-")[0]
+        order = frappe.get_doc("Order", order_id)
+        if order.payment_status == "Paid":
+            return
+
+        if status != "successful":
+            order.payment_status = "Failed"
+            order.save(ignore_permissions=True)
+            return
+
+        response = http_client.gateway_get(
+            self.name,
+            f"{self.api_url}/transactions/{transaction_id}/verify",
+            headers=self._headers(),
+        )
+        response.raise_for_status()
+        verification_data = response.json()
+
+        if (
+            verification_data.get("status") == "success"
+            and verification_data["data"]["tx_ref"] == tx_ref
+            and verification_data["data"]["amount"] >= order.grand_total
+        ):
+            order.payment_status = "Paid"
+            order.custom_payment_transaction_id = transaction_id
+            order.save(ignore_permissions=True)
+        else:
+            order.payment_status = "Failed"
+            order.save(ignore_permissions=True)
+            frappe.log_error(
+                f"Flutterwave callback verification failed for order {order_id}. Data: {verification_data}",
+                "Flutterwave Error",
+            )
+
+    def charge_token(self, token, amount, currency, description, user):
+        if not self.config.enabled:
+            frappe.throw("Flutterwave payments are not enabled.")
+
+        payload = {
+            "token": token,
+            "currency": currency,
+            "amount": amount,
+            "email": frappe.db.get_value("User", user, "email"),
+            "tx_ref": f"pay-{frappe.utils.generate_hash()[:10]}",
+            "narrative": description,
+        }
+
+        try:
+            response = http_client.gateway_post(
+                self.name,
+                f"{self.api_url}/tokenized-charges",
+                json=payload,
+                headers=self._headers(),
+            )
+            response.raise_for_status()
+            res_data = response.json()
+            if res_data.get("status") == "success":
+                return res_data
+            else:
+                frappe.throw(f"Flutterwave Error: {res_data.get('message')}")
+        except Exception:
+            frappe.log_error(
+                frappe.get_traceback(), "Flutterwave Token Charge Failed"
+            )
+            frappe.throw(
+                "Card payment failed. Please check your card balance or try another card."
+            )
+
+    def refund(self, reference, amount=None):
+        """reference is the Flutterwave transaction id."""
+        response = http_client.gateway_post(
+            self.name,
+            f"{self.api_url}/transactions/{reference}/refund",
+            json={"amount": amount} if amount else {},
+            headers=self._headers(),
+        )
+        response.raise_for_status()
+        return response.json()
+
+
+@register_gateway
+class PayPalGateway(PaymentGateway):
+    name = "PayPal"
+
+    def _api(self):
+        """
+        Returns the PayPal API base URL for the configured mode and the
+        client id and secret for it.
+        """
+        sandbox = self.config.get("paypal_mode") == "sandbox"
+        base_url = (
+            "https://api-m.sandbox.paypal.com"
+            if sandbox
+            else "https://api-m.paypal.com"
+        )
+        prefix = "paypal_sandbox" if sandbox else "paypal_live"
+        return (
+            base_url,
+            self.config.get(f"{prefix}_client_id"),
+            self.config.get(f"{prefix}_client_secret"),
+        )
+
+    def _request(self, method, path, **kwargs):
+        """
+        Calls the PayPal API with a cached access token. On a 401 the token
+        was revoked or the secret rotated, so it is dropped and the call is
+        made once more with a fresh one.
+        """
+        base_url, client_id, client_secret = self._api()
+        for attempt in range(2):
+            access_token = http_client.get_oauth_token(
+                self.name,
+                f"{base_url}/v1/oauth2/token",
+                client_id,
+                client_secret,
+            )
+            response = http_client.gateway_request(
+                self.name,
+                method,
+                f"{base_url}{path}",
+                headers={
+                    "Content-Type": "application/json",
+                    "Authorization": f"Bearer {access_token}",
+                },
+                **kwargs,
+            )
+            if response.status_code != 401 or attempt:
+                return response
+            http_client.clear_oauth_token(client_id)
+
+    def initiate(self, doctype, docname):
+        doc = frappe.get_doc(doctype, docname)
+
+        callback_url = (
+            f"{frappe.utils.get_url()}"
+            "/api/method/paas.api.handle_paypal_callback"
+        )
+        success_url = self.config.success_redirect_url or callback_url
+        failure_url = self.config.failure_redirect_url or callback_url
+
+        amount = doc.get("total_price") or doc.get("grand_total") or 0
+        currency = doc.get("currency") or "USD"
+
+        order_payload = {
+            "intent": "CAPTURE",
+            "purchase_units": [
+                {"amount": {"currency_code": currency, "value": str(amount)}}
+            ],
+            "experience_context": {
+                "return_url": success_url,
+                "cancel_url": failure_url,
+            },
+        }
+
+        order_response = self._request(
+            "POST", "/v2/checkout/orders", json=order_payload
+        )
+        order_response.raise_for_status()
+        paypal_order = order_response.json()
+
+        self._create_transaction(doctype, doc.name, paypal_order["id"], amount)
+
+        approval_link = next(
+            (
+                link["href"]
+                for link in paypal_order["links"]
+                if link["rel"] == "approve"
+            ),
+            None,
+        )
+
+        if not approval_link:
+            frappe.throw("Could not find PayPal approval link.")
+
+        return {"redirect_url": approval_link}
+
+    def verify(self, data):
+        token = data.get("token")
+        transaction = frappe.get_doc(
+            "Transaction", {"payment_reference": token}
+        )
+        if transaction.status == "Paid":
+            return
+
+        order_response = self._request("GET", f"/v2/checkout/orders/{token}")
+        order_response.raise_for_status()
+        paypal_order = order_response.json()
+
+        status = paypal_order.get("status")
+        if data.get("approved") and status not in ("COMPLETED", "VOIDED"):
+            # Not final yet; fail the payload so a redelivery retries it
+            frappe.throw(f"PayPal order {token} is {status}, not completed.")
+        self._settle_transaction(transaction, status == "COMPLETED")
+
+    def refund(self, reference, amount=None):
+        """reference is the PayPal capture id."""
+        body = {}
+        if amount:
+            body["amount"] = {
+                "value": str(amount),
+                "currency_code": self.config.get("currency", "USD"),
+            }
+        response = self._request(
+            "POST", f"/v2/payments/captures/{reference}/refund", json=body
+        )
+        response.raise_for_status()
+        return response.json()
+
+
+# PayStack statuses after which a transaction will not change again
+PAYSTACK_FINAL_STATUSES = ("success", "failed", "reversed")
+
+
+@register_gateway
+class PayStackGateway(PaymentGateway):
+    name = "PayStack"
+    api_url = "https://api.paystack.co"
+
+    def _headers(self):
+        return {
+            "Authorization": f"Bearer {self.config.get('paystack_sk')}",
+            "Content-Type": "application/json",
+        }
+
+    def initiate(self, doctype, docname):
+        doc = frappe.get_doc(doctype, docname)
+        amount = doc.get("total_price") or doc.get("grand_total") or 0
+
+        body = {
+            "email": frappe.session.user,
+            "amount": int(amount * 100),
+            "currency": doc.get("currency") or "ZAR",
+            "callback_url": f"{
+                frappe.utils.get_url()}/api/method/paas.api.handle_paystack_callback",
+        }
+
+        response = http_client.gateway_post(
+            self.name,
+            f"{self.api_url}/transaction/initialize",
+            headers=self._headers(),
+            json=body,
+        )
+        response.raise_for_status()
+        paystack_data = response.json()
+
+        self._create_transaction(
+            doctype, doc.name, paystack_data["data"]["reference"], amount
+        )
+
+        return {"redirect_url": paystack_data["data"]["authorization_url"]}
+
+    def verify(self, data):
+        reference = data.get("reference")
+        transaction = frappe.get_doc(
+            "Transaction", {"payment_reference": reference}
+        )
+        if transaction.status == "Paid":
+            return
+
+        response = http_client.gateway_get(
+            self.name,
+            f"{self.api_url}/transaction/verify/{reference}",
+            headers=self._headers(),
+        )
+        response.raise_for_status()
+        paystack_data = response.json()
+
+        status = paystack_data["data"]["status"]
+        if status not in PAYSTACK_FINAL_STATUSES:
+            # Not final yet; fail the payload so a redelivery retries it
+            frappe.throw(f"PayStack transaction {reference} is {status}.")
+        self._settle_transaction(transaction, status == "success")
+
+    def refund(self, reference, amount=None):
+        body = {"transaction": reference}
+        if amount:
+            body["amount"] = int(float(amount) * 100)
+        response = http_client.gateway_post(
+            self.name,
+            f"{self.api_url}/refund",
+            headers=self._headers(),
+            json=body,
+        )
+        response.raise_for_status()
+        return response.json()
+
+
+@register_gateway
+class PayFastGateway(PaymentGateway):
+    name = "PayFast"
+
+    def verify(self, data):
+        transaction = frappe.get_doc(
+            "Transaction", {"payment_reference": data.get("m_payment_id")}
+        )
+        if transaction.status == "Paid":
+            return
+
+        if data.get("payment_status") == "COMPLETE":
+            self._settle_transaction(transaction, True)
+            return
+
+        if data.get("payment_status") == "FAILED":
+            transaction.status = "Failed"
+        else:
+            transaction.status = "Canceled"
+        transaction.save(ignore_permissions=True)
+
+    def charge_token(self, token, amount, currency, description, user):
+        """
+        Executes a tokenized charge via PayFast (Ad Hoc Subscription
+        pattern). Uses the v1 subscriptions charge API with proper signature
+        generation.
+        """
+        is_sandbox = self.config.is_sandbox
+        merchant_id = self.config.get("merchant_id")
+        pass_phrase = self.config.get("pass_phrase")
+
+        # Ad-hoc charge endpoint; the sandbox API is under /api
+        if is_sandbox:
+            base_url = "https://sandbox.payfast.co.za/api"
+        else:
+            base_url = "https://api.payfast.co.za"
+        url = f"{base_url}/subscriptions/{token}/adhoc"
+
+        # 1. Prepare base parameters
+        params = {
+            "merchant-id": merchant_id,
+            "version": "v1",
+            "timestamp": frappe.utils.now_datetime().strftime(
+                "%Y-%m-%dT%H:%M:%S"
+            ),
+        }
+
+        # 2. Add body parameters (these are also signed). PayFast API
+        # requires amount in cents for adhoc charges
+        body = {
+            "amount": int(float(amount) * 100),
+            "item_name": description,
+            "m_payment_id": frappe.utils.generate_hash()[:10],
+        }
+
+        # 3. Generate Signature (see PayFastCardService.php): merge base
+        # params with body, add the passphrase (if exists) and sort
+        signature_params = {**params, **body}
+        if pass_phrase:
+            signature_params["passphrase"] = pass_phrase
+
+        # PayFast expects standard urlencoding for the signature string
+        signature_string = "&".join(
+            f"{k}={quote_plus(str(signature_params[k]))}"
+            for k in sorted(signature_params)
+        )
+
+        # nosec B324 - PayFast API requires MD5
+        signature = hashlib.md5(signature_string.encode("utf-8")).hexdigest()
+
+        # 4. Prepare Headers
+        headers = {
+            "merchant-id": merchant_id,
+            "version": "v1",
+            "timestamp": params["timestamp"],
+            "signature": signature,
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+        }
+
+        try:
+            response = http_client.gateway_post(
+                self.name, url, json=body, headers=headers
+            )
+            res_data = response.json() if response.text else {}
+
+            if (
+                response.status_code in [200, 202]
+                and res_data.get("status") == "success"
+            ):
+                return res_data
+            else:
+                error_msg = res_data.get("data", {}).get(
+                    "response", "Unknown PayFast Error"
+                )
+                frappe.log_error(f"PayFast API Error ({
+                    response.status_code}): {
+                    response.text}", "PayFast Token Charge Failed")
+                frappe.throw(f"Payment failed: {error_msg}")
+
+        except Exception:
+            frappe.log_error(
+                frappe.get_traceback(), "PayFast Token Charge Exception"
+            )
+            frappe.throw("Error connecting to payment gateway.")
+
+
+@register_gateway
+class FakeGateway(PaymentGateway):
+    """
+    In-process gateway with configurable latency and failure rate. Its
+    PaaS Payment Gateway ("Fake") settings are latency_ms, jitter_ms and
+    failure_rate (0 to 1). Checkouts queue their own callback in the
+    webhook inbox, so the whole flow runs without network.
+    """
+
+    name = "Fake"
+
+    def load_config(self):
+        if not frappe.conf.get("fake_payment_gateway"):
+            frappe.throw(
+                "The fake payment gateway is not enabled on this site.",
+                frappe.PermissionError,
+            )
+        if frappe.db.exists("PaaS Payment Gateway", self.name):
+            return get_gateway_config(self.name)
+        return GatewayConfig(gateway=self.name, enabled=True, is_sandbox=True)
+
+    def _simulate(self):
+        """Waits out the configured latency; True if the call succeeds."""
+        latency = float(self.config.get("latency_ms", 0))
+        latency += random.uniform(0, float(self.config.get("jitter_ms", 0)))
+        if latency:
+            time.sleep(latency / 1000)
+        return random.random() >= float(self.config.get("failure_rate", 0))
+
+    def _reference(self):
+        return f"fake-{frappe.generate_hash(length=12)}"
+
+    def initiate(self, doctype, docname):
+        from paas.api.payment.webhooks import receive_webhook
+
+        doc = frappe.get_doc(doctype, docname)
+        if doc.user != frappe.session.user:
+            frappe.throw(
+                "You are not authorized to pay for this document.",
+                frappe.PermissionError,
+            )
+        if not self._simulate():
+            frappe.throw("Fake gateway failed to initiate the payment.")
+
+        reference = self._reference()
+        amount = doc.get("total_price") or doc.get("grand_total") or 0
+        self._create_transaction(doctype, doc.name, reference, amount)
+        receive_webhook(self.name, {"reference": reference}, reference)
+        return {"redirect_url": self.config.success_redirect_url or "/"}
+
+    def verify(self, data):
+        transaction = frappe.get_doc(
+            "Transaction", {"payment_reference": data.get("reference")}
+        )
+        if transaction.status == "Paid":
+            return
+        self._settle_transaction(transaction, self._simulate())
+
+    def charge_token(self, token, amount, currency, description, user):
+        if not self._simulate():
+            frappe.throw("Card payment failed (fake gateway decline).")
+        return {
+            "status": "success",
+            "data": {
+                "reference": self._reference(),
+                "amount": amount,
+                "currency": currency,
+            },
+        }
+
+    def refund(self, reference, amount=None):
+        if not self._simulate():
+            frappe.throw("Refund failed (fake gateway decline).")
+        return {"status": "success", "data": {"reference": reference}}
+
+
+def benchmark_charges(token, user, count=100, amount=1, currency="ZAR"):
+    """
+    Charges a saved card token count times and returns timings, e.g. with
+    bench execute against a Saved Card on the Fake gateway.
+    """
+    from paas.api.payment.payment import _charge_card_token
+
+    timings = []
+    failures = 0
+    for _ in range(int(count)):
+        started = time.perf_counter()
+        try:
+            _charge_card_token(token, amount, currency, "Benchmark", user)
+        except frappe.ValidationError:
+            failures += 1
+        timings.append(time.perf_counter() - started)
+
+    timings.sort()
+    return {
+        "count": len(timings),
+        "failures": failures,
+        "mean_ms": sum(timings) / len(timings) * 1000 if timings else 0,
+        "p95_ms": timings[int(len(timings) * 0.95)] * 1000 if timings else 0,
+    }
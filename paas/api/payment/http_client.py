@@ -0,0 +1,127 @@
+# Copyright (c) 2025 ROKCT INTELLIGENCE (PTY) LTD
+# For license information, please see license.txt
+
+"""
+HTTP layer for payment gateway calls.
+
+Each gateway gets its own requests.Session per worker, so calls reuse
+pooled keep-alive connections instead of opening a TCP+TLS handshake per
+request. Every call has a timeout, and idempotent calls are retried a
+bounded number of times with exponential backoff on connection errors,
+timeouts and 429/5xx responses. POSTs are only retried when the caller
+marks them idempotent. OAuth client-credentials tokens are cached in Redis
+per client id until shortly before they expire.
+"""
+
+import time
+
+import frappe
+import requests
+from requests.adapters import HTTPAdapter
+
+# (connect, read) seconds
+GATEWAY_TIMEOUT = (5, 30)
+GATEWAY_POOL_SIZE = 10
+
+GATEWAY_RETRIES = 2
+GATEWAY_BACKOFF = 0.5
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE")
+
+# Redis hash of OAuth tokens, one field per client id.
+OAUTH_TOKEN_KEY = "paas:gateway_oauth_token"
+# Tokens are refreshed this many seconds before the gateway expires them.
+OAUTH_EXPIRY_MARGIN = 60
+
+# gateway -> Session
+_sessions = {}
+
+
+def get_session(gateway: str) -> requests.Session:
+    """Returns the worker's pooled session for a gateway."""
+    session = _sessions.get(gateway)
+    if session is None:
+        adapter = HTTPAdapter(
+            pool_connections=1, pool_maxsize=GATEWAY_POOL_SIZE, max_retries=0
+        )
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        _sessions[gateway] = session
+    return session
+
+
+def gateway_request(
+    gateway, method, url, timeout=GATEWAY_TIMEOUT, idempotent=None, **kwargs
+):
+    """
+    Sends a request on the gateway's session and returns the response.
+    idempotent defaults to whether the method is; pass True for POSTs that
+    are safe to repeat, such as OAuth token requests.
+    """
+    method = method.upper()
+    if idempotent is None:
+        idempotent = method in IDEMPOTENT_METHODS
+    retries = GATEWAY_RETRIES if idempotent else 0
+    session = get_session(gateway)
+
+    for attempt in range(retries + 1):
+        last_attempt = attempt == retries
+        try:
+            response = session.request(method, url, timeout=timeout, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            if last_attempt:
+                raise
+        else:
+            if last_attempt or response.status_code not in RETRY_STATUSES:
+                return response
+            response.close()
+        time.sleep(GATEWAY_BACKOFF * 2**attempt)
+
+
+def gateway_get(gateway, url, **kwargs):
+    return gateway_request(gateway, "GET", url, **kwargs)
+
+
+def gateway_post(gateway, url, **kwargs):
+    return gateway_request(gateway, "POST", url, **kwargs)
+
+
+def get_oauth_token(gateway, token_url, client_id, client_secret):
+    """
+    Returns a client-credentials access token, fetching a new one only when
+    the cached token for client_id is missing or about to expire.
+    """
+    cached = frappe.cache.hget(OAUTH_TOKEN_KEY, client_id)
+    if cached and cached["expires_at"] > time.time():
+        return cached["access_token"]
+
+    response = gateway_post(
+        gateway,
+        token_url,
+        auth=(client_id, client_secret),
+        data={"grant_type": "client_credentials"},
+        idempotent=True,
+    )
+    response.raise_for_status()
+    data = response.json()
+
+    expires_in = data.get("expires_in") or 0
+    if expires_in > OAUTH_EXPIRY_MARGIN:
+        frappe.cache.hset(
+            OAUTH_TOKEN_KEY,
+            client_id,
+            {
+                "access_token": data["access_token"],
+                "expires_at": time.time() + expires_in - OAUTH_EXPIRY_MARGIN,
+            },
+        )
+    return data["access_token"]
+
+
+def clear_oauth_token(client_id=None):
+    """Drops one client's cached token, or all of them."""
+    if client_id:
+        frappe.cache.hdel(OAUTH_TOKEN_KEY, client_id)
+    else:
+        frappe.cache.delete_value(OAUTH_TOKEN_KEY)
@@ -1,7 +1,10 @@
 import frappe
+import hashlib
+import hmac
 import json
-import requests
 from frappe.model.document import Document
+from paas.api.payment.gateways import get_gateway
+from paas.api.payment.webhooks import receive_webhook
 
 
 @frappe.whitelist(allow_guest=True)
@@ -69,189 +72,67 @@ def get_payment_gateway(id: str):
 
 
 @frappe.whitelist()
-def initiate_flutterwave_payment(order_id: str):
-    return _initiate_flutterwave_logic("Order", order_id)
-
-
-@frappe.whitelist()
-def initiate_flutterwave_parcel_payment(order_id: str):
-    return _initiate_flutterwave_logic("Parcel Order", order_id)
-
-
-def _initiate_flutterwave_logic(doctype: str, docname: str):  # noqa: C901
+def initiate_payment(gateway: str, order_id: str, doctype: str = "Order"):
     """
-    Internal logic for Flutterwave initiation across different doctypes.
+    Starts a checkout on any registered gateway that supports it, e.g. the
+    fake gateway in load tests.
     """
-    user = frappe.session.user
-    if user == "Guest":
-        frappe.throw("You must be logged in to make a payment.")
+    if doctype not in ("Order", "Parcel Order"):
+        frappe.throw("Payments can only be made for orders.")
 
-    try:
-        doc = frappe.get_doc(doctype, docname)
-        # Check authorization - for Order it's 'user', for Parcel Order it's
-        # 'user'
-        if doc.user != user:
-            frappe.throw(
-                "You are not authorized to pay for this document.",
-                frappe.PermissionError,
-            )
+    adapter = get_gateway(gateway)
+    if not adapter.supports("initiate"):
+        frappe.throw(f"{gateway} does not support checkout payments.")
+    return adapter.initiate(doctype, order_id)
 
-        if doc.payment_status == "Paid":
-            frappe.throw("This document has already been paid for.")
-
-        flutterwave_settings = frappe.get_doc("Flutterwave Settings")
-        if not flutterwave_settings.enabled:
-            frappe.throw("Flutterwave payments are not enabled.")
-
-        # Prepare the request to Flutterwave
-        tx_ref = f"{doc.name}-{frappe.utils.now_datetime().strftime('%Y%m%d%H%M%S')}"
-
-        # Get customer details
-        customer_email = frappe.db.get_value("User", user, "email")
-        customer_phone = frappe.db.get_value("User", user, "phone")
-        customer_full_name = frappe.db.get_value("User", user, "full_name")
-
-        # Handle potential grand_total vs total_price naming differences
-        amount = doc.get("grand_total") or doc.get("total_price") or 0
-
-        payload = {
-            "tx_ref": tx_ref,
-            "amount": amount,
-            "currency": doc.get("currency") or frappe.db.get_single_value(
-                "System Settings",
-                "currency"),
-            "redirect_url": f"{
-                frappe.utils.get_url()}/api/method/paas.api.flutterwave_callback",
-            "customer": {
-                "email": customer_email,
-                "phonenumber": customer_phone,
-                "name": customer_full_name,
-            },
-            "customizations": {
-                "title": f"Payment for {doctype} {
-                    doc.name}",
-                "logo": frappe.get_website_settings("website_logo"),
-            },
-        }
-
-        headers = {
-            "Authorization": f"Bearer {
-                flutterwave_settings.get_password('secret_key')}",
-            "Content-Type": "application/json",
-        }
 
-        # Make the request to Flutterwave
-        response = requests.post(
-            "https://api.flutterwave.com/v3/payments",
-            json=payload,
-            headers=headers,
-        )
-        response.raise_for_status()
-        response_data = response.json()
-
-        if response_data.get("status") == "success":
-            # Update the document with the transaction reference
-            doc.custom_payment_transaction_id = tx_ref
-            doc.save(ignore_permissions=True)
-            frappe.db.commit()
+@frappe.whitelist()
+def initiate_flutterwave_payment(order_id: str):
+    return get_gateway("Flutterwave").initiate("Order", order_id)
 
-            return {"payment_url": response_data["data"]["link"]}
-        else:
-            frappe.log_error(f"Flutterwave initiation failed: {
-                response_data.get('message')}", "Flutterwave Error")
-            frappe.throw("Failed to initiate payment with Flutterwave.")
 
-    except Exception as e:
-        frappe.db.rollback()
-        frappe.log_error(
-            frappe.get_traceback(), "Flutterwave Payment Initiation Failed"
-        )
-        frappe.throw(f"An error occurred during payment initiation: {e}")
+@frappe.whitelist()
+def initiate_flutterwave_parcel_payment(order_id: str):
+    return get_gateway("Flutterwave").initiate("Parcel Order", order_id)
 
 
 @frappe.whitelist(allow_guest=True)
 def flutterwave_callback():
     """
-    Handles the callback from Flutterwave after a payment attempt.
+    Handles the redirect from Flutterwave after a payment attempt. The
+    attempt is queued for verification and the customer is redirected
+    straight away; the order is updated once Flutterwave confirms it.
     """
     args = frappe.request.args
     status = args.get("status")
     tx_ref = args.get("tx_ref")
     transaction_id = args.get("transaction_id")
 
-    flutterwave_settings = frappe.get_doc("Flutterwave Settings")
+    flutterwave_config = get_gateway("Flutterwave").config
     success_url = (
-        flutterwave_settings.success_redirect_url or "/payment-success"
+        flutterwave_config.success_redirect_url or "/payment-success"
     )
     failure_url = (
-        flutterwave_settings.failure_redirect_url or "/payment-failed"
+        flutterwave_config.failure_redirect_url or "/payment-failed"
     )
 
+    frappe.local.response["type"] = "redirect"
     if not tx_ref:
-        frappe.local.response["type"] = "redirect"
         frappe.local.response["location"] = (
             failure_url + "?reason=tx_ref_missing"
         )
         return
 
-    try:
-        order_id = tx_ref.split("-")[0]
-        order = frappe.get_doc("Order", order_id)
-
-        if status == "successful":
-            headers = {"Authorization": f"Bearer {
-                flutterwave_settings.get_password('secret_key')}"}
-            verify_url = f"https://api.flutterwave.com/v3/transactions/{transaction_id}/verify"
-            response = requests.get(verify_url, headers=headers)
-            response.raise_for_status()
-            verification_data = response.json()
-
-            if (
-                verification_data.get("status") == "success"
-                and verification_data["data"]["tx_ref"] == tx_ref
-                and verification_data["data"]["amount"] >= order.grand_total
-            ):
-
-                order.payment_status = "Paid"
-                order.custom_payment_transaction_id = transaction_id
-                order.save(ignore_permissions=True)
-                frappe.db.commit()
-
-                frappe.local.response["type"] = "redirect"
-                frappe.local.response["location"] = success_url
-                return
-
-            else:
-                order.payment_status = "Failed"
-                order.save(ignore_permissions=True)
-                frappe.db.commit()
-                frappe.log_error(
-                    f"Flutterwave callback verification failed for order {order_id}. Data: {verification_data}",
-                    "Flutterwave Error",
-                )
-                frappe.local.response["type"] = "redirect"
-                frappe.local.response["location"] = (
-                    failure_url + "?reason=verification_failed"
-                )
-                return
-
-        else:  # Status is 'cancelled' or 'failed'
-            order.payment_status = "Failed"
-            order.save(ignore_permissions=True)
-            frappe.db.commit()
-            frappe.local.response["type"] = "redirect"
-            frappe.local.response["location"] = (
-                failure_url + f"?reason={status}"
-            )
-            return
+    receive_webhook(
+        "Flutterwave",
+        {"status": status, "tx_ref": tx_ref, "transaction_id": transaction_id},
+        f"{tx_ref}:{transaction_id}:{status}",
+    )
 
-    except Exception:
-        frappe.db.rollback()
-        frappe.log_error(frappe.get_traceback(), "Flutterwave Callback Failed")
-        frappe.local.response["type"] = "redirect"
-        frappe.local.response["location"] = (
-            failure_url + "?reason=internal_error"
-        )
+    if status == "successful":
+        frappe.local.response["location"] = success_url
+    else:  # Status is 'cancelled' or 'failed'
+        frappe.local.response["location"] = failure_url + f"?reason={status}"
 
 
 @frappe.whitelist()
@@ -259,16 +140,15 @@ def get_payfast_settings():
     """
     Returns the PayFast settings.
     """
-    payfast_settings = frappe.get_doc("PaaS Payment Gateway", "PayFast")
-    settings = {s.key: s.value for s in payfast_settings.settings}
+    payfast_config = get_gateway("PayFast").config
     return {
-        "merchant_id": settings.get("merchant_id"),
-        "merchant_key": settings.get("merchant_key"),
-        "pass_phrase": settings.get("pass_phrase"),
-        "is_sandbox": payfast_settings.is_sandbox,
-        "success_redirect_url": payfast_settings.success_redirect_url
+        "merchant_id": payfast_config.get("merchant_id"),
+        "merchant_key": payfast_config.get("merchant_key"),
+        "pass_phrase": payfast_config.get("pass_phrase"),
+        "is_sandbox": int(payfast_config.is_sandbox),
+        "success_redirect_url": payfast_config.success_redirect_url
         or "/payment-success",
-        "failure_redirect_url": payfast_settings.failure_redirect_url
+        "failure_redirect_url": payfast_config.failure_redirect_url
         or "/payment-failed",
     }
 
@@ -276,7 +156,8 @@ def get_payfast_settings():
 @frappe.whitelist(allow_guest=True)
 def handle_payfast_callback():
     """
-    Handles the PayFast payment callback.
+    Handles the PayFast payment callback. The signature is checked here and
+    the notification is queued; the transaction is updated by the inbox.
     """
     data = frappe.form_dict
 
@@ -287,14 +168,7 @@ def handle_payfast_callback():
         )
         return
 
-    transaction = frappe.get_doc(
-        "Transaction", {"payment_reference": transaction_id}
-    )
-
-    payfast_settings = frappe.get_doc("PaaS Payment Gateway", "PayFast")
-    settings = {s.key: s.value for s in payfast_settings.settings}
-
-    passphrase = settings.get("pass_phrase")
+    passphrase = get_gateway("PayFast").config.get("pass_phrase")
 
     pf_param_string = ""
     for key in sorted(data.keys()):
@@ -310,21 +184,14 @@ def handle_payfast_callback():
 
     if signature != data.get("signature"):
         frappe.log_error("PayFast callback signature mismatch", data)
-        transaction.status = "Failed"
-        transaction.save(ignore_permissions=True)
         return
 
-    if data.get("payment_status") == "COMPLETE":
-        transaction.status = "Paid"
-        order = frappe.get_doc("Order", transaction.payable_id)
-        order.status = "Paid"
-        order.save(ignore_permissions=True)
-    elif data.get("payment_status") == "FAILED":
-        transaction.status = "Failed"
-    else:
-        transaction.status = "Canceled"
-
-    transaction.save(ignore_permissions=True)
+    receive_webhook(
+        "PayFast",
+        dict(data),
+        f"{transaction_id}:{data.get('pf_payment_id')}:"
+        f"{data.get('payment_status')}",
+    )
 
 
 @frappe.whitelist()
@@ -397,10 +264,15 @@ def delete_payfast_card(card_name: str):
     return {"status": "success", "message": "Card deleted successfully."}
 
 
+# Guest-callable: PayPal sends the buyer's browser here, and it may not
+# carry a session for the site. Nothing here is trusted; the inbox
+# looks the order up with PayPal before changing anything.
 @frappe.whitelist(allow_guest=True)
 def handle_paypal_callback():
     """
-    Handles the PayPal payment callback.
+    Handles the PayPal return and cancel redirects. The order is queued for
+    verification and the customer is redirected straight away. PayPal only
+    sends a PayerID when the buyer approved the payment.
     """
     data = frappe.form_dict
 
@@ -409,274 +281,86 @@ def handle_paypal_callback():
         frappe.log_error("PayPal callback received without token", data)
         return
 
-    transaction = frappe.get_doc("Transaction", {"payment_reference": token})
-
-    paypal_settings_doc = frappe.get_doc("PaaS Payment Gateway", "PayPal")
-    settings = {s.key: s.value for s in paypal_settings_doc.settings}
-    success_url = (
-        paypal_settings_doc.success_redirect_url or "/payment-success"
-    )
-    failure_url = paypal_settings_doc.failure_redirect_url or "/payment-failed"
+    paypal_config = get_gateway("PayPal").config
+    success_url = paypal_config.success_redirect_url or "/payment-success"
+    failure_url = paypal_config.failure_redirect_url or "/payment-failed"
 
-    auth_url = (
-        "https://api-m.sandbox.paypal.com/v1/oauth2/token"
-        if settings.get("paypal_mode") == "sandbox"
-        else "https://api-m.paypal.com/v1/oauth2/token"
-    )
-    client_id = (
-        settings.get("paypal_sandbox_client_id")
-        if settings.get("paypal_mode") == "sandbox"
-        else settings.get("paypal_live_client_id")
-    )
-    client_secret = (
-        settings.get("paypal_sandbox_client_secret")
-        if settings.get("paypal_mode") == "sandbox"
-        else settings.get("paypal_live_client_secret")
+    approved = bool(data.get("PayerID"))
+    receive_webhook(
+        "PayPal",
+        {"token": token, "approved": approved},
+        f"{token}:{'approved' if approved else 'cancelled'}",
     )
 
-    auth_response = requests.post(
-        auth_url,
-        auth=(client_id, client_secret),
-        data={"grant_type": "client_credentials"},
+    frappe.local.response["type"] = "redirect"
+    frappe.local.response["location"] = (
+        success_url if approved else failure_url
     )
-    auth_response.raise_for_status()
-    access_token = auth_response.json()["access_token"]
-
-    order_url = (
-        f"https://api-m.sandbox.paypal.com/v2/checkout/orders/{token}"
-        if settings.get("paypal_mode") == "sandbox"
-        else f"https://api-m.paypal.com/v2/checkout/orders/{token}"
-    )
-
-    order_response = requests.get(
-        order_url,
-        headers={
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {access_token}",
-        },
-    )
-    order_response.raise_for_status()
-    paypal_order = order_response.json()
-
-    if paypal_order.get("status") == "COMPLETED":
-        transaction.status = "Paid"
-        order = frappe.get_doc("Order", transaction.payable_id)
-        order.status = "Paid"
-        order.save(ignore_permissions=True)
-        transaction.save(ignore_permissions=True)
-        frappe.local.response["type"] = "redirect"
-        frappe.local.response["location"] = success_url
-    else:
-        transaction.status = "Failed"
-        transaction.save(ignore_permissions=True)
-        frappe.local.response["type"] = "redirect"
-        frappe.local.response["location"] = failure_url
 
 
 @frappe.whitelist()
 def initiate_paypal_payment(order_id: str):
-    return _initiate_paypal_logic("Order", order_id)
+    return get_gateway("PayPal").initiate("Order", order_id)
 
 
 @frappe.whitelist()
 def initiate_paypal_parcel_payment(order_id: str):
-    return _initiate_paypal_logic("Parcel Order", order_id)
-
-
-def _initiate_paypal_logic(doctype: str, docname: str):
-    """
-    Internal logic for PayPal initiation across different doctypes.
-    """
-    doc = frappe.get_doc(doctype, docname)
-
-    paypal_settings_doc = frappe.get_doc("PaaS Payment Gateway", "PayPal")
-    settings = {s.key: s.value for s in paypal_settings_doc.settings}
-    success_url = paypal_settings_doc.success_redirect_url or f"{
-        frappe.utils.get_url()}/api/method/paas.api.handle_paypal_callback"
-    failure_url = paypal_settings_doc.failure_redirect_url or f"{
-        frappe.utils.get_url()}/api/method/paas.api.handle_paypal_callback"
-
-    auth_url = (
-        "https://api-m.sandbox.paypal.com/v1/oauth2/token"
-        if settings.get("paypal_mode") == "sandbox"
-        else "https://api-m.paypal.com/v1/oauth2/token"
-    )
-    client_id = (
-        settings.get("paypal_sandbox_client_id")
-        if settings.get("paypal_mode") == "sandbox"
-        else settings.get("paypal_live_client_id")
-    )
-    client_secret = (
-        settings.get("paypal_sandbox_client_secret")
-        if settings.get("paypal_mode") == "sandbox"
-        else settings.get("paypal_live_client_secret")
-    )
-
-    auth_response = requests.post(
-        auth_url,
-        auth=(client_id, client_secret),
-        data={"grant_type": "client_credentials"},
-    )
-    auth_response.raise_for_status()
-    access_token = auth_response.json()["access_token"]
-
-    order_url = (
-        "https://api-m.sandbox.paypal.com/v2/checkout/orders"
-        if settings.get("paypal_mode") == "sandbox"
-        else "https://api-m.paypal.com/v2/checkout/orders"
-    )
-
-    amount = doc.get("total_price") or doc.get("grand_total") or 0
-    currency = doc.get("currency") or "USD"
-
-    order_payload = {
-        "intent": "CAPTURE",
-        "purchase_units": [
-            {"amount": {"currency_code": currency, "value": str(amount)}}
-        ],
-        "experience_context": {
-            "return_url": success_url,
-            "cancel_url": failure_url,
-        },
-    }
-
-    order_response = requests.post(
-        order_url,
-        headers={
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {access_token}",
-        },
-        json=order_payload,
-    )
-    order_response.raise_for_status()
-    paypal_order = order_response.json()
-
-    frappe.get_doc(
-        {
-            "doctype": "Transaction",
-            "payable_type": doctype,
-            "payable_id": doc.name,
-            "payment_reference": paypal_order["id"],
-            "amount": amount,
-            "status": "Pending",
-        }
-    ).insert(ignore_permissions=True)
-
-    approval_link = next(
-        (
-            link["href"]
-            for link in paypal_order["links"]
-            if link["rel"] == "approve"
-        ),
-        None,
-    )
-
-    if not approval_link:
-        frappe.throw("Could not find PayPal approval link.")
-
-    return {"redirect_url": approval_link}
+    return get_gateway("PayPal").initiate("Parcel Order", order_id)
 
 
 @frappe.whitelist()
 def initiate_paystack_payment(order_id: str):
-    return _initiate_paystack_logic("Order", order_id)
+    return get_gateway("PayStack").initiate("Order", order_id)
 
 
 @frappe.whitelist()
 def initiate_paystack_parcel_payment(order_id: str):
-    return _initiate_paystack_logic("Parcel Order", order_id)
+    return get_gateway("PayStack").initiate("Parcel Order", order_id)
 
 
-def _initiate_paystack_logic(doctype: str, docname: str):
-    """
-    Internal logic for PayStack initiation across different doctypes.
-    """
-    doc = frappe.get_doc(doctype, docname)
-
-    paystack_settings = frappe.get_doc("PaaS Payment Gateway", "PayStack")
-    settings = {s.key: s.value for s in paystack_settings.settings}
-
-    headers = {
-        "Authorization": f"Bearer {settings.get('paystack_sk')}",
-        "Content-Type": "application/json",
-    }
-
-    amount = doc.get("total_price") or doc.get("grand_total") or 0
-
-    body = {
-        "email": frappe.session.user,
-        "amount": int(
-            amount * 100),
-        "currency": doc.get("currency") or "ZAR",
-        "callback_url": f"{
-            frappe.utils.get_url()}/api/method/paas.api.handle_paystack_callback",
-    }
-
-    response = requests.post(
-        "https://api.paystack.co/transaction/initialize",
-        headers=headers,
-        json=body,
-    )
-    response.raise_for_status()
-    paystack_data = response.json()
-
-    # Create a new transaction
-    frappe.get_doc(
-        {
-            "doctype": "Transaction",
-            "payable_type": doctype,
-            "payable_id": doc.name,
-            "payment_reference": paystack_data["data"]["reference"],
-            "amount": amount,
-            "status": "Pending",
-        }
-    ).insert(ignore_permissions=True)
-
-    return {"redirect_url": paystack_data["data"]["authorization_url"]}
+def _paystack_reference(data):
+    # Redirects carry the reference; webhook events nest it under data
+    return data.get("reference") or (data.get("data") or {}).get("reference")
 
 
+# Guest-callable: PayStack webhooks are server to server and the redirect
+# may come without a site session. Nothing here is trusted; the inbox
+# verifies the reference with PayStack before changing anything.
 @frappe.whitelist(allow_guest=True)
 def handle_paystack_callback():
     """
-    Handles the PayStack payment callback.
+    Handles the PayStack redirect and webhook. Webhooks are checked against
+    their HMAC signature; either way the reference is queued and verified
+    with PayStack by the inbox.
     """
     data = frappe.form_dict
-    reference = data.get("reference")
+    reference = _paystack_reference(data)
+    # Webhooks name their event; the redirect carries none
+    event = data.get("event") or "redirect"
 
     if not reference:
         frappe.log_error("PayStack callback received without reference", data)
         return
 
-    paystack_settings = frappe.get_doc("PaaS Payment Gateway", "PayStack")
-    settings = {s.key: s.value for s in paystack_settings.settings}
+    signature = frappe.get_request_header("x-paystack-signature")
+    if signature:
+        secret_key = get_gateway("PayStack").config.get("paystack_sk", "")
+        expected = hmac.new(
+            secret_key.encode(),
+            frappe.request.get_data(),
+            hashlib.sha512,
+        ).hexdigest()
+        if not hmac.compare_digest(expected, signature):
+            frappe.log_error("PayStack webhook signature mismatch", data)
+            return
 
-    headers = {
-        "Authorization": f"Bearer {settings.get('paystack_sk')}",
-    }
+    if event != "redirect" and not signature:
+        frappe.log_error("PayStack webhook received without signature", data)
+        return
 
-    response = requests.get(
-        f"https://api.paystack.co/transaction/verify/{reference}",
-        headers=headers,
+    receive_webhook(
+        "PayStack", {"reference": reference}, f"{reference}:{event}"
     )
-    response.raise_for_status()
-    paystack_data = response.json()
-
-    if paystack_data["data"]["status"] == "success":
-        transaction = frappe.get_doc(
-            "Transaction", {"payment_reference": reference}
-        )
-        transaction.status = "Paid"
-        transaction.save(ignore_permissions=True)
-
-        order = frappe.get_doc("Order", transaction.payable_id)
-        order.status = "Paid"
-        order.save(ignore_permissions=True)
-    else:
-        transaction = frappe.get_doc(
-            "Transaction", {"payment_reference": reference}
-        )
-        transaction.status = "Failed"
-        transaction.save(ignore_permissions=True)
 
 
 @frappe.whitelist(allow_guest=True)
@@ -833,172 +517,21 @@ def _charge_card_token(token, amount, currency, description, user):
         saved_card.gateway or "PayFast"
     )  # Default to PayFast for legacy
 
-    if gateway_name == "Flutterwave":
-        return _charge_flutterwave_token(
-            token, amount, currency, description, user
-        )
-    elif gateway_name == "PayFast":
-        return _charge_payfast_token(token, amount, currency, description)
-    else:
-        # Fallback to local simulation if no production gateway is matched,
-        # but log a warning as this shouldn't happen in production.
-        frappe.log_error(
-            f"Unsupported gateway {gateway_name} for token charge.",
-            "Payment Warning",
-        )
-        return {
-            "status": "success",
-            "message": "Simulated success (Unconfigured Gateway)",
-        }
-
-
-def _charge_flutterwave_token(token, amount, currency, description, user):
-    """
-    Executes a tokenized charge via Flutterwave.
-    """
-    settings = frappe.get_doc("Flutterwave Settings")
-    if not settings.enabled:
-        frappe.throw("Flutterwave payments are not enabled.")
-
-    url = "https://api.flutterwave.com/v3/tokenized-charges"
-    headers = {
-        "Authorization": f"Bearer {settings.get_password('secret_key')}",
-        "Content-Type": "application/json",
-    }
-
-    user_email = frappe.db.get_value("User", user, "email")
-
-    payload = {
-        "token": token,
-        "currency": currency,
-        "amount": amount,
-        "email": user_email,
-        "tx_ref": f"pay-{frappe.utils.generate_hash()[:10]}",
-        "narrative": description,
-    }
-
-    try:
-        response = requests.post(
-            url, json=payload, headers=headers, timeout=30
-        )
-        response.raise_for_status()
-        res_data = response.json()
-        if res_data.get("status") == "success":
-            return res_data
-        else:
-            frappe.throw(f"Flutterwave Error: {res_data.get('message')}")
-    except Exception:
-        frappe.log_error(
-            frappe.get_traceback(), "Flutterwave Token Charge Failed"
-        )
-        frappe.throw(
-            "Card payment failed. Please check your card balance or try another card."
-        )
+    gateway = get_gateway(gateway_name, raise_exception=False)
+    if gateway and gateway.supports("charge_token"):
+        return gateway.charge_token(token, amount, currency, description, user)
 
-
-def _charge_payfast_token(token, amount, currency, description):
-    """
-    Executes a tokenized charge via PayFast (Ad Hoc Subscription pattern).
-    Uses the v1 subscriptions charge API with proper signature generation.
-    """
-    settings = get_payfast_settings()
-    is_sandbox = settings.get("is_sandbox", True)
-    base_url = (
-        "api.payfast.co.za" if not is_sandbox else "sandbox.payfast.co.za"
-    )
-
-    merchant_id = settings.get("merchant_id")
-    _merchant_key = settings.get("merchant_key")  # noqa: F841
-    pass_phrase = settings.get("pass_phrase")
-
-    # Ad-hoc charge endpoint
-    url = f"https://{base_url}/subscriptions/{token}/adhoc"
-    if is_sandbox and not url.endswith(
-        "/api"
-    ):  # Sandbox API is usually under /api
-        url = f"https://sandbox.payfast.co.za/api/subscriptions/{token}/adhoc"
-
-    # PayFast API requires amount in cents for adhoc charges
-    amount_in_cents = int(float(amount) * 100)
-
-    # 1. Prepare base parameters
-    params = {
-        "merchant-id": merchant_id,
-        "version": "v1",
-        "timestamp": frappe.utils.now_datetime().strftime("%Y-%m-%dT%H:%M:%S"),
-    }
-
-    # 2. Add body parameters (these are also signed)
-    body = {
-        "amount": amount_in_cents,
-        "item_name": description,
-        "m_payment_id": frappe.utils.generate_hash()[:10],
-    }
-
-    # 3. Generate Signature
-    # According to PayFastCardService.php:
-    # a) Merge base params with body
-    all_params = {**params, **body}
-    # b) Initial Sort
-    _keys_sorted = sorted(all_params.keys())  # noqa: F841
-
-    # c) Add passphrase (if exists) after initial sort but then sort AGAIN
-    signature_params = all_params.copy()
-    if pass_phrase:
-        signature_params["passphrase"] = pass_phrase
-
-    final_sorted_keys = sorted(signature_params.keys())
-
-    # d) Build query string
-    from urllib.parse import urlencode
-
-    # PayFast expects standard urlencoding for the signature string
-    signature_string = "&".join(
-        [
-            f"{k}={urlencode(str(signature_params[k]))}"
-            for k in final_sorted_keys
-        ]
+    # Fallback to local simulation if no production gateway is matched,
+    # but log a warning as this shouldn't happen in production.
+    frappe.log_error(
+        f"Unsupported gateway {gateway_name} for token charge.",
+        "Payment Warning",
     )
-
-    import hashlib
-
-    # nosec B324 - PayFast API requires MD5
-    signature = hashlib.md5(signature_string.encode("utf-8")).hexdigest()
-
-    # 4. Prepare Headers
-    headers = {
-        "merchant-id": merchant_id,
-        "version": "v1",
-        "timestamp": params["timestamp"],
-        "signature": signature,
-        "Content-Type": "application/json",
-        "Accept": "application/json",
+    return {
+        "status": "success",
+        "message": "Simulated success (Unconfigured Gateway)",
     }
 
-    try:
-        response = requests.post(url, json=body, headers=headers, timeout=30)
-        res_data = response.json() if response.text else {}
-
-        if (
-            response.status_code in [200, 202]
-            and res_data.get("status") == "success"
-        ):
-            return res_data
-        else:
-            error_msg = res_data.get("data", {}).get(
-                "response", "Unknown PayFast Error"
-            )
-            frappe.log_error(f"PayFast API Error ({
-                response.status_code}): {
-                response.text}", "PayFast Token Charge Failed")
-            frappe.throw(f"Payment failed: {error_msg}")
-
-    except Exception:
-        frappe.log_error(
-            frappe.get_traceback(), "PayFast Token Charge Exception"
-        )
-        frappe.throw("Error connecting to payment gateway.")
-
 
 @frappe.whitelist()
 def process_token_payment(order_id, token):
@@ -0,0 +1,154 @@
+# Copyright (c) 2025 ROKCT INTELLIGENCE (PTY) LTD
+# For license information, please see license.txt
+
+"""
+Inbox for payment gateway callbacks.
+
+Callback endpoints only do what they can check locally, such as a
+signature and the fields they need. They then store the payload as a
+Pending Payment Payload and return. Each payload carries an idempotency
+key, so a gateway delivering the same event again is dropped while the
+first delivery is Pending or Processed. A redelivery of a Failed or
+Processing payload puts it back to Pending, so gateway retries get
+another go after a transient error. process_payment_webhooks drains the
+inbox oldest first. It calls the gateway adapter's verify, which checks
+with the gateway and updates orders, then marks each payload Processed
+or Failed. It is enqueued after every new payload and also runs on the
+scheduler to pick up stragglers.
+"""
+
+import frappe
+from frappe.utils import add_to_date, now_datetime
+from paas.api.payment.gateways import get_gateway
+
+WEBHOOK_BATCH_SIZE = 100
+
+# Payloads left Processing this long (their worker died) are claimed again.
+WEBHOOK_STALE_SECONDS = 10 * 60
+
+
+def receive_webhook(gateway, payload, idempotency_key):
+    """
+    Stores a callback payload in the inbox and queues the drain job.
+    Returns False if the event is already queued or was processed.
+    """
+    idempotency_key = f"{gateway}:{idempotency_key}"
+    existing = frappe.db.get_value(
+        "Payment Payload",
+        {"idempotency_key": idempotency_key},
+        ["name", "status"],
+        as_dict=True,
+    )
+    if existing:
+        if existing.status in ("Pending", "Processed"):
+            return False
+        # Failed, or being verified against an older gateway state: queue
+        # it again. A worker still holding it skips its final write.
+        frappe.db.set_value(
+            "Payment Payload",
+            existing.name,
+            {
+                "status": "Pending",
+                "error": None,
+                "payload": frappe.as_json(payload),
+            },
+        )
+    else:
+        frappe.db.savepoint("payment_webhook")
+        try:
+            frappe.get_doc(
+                {
+                    "doctype": "Payment Payload",
+                    "gateway": gateway,
+                    "idempotency_key": idempotency_key,
+                    "status": "Pending",
+                    "payload": frappe.as_json(payload),
+                }
+            ).insert(ignore_permissions=True)
+        except (frappe.DuplicateEntryError, frappe.UniqueValidationError):
+            # A concurrent delivery of the same event got there first
+            frappe.db.rollback(save_point="payment_webhook")
+            return False
+
+    # Callbacks arrive as GETs too, which are not committed for us
+    frappe.db.commit()
+    frappe.enqueue(
+        "paas.api.payment.webhooks.process_payment_webhooks",
+        queue="short",
+        job_id="process_payment_webhooks",
+        deduplicate=True,
+    )
+    return True
+
+
+def _claim_payloads():
+    """
+    Marks the next batch of Pending payloads as Processing and returns their
+    names, oldest first. SKIP LOCKED lets several workers drain at once
+    without claiming the same rows.
+    """
+    now = now_datetime()
+    claimed = frappe.db.sql(
+        """
+        UPDATE "tabPayment Payload"
+        SET status = 'Processing', modified = %(now)s
+        WHERE name IN (
+            SELECT name FROM "tabPayment Payload"
+            WHERE status = 'Pending'
+                OR (status = 'Processing' AND modified < %(stale_before)s)
+            ORDER BY creation
+            LIMIT %(limit)s
+            FOR UPDATE SKIP LOCKED
+        )
+        RETURNING name, creation
+        """,
+        {
+            "now": now,
+            "stale_before": add_to_date(now, seconds=-WEBHOOK_STALE_SECONDS),
+            "limit": WEBHOOK_BATCH_SIZE,
+        },
+        as_dict=True,
+    )
+    frappe.db.commit()
+    return [row.name for row in sorted(claimed, key=lambda row: row.creation)]
+
+
+def _process_payload(name):
+    payload = frappe.db.get_value(
+        "Payment Payload", name, ["gateway", "payload"], as_dict=True
+    )
+    try:
+        gateway = get_gateway(payload.gateway)
+        gateway.verify(frappe.parse_json(payload.payload))
+        status, error = "Processed", None
+    except Exception:
+        frappe.db.rollback()
+        error = frappe.get_traceback()
+        frappe.log_error(error, f"{payload.gateway} Webhook Failed")
+        status = "Failed"
+
+    # Only if still ours: a redelivery may have put it back to Pending
+    frappe.db.sql(
+        """
+        UPDATE "tabPayment Payload"
+        SET status = %(status)s, error = %(error)s, modified = %(now)s
+        WHERE name = %(name)s AND status = 'Processing'
+        """,
+        {
+            "name": name,
+            "status": status,
+            "error": error,
+            "now": now_datetime(),
+        },
+    )
+    frappe.db.commit()
+
+
+def process_payment_webhooks():
+    """Applies every Pending payload in the inbox, committing each one."""
+    while True:
+        names = _claim_payloads()
+        if not names:
+            break
+        for name in names:
+            _process_payload(name)
@@ -1,6 +1,10 @@
 import frappe
 import json
-from paas.api.utils import api_response
+from frappe.utils import cint
+from paas.api.utils import api_response, decode_cursor, encode_cursor
+from paas.paas.doctype.product_sales_counter.product_sales_counter import (
+    get_sales_field,
+)
 
 
 @frappe.whitelist(allow_guest=True)
@@ -13,10 +17,15 @@ def get_products(  # noqa: C901
     order_by: str = None,  # new, old, best_sale, low_sale, high_rating, low_rating
     rating: str = None,  # e.g. "1,5"
     search: str = None,
+    cursor: str = None,
 ):
     """
     Retrieves a list of products (Items) with pagination, advanced filters, and sorting.
+    Pass cursor (empty for the first page) to page by next_cursor instead of
+    limit_start.
     """
+    limit_start = cint(limit_start)
+    limit_page_length = cint(limit_page_length) or 20
     params = {}
     conditions = [
         "t_item.disabled = 0",
@@ -98,83 +107,83 @@ def get_products(  # noqa: C901
         # Use custom term for @@ operator
         query = query.where(MatchTerm(ts_vector, ts_query))
 
-    # Rating filter and sorting
-    if rating or order_by in ["high_rating", "low_rating"]:
-        t_review = frappe.qb.DocType("Review")
-        from frappe.query_builder.functions import Avg, Count, Sum
+    # Ratings come from the precomputed Review Summary (one row per item)
+    from frappe.query_builder.functions import Coalesce
 
-        # Subquery for average rating
-        subquery = (
-            frappe.qb.from_(t_review)
-            .select(
-                t_review.reviewable_id, Avg(t_review.rating).as_("avg_rating")
+    t_summary = frappe.qb.DocType("Review Summary")
+    avg_rating = Coalesce(t_summary.avg_rating, 0)
+    query = (
+        query.left_join(t_summary)
+        .on(
+            (t_summary.reviewable_type == "Item")
+            & (t_summary.reviewable_id == t_item.name)
+        )
+        .select(
+            avg_rating.as_("avg_rating"),
+            Coalesce(t_summary.review_count, 0).as_("reviews_count"),
+        )
+    )
+
+    sort_term = t_item.creation
+    descending = order_by != "old"
+
+    if rating:
+        try:
+            min_rating, max_rating = map(float, rating.split(","))
+            query = query.where(t_summary.avg_rating >= min_rating).where(
+                t_summary.avg_rating <= max_rating
             )
-            .where(t_review.reviewable_type == "Item")
-            .groupby(t_review.reviewable_id)
-        ).as_("t_reviews")
+        except (ValueError, IndexError):
+            pass  # Ignore invalid rating format
 
-        query = query.left_join(subquery).on(
-            subquery.reviewable_id == t_item.name
-        )
+    if order_by in ["high_rating", "low_rating"]:
+        # Unrated products count as 0 so they sort last (or first)
+        sort_term = avg_rating
+        descending = order_by == "high_rating"
 
-        if rating:
-            try:
-                min_rating, max_rating = map(float, rating.split(","))
-                query = query.where(subquery.avg_rating >= min_rating).where(
-                    subquery.avg_rating <= max_rating
-                )
-            except (ValueError, IndexError):
-                pass  # Ignore invalid rating format
-
-        if order_by == "high_rating":
-            query = query.orderby(
-                subquery.avg_rating, order=frappe.qb.desc
-            ).orderby(subquery.avg_rating.isnull())
-        elif order_by == "low_rating":
-            query = query.orderby(
-                subquery.avg_rating, order=frappe.qb.asc
-            ).orderby(subquery.avg_rating.isnull())
-
-    # Sales-based sorting
+    # Sales-based sorting from the precomputed sales counters
     elif order_by in ["best_sale", "low_sale"]:
-        t_sales_item = frappe.qb.DocType("Sales Invoice Item")
-        from frappe.query_builder.functions import Sum
-
-        # Subquery for sales quantity
-        subquery = (
-            frappe.qb.from_(t_sales_item)
-            .select(
-                t_sales_item.item_code, Sum(t_sales_item.qty).as_("total_qty")
-            )
-            .groupby(t_sales_item.item_code)
-        ).as_("t_sales")
-
-        query = query.left_join(subquery).on(subquery.item_code == t_item.name)
-
-        if order_by == "best_sale":
-            query = query.orderby(
-                subquery.total_qty, order=frappe.qb.desc
-            ).orderby(subquery.total_qty.isnull())
-        elif order_by == "low_sale":
-            query = query.orderby(
-                subquery.total_qty, order=frappe.qb.asc
-            ).orderby(subquery.total_qty.isnull())
-
-    elif order_by == "new":
-        query = query.orderby(t_item.creation, order=frappe.qb.desc)
-    elif order_by == "old":
-        query = query.orderby(t_item.creation, order=frappe.qb.asc)
-    else:
-        # Default order
-        query = query.orderby(t_item.creation, order=frappe.qb.desc)
+        t_sales = frappe.qb.DocType("Product Sales Counter")
+        query = query.left_join(t_sales).on(t_sales.name == t_item.name)
+
+        sort_term = Coalesce(t_sales.total_qty, 0)
+        descending = order_by == "best_sale"
+
+    # name breaks ties so every row has a stable position
+    order = frappe.qb.desc if descending else frappe.qb.asc
+    query = query.orderby(sort_term, order=order).orderby(
+        t_item.name, order=order
+    )
 
     # Pagination
-    query = query.limit(limit_page_length).offset(limit_start)
+    if cursor is not None:
+        from pypika.terms import Tuple
+
+        cursor_key = f"products:{order_by or 'new'}"
+        query = query.select(sort_term.as_("sort_key"))
+        after = decode_cursor(cursor, cursor_key)
+        if after:
+            position = Tuple(sort_term, t_item.name)
+            bound = Tuple(*after)
+            query = query.where(
+                position < bound if descending else position > bound
+            )
+        query = query.limit(limit_page_length)
+    else:
+        query = query.limit(limit_page_length).offset(limit_start)
 
     products = query.run(as_dict=True)
 
+    next_cursor = None
+    if cursor is not None:
+        if len(products) == limit_page_length:
+            last = products[-1]
+            next_cursor = encode_cursor(cursor_key, last.sort_key, last.name)
+        for p in products:
+            p.pop("sort_key", None)
+
     if not products:
-        return []
+        return [] if cursor is None else api_response(data=[])
 
     # --- Eager Loading for Performance ---
     product_names = [p["name"] for p in products]
@@ -217,66 +226,58 @@ def get_products(  # noqa: C901
             # Fallback if something is wrong with Pricing Rule schema
             pass
 
-    # Get review averages and counts
-    # Using frappe.qb for reviews aggregation as well
-    from frappe.query_builder.functions import Avg, Count, Sum  # noqa: F811
-
-    t_review = frappe.qb.DocType("Review")
-    reviews_query = (
-        frappe.qb.from_(t_review)
-        .select(
-            t_review.reviewable_id,
-            Avg(t_review.rating).as_("avg_rating"),
-            Count("*").as_("reviews_count"),
-        )
-        .where(t_review.reviewable_type == "Item")
-        .where(t_review.reviewable_id.isin(product_names))
-        .groupby(t_review.reviewable_id)
-    )
-    reviews_data = reviews_query.run(as_dict=True)
-
-    reviews_map = {r["reviewable_id"]: r for r in reviews_data}
-
     # --- Assemble Final Response ---
     for p in products:
         p["stock_quantity"] = stocks_map.get(p.name, 0)
         p["discount"] = discounts_map.get(p.name)
-        p["reviews"] = reviews_map.get(
-            p.name, {"avg_rating": 0, "reviews_count": 0}
-        )
+        p["reviews"] = {
+            "avg_rating": p.pop("avg_rating"),
+            "reviews_count": p.pop("reviews_count"),
+        }
 
-    return api_response(data=products)
+    return api_response(data=products, next_cursor=next_cursor)
 
 
 @frappe.whitelist(allow_guest=True)
-def most_sold_products(limit_start: int = 0, limit_page_length: int = 20):
+def most_sold_products(
+    limit_start: int = 0, limit_page_length: int = 20, period: str = "total"
+):
     """
-    Retrieves a list of most sold products.
+    Retrieves a list of most sold products, best sellers first.
+    period: "total" (default), "30d" or "7d".
     """
-    from frappe.query_builder.functions import Sum
-
-    t_sales_item = frappe.qb.DocType("Sales Invoice Item")
-    most_sold_items = (
-        frappe.qb.from_(t_sales_item)
-        .select(t_sales_item.item_code, Sum(t_sales_item.qty).as_("total_qty"))
-        .groupby(t_sales_item.item_code)
-        .orderby("total_qty", order=frappe.qb.desc)
-        .limit(limit_page_length)
-        .offset(limit_start)
-    ).run(as_dict=True)
+    sales_field = get_sales_field(period)
+    most_sold_items = frappe.get_all(
+        "Product Sales Counter",
+        filters={sales_field: [">", 0]},
+        fields=["name", sales_field],
+        order_by=f"{sales_field} desc, name asc",
+        offset=limit_start,
+        limit=limit_page_length,
+    )
 
-    item_codes = [d.item_code for d in most_sold_items]
+    item_codes = [d.name for d in most_sold_items]
 
     if not item_codes:
         return api_response(data=[])
 
-    items = frappe.get_list(
-        "Item",
-        fields=["name", "item_name", "description", "image", "standard_rate"],
-        filters={"name": ("in", item_codes)},
-        order_by="name",
+    items = {
+        item.name: item
+        for item in frappe.get_list(
+            "Item",
+            fields=[
+                "name",
+                "item_name",
+                "description",
+                "image",
+                "standard_rate",
+            ],
+            filters={"name": ("in", item_codes)},
+        )
+    }
+    return api_response(
+        data=[items[code] for code in item_codes if code in items]
     )
-    return api_response(data=items)
 
 
 @frappe.whitelist(allow_guest=True)
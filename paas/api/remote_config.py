@@ -1,11 +1,21 @@
+import hashlib
+import json
+
 import frappe
+from paas.api.utils import not_modified
 from paas.utils import get_subscription_details
 
+# Redis hash of merged configs, one field per app_type.
+REMOTE_CONFIG_CACHE_KEY = "paas:remote_config"
+
 
 @frappe.whitelist(allow_guest=True)
 def get_remote_config(app_type="Customer", site_name=None):
     """
     Fetches remote configuration for the Juvo Customer App directly from the tenant site.
+    The merged config is cached per app_type and sent with an ETag; clients
+    that send it back in If-None-Match get a 304 with no body while it is
+    unchanged.
     """
     # 1. Check Subscription Status
     try:
@@ -23,6 +33,48 @@ def get_remote_config(app_type="Customer", site_name=None):
         )
         frappe.throw("Could not verify subscription status.")
 
+    cached = get_cached_remote_config(app_type)
+    if not_modified(cached["etag"]):
+        return None
+
+    return cached["config"]
+
+
+def get_cached_remote_config(app_type):
+    """
+    Returns {"etag", "config"} for an app_type, merging and caching the
+    config on first use. The ETag is a hash of the merged config, so it
+    only changes when the config does.
+    """
+    cached = frappe.cache.hget(REMOTE_CONFIG_CACHE_KEY, app_type)
+    if cached:
+        return cached
+
+    config = build_remote_config(app_type)
+    payload = json.dumps(config, sort_keys=True, default=str)
+    cached = {
+        "etag": hashlib.sha1(payload.encode()).hexdigest(),
+        "config": config,
+    }
+    frappe.cache.hset(REMOTE_CONFIG_CACHE_KEY, app_type, cached)
+    return cached
+
+
+def clear_remote_config_cache():
+    frappe.cache.delete_value(REMOTE_CONFIG_CACHE_KEY)
+
+
+def invalidate_remote_config(doc=None, method=None):
+    """
+    doc_events handler for Remote Config and Settings. Cleared again once
+    the transaction commits so no request caches uncommitted values.
+    """
+    clear_remote_config_cache()
+    frappe.db.after_commit.add(clear_remote_config_cache)
+
+
+def build_remote_config(app_type):
+    """Merges the app_type's Remote Config over the Common one."""
     # 2. Fetch Configuration Sources
     _current_site = frappe.local.site  # noqa: F841
 
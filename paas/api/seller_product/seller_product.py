@@ -1,6 +1,7 @@
 import frappe
 import json
 import uuid
+from paas.settings_cache import get_settings
 from ..utils import _get_seller_shop
 
 
@@ -49,7 +50,7 @@ def create_seller_product(product_data):
     # Check the global PaaS setting for auto-approval
     # Assuming Permission Settings exists, otherwise default to Approved
     try:
-        paas_settings = frappe.get_single("Permission Settings")
+        paas_settings = get_settings("Permission Settings")
         initial_status = (
             "published" if paas_settings.auto_approve_products else "pending"
         )
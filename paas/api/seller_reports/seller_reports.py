@@ -60,24 +60,22 @@ def get_seller_statistics():
     )
     financials = financials_query.run(as_dict=True)[0]
 
-    t_order_item = frappe.qb.DocType("Order Item")
+    # Top sellers from the precomputed sales counters
+    t_sales = frappe.qb.DocType("Product Sales Counter")
     t_item = frappe.qb.DocType("Item")
 
     top_selling_products = (
-        frappe.qb.from_(t_order_item)
-        .join(t_order)
-        .on(t_order.name == t_order_item.parent)
+        frappe.qb.from_(t_sales)
         .join(t_item)
-        .on(t_item.name == t_order_item.product)
+        .on(t_item.name == t_sales.product)
         .select(
-            t_order_item.product,
+            t_sales.product,
             t_item.item_name,
-            frappe.qb.fn.Sum(t_order_item.quantity).as_("total_quantity"),
+            t_sales.total_qty.as_("total_quantity"),
         )
-        .where(t_order.shop == shop)
-        .groupby(t_order_item.product)
-        .groupby(t_item.item_name)
-        .orderby("total_quantity", order=frappe.qb.desc)
+        .where(t_sales.shop == shop)
+        .where(t_sales.total_qty > 0)
+        .orderby(t_sales.total_qty, order=frappe.qb.desc)
         .limit(10)
     ).run(as_dict=True)
 
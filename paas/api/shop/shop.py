@@ -3,8 +3,10 @@
 
 import frappe
 from frappe.model.document import Document
+from frappe.utils import cint, flt
+import pickle
 import uuid
-from paas.api.utils import api_response
+from paas.api.utils import api_response, decode_cursor, encode_cursor
 
 
 @frappe.whitelist()
@@ -45,6 +47,50 @@ def create_shop(shop_data):
         frappe.throw(f"An error occurred while creating the shop: {e}")
 
 
+SHOP_LIST_FIELDS = [
+    "name",
+    "shop_name",
+    "uuid",
+    "slug",
+    "user",
+    "logo",
+    "cover_photo",
+    "phone",
+    "address",
+    "location",
+    "status",
+    "type",
+    "min_amount",
+    "tax",
+    "delivery_time_type",
+    "delivery_time_from",
+    "delivery_time_to",
+    "open",
+    "visibility",
+    "verify",
+    "service_fee",
+    "percentage",
+    "enable_cod",
+    "shop_type",
+    "is_ecommerce",
+]
+
+# Columns get_shops may sort on directly in the database.
+SHOP_SORT_FIELDS = set(SHOP_LIST_FIELDS) | {"creation", "modified"}
+
+# Distance reported for shops without coordinates (sorted last).
+NO_DISTANCE = 99999.0
+
+# Cube KNN distance to the query point; walks the earthdistance GiST index.
+SHOP_KNN_DISTANCE = (
+    "(ll_to_earth(latitude, longitude) <-> ll_to_earth(%(lat)s, %(lng)s))"
+)
+
+# Redis keys (frappe.cache namespaces them per site).
+SHOP_CARD_CACHE_KEY = "paas:shop_cards"
+GLOBAL_COD_CACHE_KEY = "paas:global_cod_enabled"
+
+
 @frappe.whitelist(allow_guest=True)
 def get_shops(
     limit_start: int = 0,
@@ -53,14 +99,17 @@ def get_shops(
     order: str = "desc",
     latitude: float = None,
     longitude: float = None,
+    radius_km: float = None,
+    cursor: str = None,
     **kwargs,
 ):
     """
     Retrieves a list of shops with pagination and filters. Supports geo-sorting.
+    Sorting and pagination happen in the database; when coordinates are given
+    the distance is computed there too using the earthdistance index.
+    Pass cursor (empty for the first page) to page by next_cursor instead of
+    limit_start.
     """
-    from paas.api.utils import haversine
-    import json
-
     filters = {"status": "approved", "visibility": 1, "open": 1}
 
     if kwargs.get("delivery"):
@@ -69,164 +118,121 @@ def get_shops(
     if kwargs.get("takeaway"):
         filters["pickup"] = 1
 
-    # If we are sorting by distance, we might need to fetch more items or all items
-    # and then paginate in Python. For simplicity, we'll fetch all matching and then slice.
-    # For a few hundred shops, this is fine.
-    # Note: Using get_all for potential performance if many shops.
-    shops = frappe.get_all(
-        "Shop",
-        filters=filters,
-        fields=[
-            "name",
-            "shop_name",
-            "uuid",
-            "slug",
-            "user",
-            "logo",
-            "cover_photo",
-            "phone",
-            "address",
-            "location",
-            "status",
-            "type",
-            "min_amount",
-            "tax",
-            "delivery_time_type",
-            "delivery_time_from",
-            "delivery_time_to",
-            "open",
-            "visibility",
-            "verify",
-            "service_fee",
-            "percentage",
-            "enable_cod",
-            "shop_type",
-            "is_ecommerce",
-        ],
-    )
+    limit_start = cint(limit_start)
+    limit_page_length = cint(limit_page_length) or 20
+    direction = "asc" if str(order).lower() == "asc" else "desc"
+    sort_field = order_by if order_by in SHOP_SORT_FIELDS else "name"
 
-    # Calculate distance if coordinates provided
+    lat = lng = None
     if latitude and longitude:
-        for shop in shops:
-            loc = shop.get("location")
-            if isinstance(loc, str) and loc:
-                try:
-                    loc_data = json.loads(loc)
-                    s_lat = loc_data.get("latitude") or loc_data.get("lat")
-                    s_lon = loc_data.get("longitude") or loc_data.get("long")
-                    if s_lat and s_lon:
-                        shop["distance"] = haversine(
-                            float(latitude),
-                            float(longitude),
-                            float(s_lat),
-                            float(s_lon),
-                        )
-                    else:
-                        shop["distance"] = 99999.0
-                except (ValueError, json.JSONDecodeError):
-                    shop["distance"] = 99999.0
-            else:
-                shop["distance"] = 99999.0
-
-    # Sort
-    if order_by == "distance" and latitude and longitude:
-        shops.sort(key=lambda x: x.get("distance", 99999.0))
+        try:
+            lat, lng = float(latitude), float(longitude)
+        except (ValueError, TypeError):
+            lat = lng = None
+
+    next_cursor = None
+    if cursor is not None:
+        rows, next_cursor = _get_shop_page(
+            filters,
+            lat,
+            lng,
+            sort_field=None if order_by == "distance" else sort_field,
+            direction=direction,
+            cursor=cursor,
+            limit_page_length=limit_page_length,
+            radius_km=flt(radius_km) or None,
+        )
+    elif lat is not None:
+        rows = _get_shops_near(
+            filters,
+            lat,
+            lng,
+            sort_field=None if order_by == "distance" else sort_field,
+            direction=direction,
+            limit_start=limit_start,
+            limit_page_length=limit_page_length,
+            radius_km=flt(radius_km) or None,
+        )
     else:
-        # Standard sorting
-        rev = True if order.lower() == "desc" else False
-        shops.sort(
-            key=lambda x: str(x.get(order_by or "name")).lower(), reverse=rev
+        rows = frappe.get_all(
+            "Shop",
+            filters=filters,
+            fields=["name"],
+            order_by=_shop_order_clause(sort_field, direction),
+            limit_start=limit_start,
+            limit_page_length=limit_page_length,
         )
 
-    # Paginate
-    shops_slice = shops[limit_start: limit_start + limit_page_length]
+    cards = get_shop_cards([row.name for row in rows])
 
-    # Global COD Check
+    formatted_shops = []
+    for row in rows:
+        card = cards.get(row.name)
+        if card:
+            card["distance"] = row.get("distance")
+            formatted_shops.append(card)
+
+    return api_response(data=formatted_shops, next_cursor=next_cursor)
+
+
+def _is_global_cod_enabled():
+    """Returns True if the Cash gateway is enabled site-wide (cached)."""
+    return frappe.cache.get_value(
+        GLOBAL_COD_CACHE_KEY, generator=_get_global_cod_enabled
+    )
+
+
+def _get_global_cod_enabled():
     cash_gateway = frappe.db.get_value(
         "PaaS Payment Gateway", {"gateway_controller": "Cash", "enabled": 1}
     )
-    is_global_cod_enabled = bool(cash_gateway)
+    return bool(cash_gateway)
 
-    # Replicating the structure of the legacy ShopResource
-    formatted_shops = []
-    for shop in shops_slice:
-        # Hierarchical COD: Global AND Shop
-        is_cod = is_global_cod_enabled and (
-            shop.enable_cod if shop.get("enable_cod") is not None else 1
-        )
 
-        formatted_shops.append(
-            {
-                "id": shop.name,
-                "uuid": shop.uuid,
-                "slug": shop.slug,
-                "user_id": shop.user,
-                "tax": shop.tax,
-                "service_fee": shop.service_fee,
-                "percentage": shop.percentage,
-                "phone": shop.phone,
-                "open": bool(shop.open),
-                "visibility": bool(shop.visibility),
-                "verify": bool(shop.verify),
-                "logo_img": shop.logo,
-                "background_img": shop.cover_photo,
-                "min_amount": shop.min_amount,
-                "status": shop.status,
-                "enable_cod": bool(is_cod),
-                "type": shop.shop_type or shop.get("type"),
-                "shop_type": shop.shop_type,
-                "is_ecommerce": bool(shop.is_ecommerce),
-                "distance": shop.get("distance"),
-                "delivery_time": {
-                    "type": shop.delivery_time_type,
-                    "from": shop.delivery_time_from,
-                    "to": shop.delivery_time_to,
-                },
-                "location": shop.location,
-                "working_hours": frappe.get_all(
-                    "Shop Booking Working Day",
-                    filters={"parent": shop.name},
-                    fields=["day", "from_time", "to_time"],
-                ),
-                "closed_dates": frappe.get_all(
-                    "Shop Booking Closed Date",
-                    filters={"parent": shop.name},
-                    fields=["date"],
-                ),
-                "translation": {"title": shop.name, "address": shop.address},
-            }
-        )
+def _get_shop_child_rows(doctype, shop_names, fields):
+    """
+    Fetches child rows for many shops in a single IN (...) query.
+    Returns {shop_name: [rows]} with rows in their table order.
+    """
+    grouped = {name: [] for name in shop_names}
+    if not shop_names:
+        return grouped
+
+    rows = frappe.get_all(
+        doctype,
+        filters={"parent": ["in", shop_names], "parenttype": "Shop"},
+        fields=["parent"] + fields,
+        order_by="idx asc",
+    )
+    for row in rows:
+        grouped.setdefault(row.pop("parent"), []).append(row)
 
-    return api_response(data=formatted_shops)
+    return grouped
 
 
-@frappe.whitelist(allow_guest=True)
-def get_shop_details(uuid: str):
+def _build_shop_projections(shops):
     """
-    Retrieves a single shop by its UUID.
+    Builds the cacheable part of the legacy ShopResource for Shop rows.
+    Working hours and closed dates are hydrated with one query per child
+    table. enable_cod holds the shop-level flag only; the global Cash
+    gateway check is applied on read.
     """
-    shop = frappe.get_doc("Shop", {"uuid": uuid})
-
-    if not shop:
-        frappe.throw(
-            f"Shop with UUID {uuid} not found.", frappe.DoesNotExistError
-        )
-
-    # Global COD Check
-    cash_gateway = frappe.db.get_value(
-        "PaaS Payment Gateway", {"gateway_controller": "Cash", "enabled": 1}
+    if not shops:
+        return {}
+
+    shop_names = [shop.name for shop in shops]
+    working_hours = _get_shop_child_rows(
+        "Shop Booking Working Day",
+        shop_names,
+        ["day", "from_time", "to_time", "disabled"],
     )
-    is_global_cod_enabled = bool(cash_gateway)
-
-    # Hierarchical COD: Global AND Shop
-    # Note: shop object from get_doc has attributes directly
-    is_cod = is_global_cod_enabled and (
-        shop.enable_cod if shop.enable_cod is not None else 1
+    closed_dates = _get_shop_child_rows(
+        "Shop Booking Closed Date", shop_names, ["date"]
     )
 
-    # Replicating the structure of the legacy ShopResource
-    return api_response(
-        data={
+    projections = {}
+    for shop in shops:
+        projections[shop.name] = {
             "id": shop.name,
             "uuid": shop.uuid,
             "slug": shop.slug,
@@ -242,9 +248,11 @@ def get_shop_details(uuid: str):
             "background_img": shop.cover_photo,
             "min_amount": shop.min_amount,
             "status": shop.status,
-            "enable_cod": bool(is_cod),
-            "type": shop.shop_type
-            or shop.type,  # Map new shop_type to legacy type field
+            "enable_cod": bool(
+                shop.enable_cod if shop.get("enable_cod") is not None else 1
+            ),
+            # Map new shop_type to legacy type field
+            "type": shop.shop_type or shop.get("type"),
             "shop_type": shop.shop_type,
             "is_ecommerce": bool(shop.is_ecommerce),
             "delivery_time": {
@@ -253,11 +261,310 @@ def get_shop_details(uuid: str):
                 "to": shop.delivery_time_to,
             },
             "location": shop.location,
-            "working_hours": [d.as_dict() for d in shop.booking_working_days],
-            "closed_dates": [d.as_dict() for d in shop.booking_closed_dates],
+            "working_hours": working_hours.get(shop.name, []),
+            "closed_dates": closed_dates.get(shop.name, []),
             "translation": {"title": shop.name, "address": shop.address},
         }
+
+    return projections
+
+
+def _get_cached_projections(shop_names):
+    """Reads many projections from the site's Redis hash in one HMGET."""
+    values = frappe.cache.hmget(
+        frappe.cache.make_key(SHOP_CARD_CACHE_KEY), shop_names
+    )
+    return {
+        name: pickle.loads(value)
+        for name, value in zip(shop_names, values)
+        if value is not None
+    }
+
+
+def _set_cached_projections(projections):
+    """Writes many projections to the site's Redis hash in one HSET."""
+    if not projections:
+        return
+
+    # RedisWrapper.hset takes a single field, so go to the client directly
+    # with the same site key and pickled values the reads expect.
+    pipe = frappe.cache.pipeline()
+    pipe.hset(
+        frappe.cache.make_key(SHOP_CARD_CACHE_KEY),
+        mapping={
+            name: pickle.dumps(projection)
+            for name, projection in projections.items()
+        },
     )
+    pipe.execute()
+
+
+def get_shop_cards(shop_names, with_schedule=True):
+    """
+    Returns {shop_name: ShopResource dict} for the given shops.
+    Projections come from the Redis cache (keys are namespaced per site);
+    misses are built in bulk and written back. Shops that no longer exist
+    are left out.
+    """
+    shop_names = list(dict.fromkeys(name for name in shop_names if name))
+    if not shop_names:
+        return {}
+
+    projections = _get_cached_projections(shop_names)
+
+    missing = [name for name in shop_names if name not in projections]
+    if missing:
+        built = _build_shop_projections(
+            frappe.get_all(
+                "Shop",
+                filters={"name": ["in", missing]},
+                fields=SHOP_LIST_FIELDS,
+            )
+        )
+        _set_cached_projections(built)
+        projections.update(built)
+
+    # Hierarchical COD: Global AND Shop
+    is_global_cod_enabled = _is_global_cod_enabled()
+
+    cards = {}
+    for name in shop_names:
+        projection = projections.get(name)
+        if not projection:
+            continue
+
+        card = dict(projection)
+        card["enable_cod"] = bool(
+            is_global_cod_enabled and projection["enable_cod"]
+        )
+        if not with_schedule:
+            card.pop("working_hours", None)
+            card.pop("closed_dates", None)
+        cards[name] = card
+
+    return cards
+
+
+def clear_shop_card_cache(shop_name=None):
+    """Drops one shop's cached projection, or all of them."""
+    if shop_name:
+        # Raw HDEL on the same key as the reads and writes above
+        key = frappe.cache.make_key(SHOP_CARD_CACHE_KEY)
+        frappe.cache.pipeline().hdel(key, shop_name).execute()
+    else:
+        frappe.cache.delete_value(SHOP_CARD_CACHE_KEY)
+
+
+def invalidate_shop_card(doc, method=None, *args):
+    """
+    doc_events handler for Shop and its schedule child tables.
+    """
+    if method == "after_rename":
+        clear_shop_card_cache()
+        return
+
+    shop_name = doc.parent if doc.get("parenttype") == "Shop" else doc.name
+    if shop_name:
+        clear_shop_card_cache(shop_name)
+
+
+def invalidate_global_cod(doc, method=None):
+    """
+    doc_events handler for PaaS Payment Gateway; the Cash gateway toggles
+    COD for every shop card.
+    """
+    frappe.cache.delete_value(GLOBAL_COD_CACHE_KEY)
+
+
+def _shop_order_clause(sort_field, direction):
+    """Builds a deterministic ORDER BY, using name as the tie-breaker."""
+    if sort_field == "name":
+        return f"name {direction}"
+    return f"{sort_field} {direction}, name {direction}"
+
+
+def _get_shops_near(
+    filters,
+    lat,
+    lng,
+    sort_field=None,
+    direction="asc",
+    limit_start=0,
+    limit_page_length=20,
+    radius_km=None,
+):
+    """
+    Fetches one page of shop names with their distance (km) from the point.
+    If sort_field is None the page is ordered by distance using the cube
+    KNN operator, which walks the earthdistance GiST index instead of
+    sorting every shop. radius_km adds an earth_box prefilter.
+    """
+    if sort_field:
+        order_clause = _shop_order_clause(sort_field, direction)
+    else:
+        # Chord distance is monotonic with great-circle distance, so this
+        # orders exactly like earth_distance. Shops without coordinates
+        # (NULL) sort last.
+        order_clause = f"{SHOP_KNN_DISTANCE} ASC NULLS LAST, name ASC"
+
+    return _query_shops(
+        filters,
+        lat,
+        lng,
+        order_clause,
+        limit_page_length,
+        offset=limit_start,
+        radius_km=radius_km,
+    )
+
+
+def _get_shop_page(
+    filters,
+    lat,
+    lng,
+    sort_field=None,
+    direction="asc",
+    cursor=None,
+    limit_page_length=20,
+    radius_km=None,
+):
+    """
+    Keyset variant of _get_shops_near: returns (rows, next_cursor) for the
+    page after cursor, ordered by (sort key, name). Without coordinates the
+    distance is NULL. NULL sort keys always sort last, so the row
+    comparison plus an IS NULL branch visits every shop exactly once.
+    """
+    if sort_field:
+        sort_key = f'"{sort_field}"'
+        operator = ">" if direction == "asc" else "<"
+    else:
+        sort_key = SHOP_KNN_DISTANCE if lat is not None else "NULL"
+        direction, operator = "asc", ">"
+
+    key = f"shops:{sort_field or 'distance'}:{direction}"
+    after = decode_cursor(cursor, key)
+
+    condition = None
+    values = {}
+    if after:
+        values["after_value"], values["after_name"] = after
+        if values["after_value"] is None:
+            condition = (
+                f"{sort_key} IS NULL AND name {operator} %(after_name)s"
+            )
+        else:
+            condition = (
+                f"(({sort_key}, name) {operator}"
+                " (%(after_value)s, %(after_name)s)"
+                f" OR {sort_key} IS NULL)"
+            )
+
+    rows = _query_shops(
+        filters,
+        lat,
+        lng,
+        f"{sort_key} {direction} NULLS LAST, name {direction}",
+        limit_page_length,
+        radius_km=radius_km,
+        condition=condition,
+        values=values,
+        sort_key=sort_key,
+    )
+
+    next_cursor = None
+    if len(rows) == limit_page_length:
+        last = rows[-1]
+        next_cursor = encode_cursor(key, last.sort_key, last.name)
+
+    return rows, next_cursor
+
+
+def _query_shops(
+    filters,
+    lat,
+    lng,
+    order_clause,
+    limit,
+    offset=0,
+    radius_km=None,
+    condition=None,
+    values=None,
+    sort_key=None,
+):
+    """
+    Runs the shop listing query shared by the offset and keyset pagers.
+    Selects name, the distance (km) from lat/lng (NULL without a point)
+    and, if given, the sort key expression for building cursors.
+    """
+    values = dict(
+        values or {},
+        lat=lat,
+        lng=lng,
+        no_distance=NO_DISTANCE,
+        limit=limit,
+        offset=offset,
+    )
+
+    conditions = []
+    for field, value in filters.items():
+        conditions.append(f'"{field}" = %({field})s')
+        values[field] = value
+
+    if radius_km and lat is not None:
+        values["radius"] = radius_km * 1000  # earth_box works in meters
+        conditions.append(
+            "latitude IS NOT NULL AND longitude IS NOT NULL"
+            " AND earth_box(ll_to_earth(%(lat)s, %(lng)s), %(radius)s)"
+            " @> ll_to_earth(latitude, longitude)"
+            " AND earth_distance(ll_to_earth(%(lat)s, %(lng)s),"
+            " ll_to_earth(latitude, longitude)) < %(radius)s"
+        )
+
+    if condition:
+        conditions.append(condition)
+
+    if lat is None:
+        distance = "NULL"
+    else:
+        distance = """CASE
+                WHEN latitude IS NULL OR longitude IS NULL THEN %(no_distance)s
+                ELSE earth_distance(
+                    ll_to_earth(%(lat)s, %(lng)s), ll_to_earth(latitude, longitude)
+                ) / 1000
+            END"""
+
+    select_sort_key = f", {sort_key} AS sort_key" if sort_key else ""
+    where = " AND ".join(conditions) or "1 = 1"
+
+    return frappe.db.sql(
+        f"""
+        SELECT
+            name,
+            {distance} AS distance{select_sort_key}
+        FROM "tabShop"
+        WHERE {where}
+        ORDER BY {order_clause}
+        LIMIT %(limit)s OFFSET %(offset)s
+        """,
+        values,
+        as_dict=True,
+    )
+
+
+@frappe.whitelist(allow_guest=True)
+def get_shop_details(uuid: str):
+    """
+    Retrieves a single shop by its UUID.
+    """
+    shop_name = frappe.db.get_value("Shop", {"uuid": uuid}, "name")
+
+    if not shop_name:
+        frappe.throw(
+            f"Shop with UUID {uuid} not found.", frappe.DoesNotExistError
+        )
+
+    # Replicating the structure of the legacy ShopResource
+    return api_response(data=get_shop_cards([shop_name]).get(shop_name))
 
 
 @frappe.whitelist(allow_guest=True)
@@ -273,32 +580,7 @@ def search_shops(
     t_shop = frappe.qb.DocType("Shop")
     query = (
         frappe.qb.from_(t_shop)
-        .select(
-            t_shop.name,
-            t_shop.uuid,
-            t_shop.slug,
-            t_shop.user,
-            t_shop.logo,
-            t_shop.cover_photo,
-            t_shop.phone,
-            t_shop.address,
-            t_shop.location,
-            t_shop.status,
-            t_shop.type,
-            t_shop.min_amount,
-            t_shop.tax,
-            t_shop.delivery_time_type,
-            t_shop.delivery_time_from,
-            t_shop.delivery_time_to,
-            t_shop.open,
-            t_shop.visibility,
-            t_shop.verify,
-            t_shop.service_fee,
-            t_shop.percentage,
-            t_shop.enable_cod,
-            t_shop.shop_type,
-            t_shop.is_ecommerce,
-        )
+        .select(t_shop.name)
         .where(t_shop.open == 1)
         .where(t_shop.status == "approved")
         .where(t_shop.visibility == 1)
@@ -324,52 +606,12 @@ def search_shops(
         .run(as_dict=True)
     )
 
-    # Global COD Check
-    cash_gateway = frappe.db.get_value(
-        "PaaS Payment Gateway", {"gateway_controller": "Cash", "enabled": 1}
+    cards = get_shop_cards(
+        [shop.name for shop in shops], with_schedule=False
+    )
+    return api_response(
+        data=[cards[shop.name] for shop in shops if shop.name in cards]
     )
-    is_global_cod_enabled = bool(cash_gateway)
-
-    formatted_shops = []
-    for shop in shops:
-        # Hierarchical COD: Global AND Shop
-        is_cod = is_global_cod_enabled and (
-            shop.enable_cod if shop.enable_cod is not None else 1
-        )
-
-        formatted_shops.append(
-            {
-                "id": shop.name,
-                "uuid": shop.uuid,
-                "slug": shop.slug,
-                "user_id": shop.user,
-                "tax": shop.tax,
-                "service_fee": shop.service_fee,
-                "percentage": shop.percentage,
-                "phone": shop.phone,
-                "open": bool(shop.open),
-                "visibility": bool(shop.visibility),
-                "verify": bool(shop.verify),
-                "logo_img": shop.logo,
-                "background_img": shop.cover_photo,
-                "min_amount": shop.min_amount,
-                "status": shop.status,
-                "enable_cod": bool(is_cod),
-                "type": shop.shop_type
-                or shop.type,  # Map new shop_type to legacy type field
-                "shop_type": shop.shop_type,
-                "is_ecommerce": bool(shop.is_ecommerce),
-                "delivery_time": {
-                    "type": shop.delivery_time_type,
-                    "from": shop.delivery_time_from,
-                    "to": shop.delivery_time_to,
-                },
-                "location": shop.location,
-                "translation": {"title": shop.name, "address": shop.address},
-            }
-        )
-
-    return api_response(data=formatted_shops)
 
 
 @frappe.whitelist(allow_guest=True)
@@ -528,53 +770,11 @@ def get_shops_by_ids(shop_ids: list = None, **kwargs):
     if not ids_to_filter:
         return api_response(data=[])
 
-    shops = frappe.get_list(
-        "Shop",
-        filters={"name": ["in", ids_to_filter]},
-        fields=[
-            "name",
-            "shop_name",
-            "uuid",
-            "slug",
-            "user",
-            "logo",
-            "cover_photo",
-            "phone",
-            "address",
-            "location",
-            "status",
-            "type",
-            "min_amount",
-            "tax",
-            "delivery_time_type",
-            "delivery_time_from",
-            "delivery_time_to",
-            "open",
-            "visibility",
-            "verify",
-            "service_fee",
-            "percentage",
-            "enable_cod",
-            "shop_type",
-            "is_ecommerce",
-        ],
+    shop_names = frappe.get_list(
+        "Shop", filters={"name": ["in", ids_to_filter]}, pluck="name"
     )
 
-    # Simple formatter (reuse get_shops logic ideally, but keep simple here)
-    formatted_shops = []
-    for shop in shops:
-        formatted_shops.append(
-            {
-                "id": shop.name,
-                "uuid": shop.uuid,
-                "slug": shop.slug,
-                "logo_img": shop.logo,
-                "background_img": shop.cover_photo,
-                "translation": {"title": shop.name, "address": shop.address},
-            }
-        )
-
-    return api_response(data=formatted_shops)
+    return api_response(data=list(get_shop_cards(shop_names).values()))
 
 
 @frappe.whitelist()
@@ -1,5 +1,6 @@
 import frappe
 from paas.api.utils import api_response
+from paas.settings_cache import get_settings
 
 
 @frappe.whitelist()
@@ -120,7 +121,7 @@ def get_global_settings():
     settings_data = []
 
     try:
-        settings = frappe.get_single("Settings")
+        settings = get_settings("Settings")
 
         # Map specific fields that the frontend likely needs
         # Based on analysis of Flutter app usage, it generally expects keys like:
@@ -146,7 +147,7 @@ def get_global_settings():
             )
 
         # Add map key if available in Global Settings
-        global_settings = frappe.get_single("Global Settings")
+        global_settings = get_settings("Global Settings")
         if global_settings.google_maps_api_key:
             settings_data.append(
                 {
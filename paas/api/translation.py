@@ -1,8 +1,29 @@
 import frappe
+import hashlib
 import json
+from functools import partial
 from frappe.utils import cint
 from frappe import _
-from paas.api.utils import _require_admin
+from paas.api.utils import _require_admin, not_modified
+from paas.exports import enqueue_export, export_to_file, should_run_in_background
+
+# Redis hashes for compiled bundles, one field per locale. The last few
+# bundle versions are kept to answer delta requests: each map in its own
+# "locale:version" field, with the versions of a locale listed oldest first.
+TRANSLATION_BUNDLE_KEY = "paas:translation_bundle"
+TRANSLATION_HISTORY_KEY = "paas:translation_bundle_history"
+TRANSLATION_VERSIONS_KEY = "paas:translation_bundle_versions"
+TRANSLATION_BUNDLE_HISTORY = 5
+
+# Rows per multi-row INSERT / UPDATE when importing translations.
+IMPORT_BATCH_SIZE = 1000
+
+TRANSLATION_EXPORT_COLUMNS = [
+    ("group", "group"),
+    ("key", "key"),
+    ("locale", "locale"),
+    ("value", "value"),
+]
 
 
 def _api_success(data=None, message=""):
@@ -24,18 +45,136 @@ def _api_error(message="", status_code=500):
 
 
 @frappe.whitelist(allow_guest=True)
-def get_mobile_translations(lang=None):
+def get_mobile_translations(lang=None, version=None):
+    """
+    Returns the translations for a locale from its compiled bundle. The
+    bundle version is sent as the ETag and in the response. Clients that
+    pass the version they hold get a 304 if it is current, or only the
+    keys changed ("data") and removed ("deleted") since then, with delta
+    set; an unknown version gets the full map.
+    """
     target_lang = lang or "en"
+    bundle = get_translation_bundle(target_lang)
+
+    if not_modified(bundle["version"]) or version == bundle["version"]:
+        frappe.local.response["http_status_code"] = 304
+        return None
+
+    previous = None
+    if version:
+        previous = _get_bundle_version(target_lang, version)
+    if previous is None:
+        response = _api_success(
+            bundle["translations"], message="Successfully fetched"
+        )
+        response["delta"] = False
+    else:
+        current = bundle["translations"]
+        response = _api_success(
+            {
+                key: value
+                for key, value in current.items()
+                if previous.get(key) != value
+            },
+            message="Successfully fetched",
+        )
+        response["delta"] = True
+        response["deleted"] = [key for key in previous if key not in current]
+
+    response["version"] = bundle["version"]
+    return response
+
+
+def get_translation_bundle(locale):
+    """
+    Returns {"version", "translations"} for a locale, compiling it from
+    active PaaS Translations if it is not cached. The version is a content
+    hash, so it only changes when the translations do.
+    """
+    bundle = frappe.cache.hget(TRANSLATION_BUNDLE_KEY, locale)
+    if bundle:
+        return bundle
 
     translations = frappe.get_all(
         "PaaS Translation",
-        filters={"locale": target_lang, "status": 1},
+        filters={"locale": locale, "status": 1},
         fields=["key", "value"],
+        order_by="key asc",
     )
-
     result = {t["key"]: t["value"] for t in translations}
+    payload = json.dumps(result, sort_keys=True, separators=(",", ":"))
+    bundle = {
+        "version": hashlib.sha1(payload.encode()).hexdigest()[:16],
+        "translations": result,
+    }
+
+    _add_bundle_version(locale, bundle["version"], result)
+    frappe.cache.hset(TRANSLATION_BUNDLE_KEY, locale, bundle)
+    return bundle
+
+
+def _get_bundle_version(locale, version):
+    """The translation map of a recent bundle version, or None."""
+    return frappe.cache.hget(TRANSLATION_HISTORY_KEY, f"{locale}:{version}")
 
-    return _api_success(result, message="Successfully fetched")
+
+def _add_bundle_version(locale, version, translations):
+    """
+    Keeps a bundle version for delta requests and drops the oldest ones
+    past TRANSLATION_BUNDLE_HISTORY. Only the new map is written; older
+    ones are never loaded.
+    """
+    versions = frappe.cache.hget(TRANSLATION_VERSIONS_KEY, locale) or []
+    if version in versions:
+        return
+
+    frappe.cache.hset(
+        TRANSLATION_HISTORY_KEY, f"{locale}:{version}", translations
+    )
+    versions.append(version)
+    for old in versions[:-TRANSLATION_BUNDLE_HISTORY]:
+        frappe.cache.hdel(TRANSLATION_HISTORY_KEY, f"{locale}:{old}")
+    frappe.cache.hset(
+        TRANSLATION_VERSIONS_KEY,
+        locale,
+        versions[-TRANSLATION_BUNDLE_HISTORY:],
+    )
+
+
+def clear_translation_bundles(locales=None):
+    """
+    Drops the compiled bundles of the given locales, or of all locales.
+    Version history is kept so clients can still get deltas.
+    """
+    if locales:
+        for locale in set(locales):
+            frappe.cache.hdel(TRANSLATION_BUNDLE_KEY, locale)
+    else:
+        frappe.cache.delete_value(TRANSLATION_BUNDLE_KEY)
+
+
+def invalidate_translation_bundle(doc=None, method=None):
+    """
+    doc_events handler for PaaS Translation. Cleared again once the
+    transaction ends so no request caches uncommitted values.
+    """
+    locales = [doc.locale] if doc else None
+    before = doc.get_doc_before_save() if doc else None
+    if before and before.locale != doc.locale:
+        locales.append(before.locale)
+
+    _invalidate_bundles(locales)
+
+
+def _invalidate_bundles(locales=None):
+    """
+    Clears bundles now and again once the transaction ends, so a request
+    that recompiles them in between does not keep uncommitted or stale
+    values cached.
+    """
+    clear_translation_bundles(locales)
+    frappe.db.after_commit.add(partial(clear_translation_bundles, locales))
+    frappe.db.after_rollback.add(partial(clear_translation_bundles, locales))
 
 
 @frappe.whitelist()
@@ -158,6 +297,7 @@ def create_translation():
         return _api_error("Invalid parameters", 400)
 
     frappe.db.delete("PaaS Translation", {"key": key})
+    _invalidate_bundles()
 
     for locale, text in values.items():
         doc = frappe.get_doc(
@@ -197,6 +337,7 @@ def update_translation(key=None):
         return _api_error("Invalid parameters", 400)
 
     frappe.db.delete("PaaS Translation", {"key": target_key})
+    _invalidate_bundles()
 
     for locale, text in values.items():
         doc = frappe.get_doc(
@@ -295,6 +436,7 @@ def drop_all_translations():
 def truncate_translations():
     _require_admin()
     frappe.db.delete("PaaS Translation")
+    _invalidate_bundles()
     return _api_success(message="Successfully truncated")
 
 
@@ -318,94 +460,238 @@ def restore_all_translations():
 
 @frappe.whitelist()
 def import_translations():
+    """
+    Queues an uploaded csv/xls(x) of translations (key, locale, value,
+    group) for import. Progress is published on the
+    translation_import_progress realtime event.
+    """
     _require_admin()
+    from frappe.utils.file_manager import save_file
+
+    file_data = frappe.request.files.get("file")
+    if not file_data:
+        return _api_error("No file uploaded", 400)
+
+    saved = save_file(
+        file_data.filename, file_data.stream.read(), None, None, is_private=1
+    )
+    job = frappe.enqueue(
+        "paas.api.translation.run_translation_import",
+        queue="long",
+        timeout=1800,
+        file_name=saved.name,
+        user=frappe.session.user,
+    )
+
+    return _api_success(
+        {"job_id": job.id if job else None, "file": saved.name},
+        message="Import started",
+    )
+
+
+def _publish_import_progress(user, **message):
+    frappe.publish_realtime(
+        "translation_import_progress", message=message, user=user
+    )
+
+
+def run_translation_import(file_name, user=None):
+    """
+    Background job for import_translations. Upserts every (key, locale)
+    row of the file in batches and clears the affected bundles once.
+    """
     try:
-        import pandas as pd
         import io
 
-        file_data = frappe.request.files.get("file")
-        if not file_data:
-            return _api_error("No file uploaded", 400)
+        import pandas as pd
+
+        file_doc = frappe.get_doc("File", file_name)
+        content = file_doc.get_content()
+        if isinstance(content, str):
+            content = content.encode("utf-8")
 
-        content = file_data.stream.read()
-        if file_data.filename.endswith((".xls", ".xlsx")):
+        if file_doc.file_name.endswith((".xls", ".xlsx")):
             df = pd.read_excel(io.BytesIO(content))
         else:
             df = pd.read_csv(io.BytesIO(content))
 
-        for index, row in df.iterrows():
-            if "key" not in row or "locale" not in row:
-                continue
+        rows = _prepare_import_rows(df)
+        existing = pd.DataFrame(
+            frappe.db.sql(
+                """
+                SELECT name, key, locale, value, "group"
+                FROM "tabPaaS Translation"
+                WHERE locale = ANY(%s)
+                """,
+                (list(rows["locale"].unique()),),
+                as_dict=True,
+            ),
+            columns=["name", "key", "locale", "value", "group"],
+        )
+        inserts, updates = diff_translations(rows, existing)
+
+        total = len(inserts) + len(updates)
+        done = 0
+        _publish_import_progress(user, progress=0, total=total)
+
+        for start in range(0, len(inserts), IMPORT_BATCH_SIZE):
+            batch = inserts.iloc[start:start + IMPORT_BATCH_SIZE]
+            _insert_translations(batch)
+            done += len(batch)
+            _publish_import_progress(user, progress=done, total=total)
+
+        for start in range(0, len(updates), IMPORT_BATCH_SIZE):
+            batch = updates.iloc[start:start + IMPORT_BATCH_SIZE]
+            _update_translations(batch)
+            done += len(batch)
+            _publish_import_progress(user, progress=done, total=total)
+
+        frappe.db.commit()
+        clear_translation_bundles(rows["locale"].unique())
+        file_doc.delete(ignore_permissions=True)
+        frappe.db.commit()
+
+        _publish_import_progress(
+            user,
+            progress=total,
+            total=total,
+            status="Success",
+            inserted=len(inserts),
+            updated=len(updates),
+        )
 
-            existing = frappe.get_all(
-                "PaaS Translation",
-                filters={"key": row["key"], "locale": row["locale"]},
-                pluck="name",
+    except Exception as e:
+        frappe.db.rollback()
+        frappe.log_error(frappe.get_traceback(), "Translation Import Failed")
+        _publish_import_progress(
+            user, status="Failed", message=f"Import failed: {str(e)}"
+        )
+
+
+def _prepare_import_rows(df):
+    """
+    Normalizes an import sheet: requires key and locale, defaults group and
+    value, drops rows missing either key, and keeps the last row of each
+    (key, locale).
+    """
+    if "key" not in df.columns or "locale" not in df.columns:
+        frappe.throw("The file must have key and locale columns.")
+
+    df = df.reindex(columns=["key", "locale", "value", "group"])
+    df = df.dropna(subset=["key", "locale"])
+    df = df.fillna({"value": "", "group": "default"}).astype(str)
+    return df.drop_duplicates(subset=["key", "locale"], keep="last")
+
+
+def diff_translations(rows, existing):
+    """
+    Splits import rows into (inserts, updates) against existing
+    translations. Updates carry the existing name and are only rows whose
+    value or group changed.
+    """
+    merged = rows.merge(
+        existing,
+        on=["key", "locale"],
+        how="left",
+        suffixes=("", "_existing"),
+        indicator=True,
+    )
+    inserts = merged.loc[
+        merged["_merge"] == "left_only", ["key", "locale", "value", "group"]
+    ]
+    matched = merged[merged["_merge"] == "both"]
+    changed = (matched["value"] != matched["value_existing"]) | (
+        matched["group"] != matched["group_existing"]
+    )
+    updates = matched.loc[changed, ["name", "value", "group"]]
+    return inserts, updates
+
+
+def _insert_translations(batch):
+    now = frappe.utils.now()
+    user = frappe.session.user
+    frappe.db.bulk_insert(
+        "PaaS Translation",
+        fields=[
+            "name",
+            "key",
+            "locale",
+            "value",
+            "group",
+            "status",
+            "creation",
+            "modified",
+            "owner",
+            "modified_by",
+        ],
+        values=[
+            (
+                frappe.generate_hash(length=10),
+                row.key,
+                row.locale,
+                row.value,
+                row.group,
+                1,
+                now,
+                now,
+                user,
+                user,
             )
-            if existing:
-                doc = frappe.get_doc("PaaS Translation", existing[0])
-                doc.value = row.get("value", "")
-                doc.group = row.get("group", "default")
-                doc.save(ignore_permissions=True)
-            else:
-                frappe.get_doc(
-                    {
-                        "doctype": "PaaS Translation",
-                        "key": row["key"],
-                        "locale": row["locale"],
-                        "group": row.get("group", "default"),
-                        "value": row.get("value", ""),
-                        "status": 1,
-                    }
-                ).insert(ignore_permissions=True)
-
-        return _api_success(message="Successfully imported")
+            for row in batch.itertuples(index=False)
+        ],
+    )
 
-    except Exception as e:
-        return _api_error(f"Import failed: {str(e)}")
+
+def _update_translations(batch):
+    values = []
+    for row in batch.itertuples(index=False):
+        values.extend((row.name, row.value, row.group))
+
+    frappe.db.sql(
+        f"""
+        UPDATE "tabPaaS Translation" AS translation
+        SET value = line.value, "group" = line.grp, modified = %s
+        FROM (VALUES {", ".join(["(%s, %s, %s)"] * len(batch))})
+            AS line(name, value, grp)
+        WHERE translation.name = line.name
+        """,
+        [frappe.utils.now(), *values],
+    )
 
 
 @frappe.whitelist()
 def export_translations():
+    """
+    Exports all translations to xlsx (csv if xlsxwriter is unavailable).
+    Large exports run in the background and the file is announced on the
+    export_ready realtime event.
+    """
     _require_admin()
     try:
-        import pandas as pd
-        from frappe.utils.file_manager import save_file
-        import io
+        if should_run_in_background("PaaS Translation"):
+            job = enqueue_export(
+                "PaaS Translation",
+                TRANSLATION_EXPORT_COLUMNS,
+                "translations_export",
+                file_format="xlsx",
+            )
+            return _api_success(
+                {"job_id": job.id if job else None}, "Export started"
+            )
 
-        data = frappe.get_all(
-            "PaaS Translation", fields=["group", "key", "locale", "value"]
+        saved = export_to_file(
+            "PaaS Translation",
+            TRANSLATION_EXPORT_COLUMNS,
+            "translations_export",
+            file_format="xlsx",
         )
-        df = pd.DataFrame(data)
-
-        output = io.BytesIO()
-        writer = pd.ExcelWriter(output, engine="xlsxwriter")
-        df.to_excel(writer, index=False, sheet_name="Translations")
-        writer.close()
-        output.seek(0)
-
-        fname = "translations_export.xlsx"
-        saved = save_file(fname, output.getvalue(), is_private=0)
-
         return _api_success(
-            {"path": saved.file_url, "file_name": fname},
+            {"path": saved.file_url, "file_name": saved.file_name},
             "Successfully exported",
         )
 
     except Exception as e:
-        try:
-            output = io.StringIO()
-            df.to_csv(output, index=False)
-            fname = "translations_export.csv"
-            saved = save_file(
-                fname, output.getvalue().encode("utf-8"), is_private=0
-            )
-            return _api_success(
-                {"path": saved.file_url, "file_name": fname},
-                "Successfully exported (CSV)",
-            )
-        except Exception as e2:
-            return _api_error(f"Export failed: {str(e2)}")
+        return _api_error(f"Export failed: {str(e)}")
 
 
 @frappe.whitelist()
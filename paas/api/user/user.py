@@ -5,7 +5,20 @@ import uuid
 import csv
 import io
 from paas.utils import check_subscription_feature
-from paas.api.utils import api_response
+from paas.api.utils import api_response, get_page, list_page
+from paas.exports import (
+    enqueue_export,
+    iter_export_rows,
+    should_run_in_background,
+)
+
+ORDER_EXPORT_COLUMNS = [
+    ("Order ID", "name"),
+    ("Shop", "shop"),
+    ("Total Price", "total_price"),
+    ("Status", "status"),
+    ("Date", "creation"),
+]
 
 
 @frappe.whitelist()
@@ -1092,9 +1105,11 @@ def get_user_wallet():
 
 
 @frappe.whitelist()
-def get_wallet_history(start=0, limit=20):
+def get_wallet_history(start=0, limit=20, cursor=None):
     """
     Retrieves the wallet history for the currently logged-in user.
+    Pass cursor (empty for the first page) to page by next_cursor instead
+    of start.
     """
     user = frappe.session.user
     if user == "Guest":
@@ -1104,21 +1119,25 @@ def get_wallet_history(start=0, limit=20):
         )
 
     wallet = frappe.get_doc("Wallet", {"user": user})
-    history = frappe.get_all(
+    history, next_cursor = get_page(
         "Wallet History",
         filters={"wallet": wallet.name},
         fields=["name", "transaction_type", "amount", "status", "creation"],
         order_by="creation desc",
-        offset=start,
-        limit=limit,
+        cursor=cursor,
+        limit_start=start,
+        limit_page_length=limit,
+        getter=frappe.get_all,
     )
-    return api_response(data=history)
+    return api_response(data=history, next_cursor=next_cursor)
 
 
 @frappe.whitelist()
 def export_orders():
     """
     Exports all orders for the current user to a CSV file.
+    Large exports run in the background and the file is announced on the
+    export_ready realtime event.
     """
     user = frappe.session.user
     if user == "Guest":
@@ -1127,33 +1146,28 @@ def export_orders():
             frappe.AuthenticationError,
         )
 
-    orders = frappe.get_all(
-        "Order",
-        filters={"user": user},
-        fields=["name", "shop", "total_price", "status", "creation"],
-        order_by="creation desc",
-    )
-
-    if not orders:
+    filters = {"user": user}
+    if not frappe.db.exists("Order", filters):
         return []
 
-    # Create a CSV in memory
+    if should_run_in_background("Order", filters):
+        job = enqueue_export("Order", ORDER_EXPORT_COLUMNS, "orders", filters)
+        return api_response(
+            data={"job_id": job.id if job else None},
+            message="Export started. You will be notified when it is ready.",
+        )
+
+    # Stream rows into the CSV rather than loading them all first
     output = io.StringIO()
     writer = csv.writer(output)
-
-    # Write the header row
-    writer.writerow(["Order ID", "Shop", "Total Price", "Status", "Date"])
-
-    # Write the data rows
-    for order in orders:
+    writer.writerow([label for label, _field in ORDER_EXPORT_COLUMNS])
+    for order in iter_export_rows(
+        "Order",
+        [field for _label, field in ORDER_EXPORT_COLUMNS],
+        filters=filters,
+    ):
         writer.writerow(
-            [
-                order.name,
-                order.shop,
-                order.total_price,
-                order.status,
-                order.creation,
-            ]
+            [order.get(field) for _label, field in ORDER_EXPORT_COLUMNS]
         )
 
     # Set the response headers for CSV download
@@ -1587,9 +1601,11 @@ def create_order_refund(order, cause):
 
 
 @frappe.whitelist()
-def get_user_notifications(start=0, limit=20):
+def get_user_notifications(start=0, limit=20, cursor=None):
     """
     Retrieves the list of notifications for the currently logged-in user.
+    Pass cursor (empty for the first page) to page by next_cursor instead
+    of start.
     """
     user = frappe.session.user
     if user == "Guest":
@@ -1603,7 +1619,7 @@ def get_user_notifications(start=0, limit=20):
     # A simple way to get user-specific notifications is to look at the
     # Notification Log, which records when a notification is sent to a user.
 
-    return frappe.get_all(
+    return list_page(
         "Notification Log",
         filters={"user": user},
         fields=[
@@ -1615,8 +1631,10 @@ def get_user_notifications(start=0, limit=20):
             "read",
         ],
         order_by="creation desc",
-        offset=start,
-        limit=limit,
+        cursor=cursor,
+        limit_start=start,
+        limit_page_length=limit,
+        getter=frappe.get_all,
     )
 
 
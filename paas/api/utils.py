@@ -1,6 +1,17 @@
+import base64
 import frappe
-import math
 import json
+from frappe.model import numeric_fieldtypes
+from frappe.utils import cint
+from paas.geometry import haversine_km
+
+# Cursor pages are keyed on the listing's sort column, with name as the
+# tie-breaker. Listings without an order_by page on creation, newest first.
+DEFAULT_CURSOR_SORT = ("creation", "desc")
+
+# Sort columns that can never be NULL. A NULL would drop the row out of the
+# keyset comparison, so other columns must be mandatory or numeric.
+NOT_NULL_SORT_FIELDS = ("name", "creation", "modified")
 
 
 def _require_admin():
@@ -28,7 +39,7 @@ def _get_seller_shop(user_id):
     return shop
 
 
-def api_response(data=None, message=None, status_code=200):
+def api_response(data=None, message=None, status_code=200, next_cursor=None):
     """
     Standard API response wrapper.
     """
@@ -39,19 +50,237 @@ def api_response(data=None, message=None, status_code=200):
         response["message"] = message
     if status_code:
         response["status_code"] = status_code
+    if next_cursor:
+        response["next_cursor"] = next_cursor
 
     return response
 
 
+def not_modified(etag):
+    """
+    Sends etag as the response ETag. Returns True, with the status set to
+    304, if the client's If-None-Match already has it; the caller should
+    then return no body.
+    """
+    etag = f'"{etag}"'
+    headers = getattr(frappe.local, "response_headers", None)
+    if headers is not None:
+        headers["ETag"] = etag
+
+    header = frappe.get_request_header("If-None-Match") or ""
+    client_tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    if etag not in client_tags:
+        return False
+
+    frappe.local.response["http_status_code"] = 304
+    return True
+
+
+def encode_cursor(key, value, name):
+    """
+    Builds an opaque pagination cursor from the last row's sort value and
+    name. key identifies the listing and sort so a cursor cannot be replayed
+    against a different ordering.
+    """
+    payload = json.dumps([key, value, name], default=str, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor, key):
+    """
+    Returns (value, name) from a cursor built by encode_cursor, or None for
+    an empty cursor (first page). Throws a ValidationError if the cursor is
+    malformed or belongs to another listing.
+    """
+    if not cursor:
+        return None
+
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_key, value, name = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError):
+        cursor_key = None
+
+    if cursor_key != key:
+        frappe.throw("Invalid or expired cursor.", frappe.ValidationError)
+
+    return value, name
+
+
+def _filters_as_list(filters):
+    """Normalizes get_list filters to a list so conditions can be appended."""
+    if not filters:
+        return []
+    if isinstance(filters, dict):
+        return [
+            [field, value[0], value[1]]
+            if isinstance(value, (list, tuple))
+            else [field, "=", value]
+            for field, value in filters.items()
+        ]
+    return list(filters)
+
+
+def _cursor_sort(doctype, order_by):
+    """
+    Returns (field, direction) to key cursor pages on for order_by, which
+    must be a single "field [asc|desc]" term on a column that is never
+    NULL. Throws a ValidationError for sorts a cursor cannot follow.
+    """
+    if not order_by:
+        return DEFAULT_CURSOR_SORT
+
+    parts = order_by.replace(",", " , ").split()
+    field = parts[0]
+    direction = parts[1].lower() if len(parts) > 1 else "asc"
+    supported = len(parts) <= 2 and direction in ("asc", "desc")
+    if supported and field not in NOT_NULL_SORT_FIELDS:
+        df = frappe.get_meta(doctype).get_field(field)
+        supported = bool(
+            df and (df.reqd or df.fieldtype in numeric_fieldtypes)
+        )
+
+    if not supported:
+        frappe.throw(
+            f"Cursor pagination is not supported when sorting by {order_by}.",
+            frappe.ValidationError,
+        )
+    return field, direction
+
+
+def get_page(
+    doctype,
+    cursor=None,
+    limit_start=0,
+    limit_page_length=20,
+    order_by=None,
+    filters=None,
+    fields=None,
+    getter=None,
+    **kwargs,
+):
+    """
+    Fetches one page of a listing and returns (rows, next_cursor).
+
+    Without a cursor this is a plain offset query (the legacy limit_start
+    behaviour) and next_cursor is None. Passing a cursor (an empty string
+    for the first page) switches to keyset pagination on (sort column,
+    name), so deep pages cost the same as the first one and keep order_by.
+    next_cursor is None once the last page has been reached.
+    """
+    getter = getter or frappe.get_list
+
+    if cursor is None:
+        if order_by:
+            kwargs["order_by"] = order_by
+        rows = getter(
+            doctype,
+            filters=filters,
+            fields=fields,
+            offset=cint(limit_start),
+            limit=limit_page_length,
+            **kwargs,
+        )
+        return rows, None
+
+    limit_page_length = cint(limit_page_length) or 20
+    sort_field, direction = _cursor_sort(doctype, order_by)
+    operator = ">" if direction == "asc" else "<"
+    key = f"{doctype}:{sort_field}:{direction}"
+
+    filters = _filters_as_list(filters)
+    or_filters = None
+    after = decode_cursor(cursor, key)
+    if after:
+        value, name = after
+        # (sort column, name) past the cursor: the AND bound keeps the index
+        # range tight, the OR pair breaks ties on identical values.
+        filters.append([sort_field, f"{operator}=", value])
+        or_filters = [
+            [sort_field, operator, value],
+            ["name", operator, name],
+        ]
+
+    fields = list(fields or ["name"])
+    for fieldname in (sort_field, "name"):
+        if fieldname not in fields:
+            fields.append(fieldname)
+
+    order = f"{sort_field} {direction}"
+    if sort_field != "name":
+        order += f", name {direction}"
+    rows = getter(
+        doctype,
+        filters=filters,
+        or_filters=or_filters,
+        fields=fields,
+        order_by=order,
+        limit=limit_page_length,
+        **kwargs,
+    )
+
+    next_cursor = None
+    if len(rows) == limit_page_length:
+        last = rows[-1]
+        next_cursor = encode_cursor(key, last[sort_field], last["name"])
+
+    return rows, next_cursor
+
+
+def list_page(doctype, cursor=None, **kwargs):
+    """
+    get_page for endpoints that return a bare list. Legacy offset calls get
+    the list as before; cursor calls get an api_response with next_cursor.
+    """
+    rows, next_cursor = get_page(doctype, cursor=cursor, **kwargs)
+    if cursor is None:
+        return rows
+    return api_response(data=rows, next_cursor=next_cursor)
+
+
 def haversine(lat1, lon1, lat2, lon2):
     """
     Calculates the great-circle distance between two points on Earth (in km).
+    For many points at once use paas.geometry.haversine_km directly.
+    """
+    return float(haversine_km(lat1, lon1, lat2, lon2))
+
+
+def parse_coordinates(location):
+    """
+    Extracts (latitude, longitude) from a stored location value.
+    Accepts GeoJSON (FeatureCollection or Point, coordinates as [lng, lat])
+    and the legacy {"latitude": .., "longitude": ..} / {"lat": .., "long": ..}
+    shapes. Returns (None, None) if no usable coordinates are found.
     """
-    R = 6371  # Earth radius in kilometers
-    dLat = math.radians(lat2 - lat1)
-    dLon = math.radians(lon2 - lon1)
-    a = math.sin(dLat / 2) * math.sin(dLat / 2) + math.cos(
-        math.radians(lat1)
-    ) * math.cos(math.radians(lat2)) * math.sin(dLon / 2) * math.sin(dLon / 2)
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-    return R * c
+    if not location:
+        return None, None
+
+    try:
+        data = json.loads(location) if isinstance(location, str) else location
+    except (ValueError, TypeError):
+        return None, None
+
+    if not isinstance(data, dict):
+        return None, None
+
+    try:
+        if data.get("type") == "FeatureCollection":
+            features = data.get("features") or [{}]
+            data = features[0].get("geometry") or {}
+        elif data.get("type") == "Feature":
+            data = data.get("geometry") or {}
+
+        if data.get("type") == "Point" and data.get("coordinates"):
+            lng, lat = data["coordinates"][0], data["coordinates"][1]
+        else:
+            lat = data.get("latitude") or data.get("lat")
+            lng = (
+                data.get("longitude") or data.get("long") or data.get("lng")
+            )
+
+        if lat in (None, "") or lng in (None, ""):
+            return None, None
+        return float(lat), float(lng)
+    except (ValueError, TypeError, IndexError, AttributeError):
+        return None, None
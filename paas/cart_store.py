@@ -0,0 +1,266 @@
+# Copyright (c) 2025 ROKCT INTELLIGENCE (PTY) LTD
+# For license information, please see license.txt
+
+"""
+Hot cart store.
+
+With `hot_carts` enabled in site config, active carts live in Redis and
+only reach the Cart / Cart Detail tables through write-behind: on checkout,
+from the scheduler for carts changed since the last flush, and when an idle
+cart is evicted. Each owner has one hash with a field per shop holding the
+compact cart payload, plus an index hash from cart name to (owner, shop) so
+cart_id lookups (get_calculate, create_order) resolve to the same copy.
+
+Cart and line names are generated up front and kept on persist, so ids
+handed to clients stay valid across flushes and evictions.
+"""
+
+import time
+from functools import partial
+
+import frappe
+from frappe.utils import cint
+
+CART_KEY = "hot_cart"
+CART_INDEX_KEY = "hot_cart_index"
+DIRTY_CARTS_KEY = "hot_cart_dirty"
+
+# Carts untouched for this long are persisted and dropped from Redis.
+IDLE_SECONDS = 2 * 60 * 60
+
+CART_FIELDS = ("name", "owner", "shop", "status", "total_price")
+LINE_FIELDS = (
+    "name",
+    "item",
+    "quantity",
+    "price",
+    "stock_id",
+    "addons",
+    "bonus",
+    "alternative_product",
+)
+
+
+def is_enabled():
+    return bool(cint(frappe.conf.get("hot_carts")))
+
+
+def _owner_key(owner):
+    return f"{CART_KEY}:{owner}"
+
+
+def _pack(cart):
+    data = {field: cart.get(field) for field in CART_FIELDS}
+    data["items"] = [
+        [line.get(field) for field in LINE_FIELDS] for line in cart.items
+    ]
+    data["touched"] = time.time()
+    return data
+
+
+def _unpack(data):
+    cart = frappe.get_doc(
+        {
+            "doctype": "Cart",
+            **{field: data.get(field) for field in CART_FIELDS},
+            "items": [dict(zip(LINE_FIELDS, line)) for line in data["items"]],
+        }
+    )
+    cart.flags.hot_cart = True
+    return cart
+
+
+def _load_from_db(owner, shop):
+    """Seeds the store with the active cart from the database, if any."""
+    cart_name = frappe.db.get_value(
+        "Cart", {"owner": owner, "shop": shop, "status": "Active"}, "name"
+    )
+    if not cart_name:
+        return None
+
+    cart = frappe.get_doc("Cart", cart_name)
+    _write(cart, dirty=False)
+    cart.flags.hot_cart = True
+    return cart
+
+
+def _write(cart, dirty=True):
+    frappe.cache.hset(_owner_key(cart.owner), cart.shop, _pack(cart))
+    frappe.cache.hset(CART_INDEX_KEY, cart.name, (cart.owner, cart.shop))
+    if dirty:
+        frappe.cache.sadd(DIRTY_CARTS_KEY, cart.name)
+
+
+def get_active_cart(owner, shop):
+    """
+    Returns the owner's active cart for the shop, or None. The cart comes
+    from Redis in hot mode (loading it from the database on a miss).
+    """
+    if not is_enabled():
+        cart_name = frappe.db.get_value(
+            "Cart", {"owner": owner, "shop": shop, "status": "Active"}, "name"
+        )
+        return frappe.get_doc("Cart", cart_name) if cart_name else None
+
+    data = frappe.cache.hget(_owner_key(owner), shop)
+    if data:
+        return _unpack(data)
+    return _load_from_db(owner, shop)
+
+
+def new_cart(owner, shop):
+    cart = frappe.get_doc(
+        {
+            "doctype": "Cart",
+            "owner": owner,
+            "shop": shop,
+            "status": "Active",
+        }
+    )
+    if is_enabled():
+        cart.name = frappe.generate_hash(length=10)
+        cart.flags.hot_cart = True
+    return cart
+
+
+def get_cart(cart_name):
+    """Returns a cart by name, preferring the hot copy if there is one."""
+    if is_enabled():
+        location = frappe.cache.hget(CART_INDEX_KEY, cart_name)
+        if location:
+            data = frappe.cache.hget(_owner_key(location[0]), location[1])
+            if data and data.get("name") == cart_name:
+                return _unpack(data)
+    return frappe.get_doc("Cart", cart_name)
+
+
+def find_line_cart(owner, line_name):
+    """Returns the owner's cart containing the given line, or None."""
+    if is_enabled():
+        for data in frappe.cache.hgetall(_owner_key(owner)).values():
+            if any(line[0] == line_name for line in data["items"]):
+                return _unpack(data)
+
+    cart_name = frappe.db.get_value("Cart Detail", line_name, "parent")
+    return frappe.get_doc("Cart", cart_name) if cart_name else None
+
+
+def save_cart(cart):
+    """
+    Saves a cart: in hot mode to Redis (persisted later), otherwise
+    straight to the database.
+    """
+    if not cart.flags.hot_cart:
+        if cart.name:
+            cart.save(ignore_permissions=True)
+        else:
+            cart.insert(ignore_permissions=True)
+        return cart
+
+    for line in cart.items:
+        if not line.name:
+            line.name = frappe.generate_hash(length=10)
+    _write(cart)
+    return cart
+
+
+def persist_cart(cart_name, evict=False):
+    """
+    Writes the hot copy of a cart to Cart / Cart Detail and returns the
+    database document. The cart stays dirty until the transaction commits,
+    so a rollback leaves it to the next flush. With evict, the hot copy is
+    dropped on commit too.
+    """
+    location = frappe.cache.hget(CART_INDEX_KEY, cart_name)
+    data = location and frappe.cache.hget(_owner_key(location[0]), location[1])
+    if not data or data.get("name") != cart_name:
+        frappe.cache.srem(DIRTY_CARTS_KEY, cart_name)
+        frappe.cache.hdel(CART_INDEX_KEY, cart_name)
+        return frappe.get_doc("Cart", cart_name)
+
+    hot = _unpack(data)
+
+    if frappe.db.exists("Cart", cart_name):
+        cart = frappe.get_doc("Cart", cart_name)
+        existing = {line.name for line in cart.items}
+        cart.status = hot.status
+        cart.total_price = hot.total_price
+        cart.set("items", [])
+        for line in hot.items:
+            row = cart.append(
+                "items", {field: line.get(field) for field in LINE_FIELDS}
+            )
+            if row.name not in existing:
+                row.set("__islocal", 1)
+        cart.save(ignore_permissions=True)
+    else:
+        cart = hot
+        cart.flags.hot_cart = False
+        cart.insert(
+            ignore_permissions=True, set_name=cart_name, set_child_names=False
+        )
+
+    frappe.db.after_commit.add(
+        partial(_mark_persisted, cart_name, data.get("touched", 0), evict)
+    )
+    return cart
+
+
+def _mark_persisted(cart_name, touched, evict):
+    """
+    after_commit callback for persist_cart. Clears the dirty mark, or with
+    evict drops the hot copy, unless the cart changed after the persisted
+    copy was read; that change is left to the next flush.
+    """
+    location = frappe.cache.hget(CART_INDEX_KEY, cart_name)
+    data = location and frappe.cache.hget(_owner_key(location[0]), location[1])
+    if data and data.get("name") == cart_name:
+        if data.get("touched", 0) > touched:
+            return
+
+    if evict:
+        discard_cart(cart_name)
+    else:
+        frappe.cache.srem(DIRTY_CARTS_KEY, cart_name)
+
+
+def discard_cart(cart_name):
+    """Drops the hot copy of a cart without persisting it."""
+    location = frappe.cache.hget(CART_INDEX_KEY, cart_name)
+    if location:
+        data = frappe.cache.hget(_owner_key(location[0]), location[1])
+        if data and data.get("name") == cart_name:
+            frappe.cache.hdel(_owner_key(location[0]), location[1])
+    frappe.cache.hdel(CART_INDEX_KEY, cart_name)
+    frappe.cache.srem(DIRTY_CARTS_KEY, cart_name)
+
+
+def flush_carts():
+    """
+    Persists every cart changed since the last flush and evicts carts idle
+    for longer than IDLE_SECONDS.
+    """
+    dirty = {
+        frappe.safe_decode(name)
+        for name in frappe.cache.smembers(DIRTY_CARTS_KEY)
+    }
+    cutoff = time.time() - IDLE_SECONDS
+
+    for cart_name, location in frappe.cache.hgetall(CART_INDEX_KEY).items():
+        cart_name = frappe.safe_decode(cart_name)
+        data = frappe.cache.hget(_owner_key(location[0]), location[1])
+        idle = not data or data.get("touched", 0) < cutoff
+        if cart_name not in dirty and not idle:
+            continue
+
+        try:
+            if cart_name in dirty:
+                persist_cart(cart_name, evict=idle)
+            else:
+                discard_cart(cart_name)
+            frappe.db.commit()
+        except Exception:
+            frappe.db.rollback()
+            frappe.log_error(
+                frappe.get_traceback(), f"Failed to persist hot cart {cart_name}"
+            )
@@ -0,0 +1,174 @@
+# Copyright (c) 2025 ROKCT INTELLIGENCE (PTY) LTD
+# For license information, please see license.txt
+
+"""
+Streaming exports.
+
+Rows are read a page at a time with keyset pagination (get_page) and
+written straight to a file under the site's private files, as CSV or as a
+constant-memory xlsx, so memory stays flat however many rows there are.
+The file is then registered as a File doc. Exports larger than
+EXPORT_INLINE_LIMIT run as background jobs and announce the File on the
+export_ready realtime event.
+"""
+
+import csv
+import hashlib
+import os
+
+import frappe
+from paas.api.utils import get_page
+
+EXPORT_PAGE_LENGTH = 2000
+
+# Exports with more rows than this are moved to a background job.
+EXPORT_INLINE_LIMIT = 5000
+
+
+def iter_export_rows(doctype, fields, filters=None):
+    """Yields every matching row, one keyset page in memory at a time."""
+    cursor = ""
+    while cursor is not None:
+        rows, cursor = get_page(
+            doctype,
+            cursor=cursor,
+            limit_page_length=EXPORT_PAGE_LENGTH,
+            filters=filters,
+            fields=fields,
+            getter=frappe.get_all,
+        )
+        yield from rows
+
+
+def _write_csv(path, columns, rows):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow([label for label, _field in columns])
+        for row in rows:
+            writer.writerow([row.get(field) for _label, field in columns])
+
+
+def _cell(value):
+    """Numbers and text are written as-is, anything else as text."""
+    if value is None or isinstance(value, (int, float, str)):
+        return value
+    return str(value)
+
+
+def _write_xlsx(path, columns, rows, sheet_name="Export"):
+    import xlsxwriter
+
+    # constant_memory flushes each row to disk once the next one starts
+    workbook = xlsxwriter.Workbook(path, {"constant_memory": True})
+    sheet = workbook.add_worksheet(sheet_name)
+    sheet.write_row(0, 0, [label for label, _field in columns])
+    for index, row in enumerate(rows, start=1):
+        sheet.write_row(
+            index, 0, [_cell(row.get(field)) for _label, field in columns]
+        )
+    workbook.close()
+
+
+def export_to_file(
+    doctype, columns, file_name, filters=None, file_format="csv"
+):
+    """
+    Streams an export to a private file and returns its File doc.
+    columns is a list of (header, fieldname). xlsx falls back to csv if
+    xlsxwriter is not installed.
+    """
+    if file_format == "xlsx":
+        try:
+            import xlsxwriter  # noqa: F401
+        except ImportError:
+            file_format = "csv"
+
+    file_name = f"{file_name}-{frappe.generate_hash(length=8)}.{file_format}"
+    path = frappe.get_site_path("private", "files", file_name)
+    partial_path = f"{path}.part"
+
+    rows = iter_export_rows(
+        doctype, [field for _label, field in columns], filters=filters
+    )
+    try:
+        if file_format == "xlsx":
+            _write_xlsx(partial_path, columns, rows, sheet_name=doctype[:31])
+        else:
+            _write_csv(partial_path, columns, rows)
+        os.replace(partial_path, path)
+    finally:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+
+    return frappe.get_doc(
+        {
+            "doctype": "File",
+            "file_name": file_name,
+            "file_url": f"/private/files/{file_name}",
+            "is_private": 1,
+            # Set here so File does not read the whole file to hash it
+            "content_hash": _file_md5(path),
+        }
+    ).insert(ignore_permissions=True)
+
+
+def _file_md5(path, chunk_size=1024 * 1024):
+    digest = hashlib.md5()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def should_run_in_background(doctype, filters=None):
+    return frappe.db.count(doctype, filters) > EXPORT_INLINE_LIMIT
+
+
+def enqueue_export(
+    doctype, columns, file_name, filters=None, file_format="csv"
+):
+    """Queues export_to_file; the File is announced on export_ready."""
+    return frappe.enqueue(
+        "paas.exports.run_export",
+        queue="long",
+        timeout=3600,
+        doctype=doctype,
+        columns=columns,
+        file_name=file_name,
+        filters=filters,
+        file_format=file_format,
+        user=frappe.session.user,
+    )
+
+
+def run_export(
+    doctype, columns, file_name, filters=None, file_format="csv", user=None
+):
+    """Background job for enqueue_export."""
+    try:
+        file_doc = export_to_file(
+            doctype,
+            columns,
+            file_name,
+            filters=filters,
+            file_format=file_format,
+        )
+        frappe.db.commit()
+        frappe.publish_realtime(
+            "export_ready",
+            message={
+                "status": "Success",
+                "doctype": doctype,
+                "file_name": file_doc.file_name,
+                "file_url": file_doc.file_url,
+            },
+            user=user,
+        )
+    except Exception:
+        frappe.db.rollback()
+        frappe.log_error(frappe.get_traceback(), f"{doctype} Export Failed")
+        frappe.publish_realtime(
+            "export_ready",
+            message={"status": "Failed", "doctype": doctype},
+            user=user,
+        )
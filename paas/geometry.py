@@ -0,0 +1,266 @@
+# Copyright (c) 2025 ROKCT INTELLIGENCE (PTY) LTD
+# For license information, please see license.txt
+
+"""
+Shared geometry helpers for delivery zones and distance pricing.
+
+Polygons are normalized to NumPy arrays of (lng, lat) vertices, and the
+ray-casting test is vectorized over points and edges, so one call can
+check many points against one zone or one point against many zones.
+Distances and distance-based fees are likewise computed for whole arrays
+of origins and destinations in one pass.
+"""
+
+import json
+
+import numpy as np
+
+# Points are processed in chunks to bound the (points x edges) matrix.
+CHUNK_SIZE = 4096
+
+EARTH_RADIUS_KM = 6371
+
+
+def _as_floats(values):
+    """Converts scalars or sequences to a float array, treating None as 0."""
+    return np.nan_to_num(np.asarray(values, dtype=float))
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    """
+    Great-circle distances in km. Arguments may be scalars or arrays and
+    broadcast against each other, e.g. one origin against many destinations.
+    """
+    lat1, lng1, lat2, lng2 = (
+        np.radians(_as_floats(value)) for value in (lat1, lng1, lat2, lng2)
+    )
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+def distance_fees(distances_km, base=0, per_km=0, minimum=None):
+    """
+    Linear distance pricing, base + km * per_km, optionally floored at
+    minimum. All arguments broadcast, so one distance can be priced against
+    many rate cards or many distances against one.
+    """
+    fees = _as_floats(base) + _as_floats(distances_km) * _as_floats(per_km)
+    if minimum is not None:
+        fees = np.maximum(fees, _as_floats(minimum))
+    return fees
+
+
+def to_vertices(polygon, lat_first=False):
+    """
+    Normalizes a polygon into an (N, 2) float array of (lng, lat) vertices.
+    Accepts a JSON string or a list of vertices, where each vertex is a dict
+    ({"lat", "lng"} or {"latitude", "longitude"}) or a pair. Pairs follow
+    GeoJSON [lng, lat] order unless lat_first is set.
+    Returns an empty array if the polygon cannot be parsed.
+    """
+    if isinstance(polygon, np.ndarray):
+        return polygon
+
+    try:
+        if isinstance(polygon, str):
+            polygon = json.loads(polygon)
+
+        vertices = []
+        for vertex in polygon or []:
+            if isinstance(vertex, dict):
+                lat = vertex.get("lat", vertex.get("latitude"))
+                lng = vertex.get("lng", vertex.get("longitude"))
+            elif lat_first:
+                lat, lng = vertex[0], vertex[1]
+            else:
+                lng, lat = vertex[0], vertex[1]
+            vertices.append((float(lng), float(lat)))
+    except (ValueError, TypeError, IndexError, KeyError):
+        return np.empty((0, 2))
+
+    return np.array(vertices, dtype=float).reshape(-1, 2)
+
+
+def _crossings(lngs, lats, xi, yi, xj, yj):
+    """
+    Ray-cast crossings for each point (rows) against each edge (columns),
+    casting along +lng from the point.
+    """
+    x = lngs[:, None]
+    y = lats[:, None]
+    straddles = (yi > y) != (yj > y)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x_cross = (xj - xi) * (y - yi) / (yj - yi) + xi
+    return straddles & (x < x_cross)
+
+
+def points_in_polygon(lats, lngs, polygon):
+    """
+    Tests many points against one polygon.
+    Returns a boolean array aligned with the input points.
+    """
+    vertices = to_vertices(polygon)
+    lats = np.atleast_1d(np.asarray(lats, dtype=float))
+    lngs = np.atleast_1d(np.asarray(lngs, dtype=float))
+
+    inside = np.zeros(lats.shape[0], dtype=bool)
+    if len(vertices) < 3:
+        return inside
+
+    xi, yi = vertices[:, 0], vertices[:, 1]
+    xj, yj = np.roll(xi, 1), np.roll(yi, 1)
+
+    for start in range(0, lats.shape[0], CHUNK_SIZE):
+        stop = start + CHUNK_SIZE
+        crossings = _crossings(
+            lngs[start:stop], lats[start:stop], xi, yi, xj, yj
+        )
+        inside[start:stop] = crossings.sum(axis=1) % 2 == 1
+
+    return inside
+
+
+def point_in_polygon(lat, lng, polygon):
+    """Tests a single point against one polygon."""
+    return bool(points_in_polygon([lat], [lng], polygon)[0])
+
+
+class PolygonSet:
+    """
+    Many polygons compiled into one flat edge array, so a point can be
+    tested against all of them in a single vectorized pass.
+    """
+
+    def __init__(self, polygons):
+        xi, yi, xj, yj, owners = [], [], [], [], []
+        self.size = 0
+
+        for position, polygon in enumerate(polygons):
+            vertices = to_vertices(polygon)
+            self.size = position + 1
+            if len(vertices) < 3:
+                continue
+
+            xi.append(vertices[:, 0])
+            yi.append(vertices[:, 1])
+            xj.append(np.roll(vertices[:, 0], 1))
+            yj.append(np.roll(vertices[:, 1], 1))
+            owners.append(np.full(len(vertices), position))
+
+        def _flat(parts):
+            return np.concatenate(parts) if parts else np.empty(0)
+
+        self.xi, self.yi = _flat(xi), _flat(yi)
+        self.xj, self.yj = _flat(xj), _flat(yj)
+        self.owners = _flat(owners).astype(int)
+
+    def contains(self, lat, lng):
+        """
+        Returns a boolean array with one entry per polygon, True where the
+        polygon contains the point.
+        """
+        if not self.size:
+            return np.zeros(0, dtype=bool)
+
+        crossings = _crossings(
+            np.array([float(lng)]),
+            np.array([float(lat)]),
+            self.xi,
+            self.yi,
+            self.xj,
+            self.yj,
+        )[0]
+        counts = np.bincount(
+            self.owners, weights=crossings, minlength=self.size
+        )
+        return counts.astype(int) % 2 == 1
+
+
+def benchmark(zones=1000, vertices=32, points=10000):
+    """
+    Compares the vectorized tests with the per-vertex Python loop they
+    replaced. Run with:
+        bench --site <site> execute paas.geometry.benchmark
+    """
+    import math
+    import random
+    import time
+
+    def legacy_point_in_polygon(lat, lng, polygon):
+        inside = False
+        j = len(polygon) - 1
+        for i in range(len(polygon)):
+            xi, yi = polygon[i][0], polygon[i][1]
+            xj, yj = polygon[j][0], polygon[j][1]
+            intersect = ((yi > lat) != (yj > lat)) and (
+                lng < (xj - xi) * (lat - yi) / (yj - yi) + xi
+            )
+            if intersect:
+                inside = not inside
+            j = i
+        return inside
+
+    def make_polygon(lng, lat, radius):
+        return [
+            [
+                lng + radius * math.cos(2 * math.pi * k / vertices),
+                lat + radius * math.sin(2 * math.pi * k / vertices),
+            ]
+            for k in range(vertices)
+        ]
+
+    rng = random.Random(42)
+    polygons = [
+        make_polygon(rng.uniform(-1, 1), rng.uniform(-1, 1), 0.2)
+        for _ in range(zones)
+    ]
+    lats = [rng.uniform(-1, 1) for _ in range(points)]
+    lngs = [rng.uniform(-1, 1) for _ in range(points)]
+
+    def timed(fn):
+        start = time.perf_counter()
+        result = fn()
+        return result, time.perf_counter() - start
+
+    # Many points against one zone
+    legacy_many, legacy_many_s = timed(
+        lambda: [
+            legacy_point_in_polygon(lat, lng, polygons[0])
+            for lat, lng in zip(lats, lngs)
+        ]
+    )
+    vector_many, vector_many_s = timed(
+        lambda: points_in_polygon(lats, lngs, polygons[0])
+    )
+
+    # One point against every zone
+    compiled = PolygonSet(polygons)
+    legacy_zones, legacy_zones_s = timed(
+        lambda: [
+            legacy_point_in_polygon(lats[0], lngs[0], polygon)
+            for polygon in polygons
+        ]
+    )
+    vector_zones, vector_zones_s = timed(
+        lambda: compiled.contains(lats[0], lngs[0])
+    )
+
+    results = {
+        "points_vs_zone": {
+            "points": points,
+            "legacy_ms": round(legacy_many_s * 1000, 3),
+            "vectorized_ms": round(vector_many_s * 1000, 3),
+            "match": list(vector_many) == legacy_many,
+        },
+        "point_vs_zones": {
+            "zones": zones,
+            "legacy_ms": round(legacy_zones_s * 1000, 3),
+            "vectorized_ms": round(vector_zones_s * 1000, 3),
+            "match": list(vector_zones) == legacy_zones,
+        },
+    }
+    print(json.dumps(results, indent=2))
+    return results
@@ -41,8 +41,16 @@ def get_safe_scheduler_events():
     if app_role == "tenant":
         # PaaS tasks only run on tenant sites
         events = {
+            "all": [
+                "paas.tasks.flush_hot_carts",
+                "paas.tasks.process_payment_webhooks",
+            ],
             "hourly": ["paas.tasks.process_repeating_orders"],
-            "daily": ["paas.tasks.remove_expired_stories"],
+            "daily": [
+                "paas.tasks.remove_expired_stories",
+                "paas.tasks.refresh_sales_windows",
+            ],
+            "weekly": ["paas.tasks.rebuild_sales_counters"],
         }
 
     return events
@@ -89,6 +97,7 @@ whitelisted_methods = {
     "paas.api.notification.get_user_notifications": "paas.api.notification.notification.get_user_notifications",
     "paas.api.notification.get_notification_settings": "paas.api.notification.notification.get_notification_settings",
     "paas.api.parcel.calculate_price": "paas.api.parcel.parcel.calculate_price",
+    "paas.api.parcel.calculate_prices": "paas.api.parcel.parcel.calculate_prices",
     "paas.api.parcel.get_types": "paas.api.parcel.parcel.get_types",
     "paas.api.shop.get_shops": "paas.api.shop.shop.get_shops",
     "paas.api.system.get_policy": "paas.api.system.system.get_policy",
@@ -291,6 +300,7 @@ whitelisted_methods = {
     "paas.api.career.get_career": "paas.api.career.career.get_career",
     "paas.api.career.get_careers": "paas.api.career.career.get_careers",
     "paas.api.cart.add_to_cart": "paas.api.cart.cart.add_to_cart",
+    "paas.api.cart.apply_cart_ops": "paas.api.cart.cart.apply_cart_ops",
     "paas.api.cart.get_cart": "paas.api.cart.cart.get_cart",
     "paas.api.cart.remove_from_cart": "paas.api.cart.cart.remove_from_cart",
     "paas.api.cart.remove_product_cart": "paas.api.cart.cart.remove_product_cart",
@@ -373,6 +383,7 @@ whitelisted_methods = {
     "paas.api.payment.handle_paystack_callback": "paas.api.payment.payment.handle_paystack_callback",
     "paas.api.payment.handle_stripe_webhook": "paas.api.payment.payment.handle_stripe_webhook",
     "paas.api.payment.initiate_flutterwave_payment": "paas.api.payment.payment.initiate_flutterwave_payment",
+    "paas.api.payment.initiate_payment": "paas.api.payment.payment.initiate_payment",
     "paas.api.payment.initiate_paypal_payment": "paas.api.payment.payment.initiate_paypal_payment",
     "paas.api.payment.initiate_paystack_payment": "paas.api.payment.payment.initiate_paystack_payment",
     "paas.api.payment.log_payment_payload": "paas.api.payment.payment.log_payment_payload",
@@ -723,6 +734,9 @@ fixtures = [
         "Cart Detail",
         "Cart",
         "Review",
+        "Review Summary",
+        "Product Sales Counter",
+        "Stock Reservation",
         "Driver Location",
         "PaaS Translation",
         "Settings",
@@ -749,4 +763,78 @@ doc_events = {
     "Item": {
         "on_update": "paas.paas.doctype.product.product.auto_vectorize_product",
         "after_insert": "paas.paas.doctype.product.product.auto_vectorize_product",
-    }}
+    },
+    "Shop": {
+        "on_update": [
+            "paas.api.shop.shop.invalidate_shop_card",
+            "paas.pricing.invalidate_pricing_context",
+        ],
+        "on_trash": [
+            "paas.api.shop.shop.invalidate_shop_card",
+            "paas.pricing.invalidate_pricing_context",
+        ],
+        "after_rename": [
+            "paas.api.shop.shop.invalidate_shop_card",
+            "paas.pricing.invalidate_pricing_context",
+        ],
+    },
+    "Coupon": {
+        "on_update": "paas.pricing.invalidate_pricing_context",
+        "on_trash": "paas.pricing.invalidate_pricing_context",
+    },
+    "Permission Settings": {
+        "on_update": [
+            "paas.settings_cache.invalidate_settings",
+            "paas.pricing.invalidate_pricing_context",
+        ],
+    },
+    "Settings": {
+        "on_update": [
+            "paas.settings_cache.invalidate_settings",
+            "paas.api.remote_config.invalidate_remote_config",
+        ],
+    },
+    "PaaS Translation": {
+        "on_update": "paas.api.translation.invalidate_translation_bundle",
+        "on_trash": "paas.api.translation.invalidate_translation_bundle",
+    },
+    "Remote Config": {
+        "on_update": "paas.api.remote_config.invalidate_remote_config",
+        "on_trash": "paas.api.remote_config.invalidate_remote_config",
+    },
+    "Global Settings": {
+        "on_update": "paas.settings_cache.invalidate_settings",
+    },
+    "Push Notification Settings": {
+        "on_update": "paas.settings_cache.invalidate_settings",
+    },
+    "WhatsApp Tenant Config": {
+        "on_update": "paas.settings_cache.invalidate_settings",
+    },
+    "Shop Booking Working Day": {
+        "on_update": "paas.api.shop.shop.invalidate_shop_card",
+        "on_trash": "paas.api.shop.shop.invalidate_shop_card",
+    },
+    "Shop Booking Closed Date": {
+        "on_update": "paas.api.shop.shop.invalidate_shop_card",
+        "on_trash": "paas.api.shop.shop.invalidate_shop_card",
+    },
+    "PaaS Payment Gateway": {
+        "on_update": [
+            "paas.api.shop.shop.invalidate_global_cod",
+            "paas.api.payment.gateway_config.invalidate_gateway_config",
+        ],
+        "on_trash": [
+            "paas.api.shop.shop.invalidate_global_cod",
+            "paas.api.payment.gateway_config.invalidate_gateway_config",
+        ],
+    },
+    "Flutterwave Settings": {
+        "on_update": "paas.api.payment.gateway_config.invalidate_gateway_config",
+    },
+    "Delivery Zone": {
+        "on_update": "paas.api.delivery_zone.delivery_zone.invalidate_zone_index",
+        "on_trash": "paas.api.delivery_zone.delivery_zone.invalidate_zone_index",
+        "after_rename": "paas.api.delivery_zone.delivery_zone.invalidate_zone_index",
+    },
+}
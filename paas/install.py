@@ -22,6 +22,8 @@ def after_install():
     setup_gin_indexes()
     setup_vector_extension()
     setup_geospatial_extensions()
+    setup_geospatial_indexes()
+    setup_pagination_indexes()
     setup_product_vector_column()
     run_seeders()
     check_and_fetch_sources()
@@ -41,6 +43,103 @@ def setup_geospatial_extensions():
         return False
 
 
+def setup_geospatial_indexes():
+    """
+    Creates earthdistance GiST indexes on latitude/longitude columns so
+    earth_box prefilters and distance ordering avoid full-table scans.
+    """
+    create_earth_index("tabShop")
+    create_earth_index("tabDelivery Point")
+
+
+def create_earth_index(table):
+    try:
+        clean_table = table.lower().replace("tab", "").replace(" ", "_")
+        index_name = f"{clean_table}_earth_idx"
+
+        table_exists = frappe.db.sql(
+            f"SELECT 1 FROM information_schema.tables WHERE table_name = '{table}'",
+            pluck=True,
+        )
+        if not table_exists:
+            print(
+                f"ℹ️ Table {table} does not exist yet. Skipping earth index {index_name}.")
+            return
+
+        chk = frappe.db.sql(
+            f"SELECT 1 FROM pg_indexes WHERE indexname = '{index_name}'",
+            pluck=True,
+        )
+        if not chk:
+            frappe.db.sql(
+                f'CREATE INDEX {index_name} ON "{table}" USING GIST (ll_to_earth(latitude, longitude))')
+    except Exception as e:
+        frappe.db.rollback()
+        print(f"⚠️ Failed to create earth index {index_name}: {str(e)}")
+
+
+# Composite B-tree indexes matching keyset (cursor) pagination, i.e. the
+# listing's filter column followed by (creation, name).
+PAGINATION_INDEXES = [
+    ("tabShop", ["creation", "name"]),
+    ("tabItem", ["creation", "name"]),
+    ("tabOrder", ["user", "creation", "name"]),
+    ("tabOrder", ["creation", "name"]),
+    ("tabParcel Order", ["creation", "name"]),
+    ("tabWallet History", ["wallet", "creation", "name"]),
+    ("tabWallet History", ["creation", "name"]),
+    ("tabNotification Log", ["creation", "name"]),
+    ("tabReview", ["creation", "name"]),
+    ("tabTicket", ["creation", "name"]),
+    ("tabOrder Refund", ["creation", "name"]),
+    ("tabBooking", ["creation", "name"]),
+    ("tabRequest Model", ["creation", "name"]),
+    ("tabTransaction", ["creation", "name"]),
+    ("tabSeller Payout", ["creation", "name"]),
+    ("tabShop Bonus", ["creation", "name"]),
+    ("tabPoint", ["creation", "name"]),
+    ("tabTranslation", ["creation", "name"]),
+    ("tabReferral", ["creation", "name"]),
+    ("tabUser", ["creation", "name"]),
+]
+
+
+def setup_pagination_indexes():
+    """
+    Creates the composite indexes used by cursor pagination so each page is
+    an index range scan instead of an OFFSET walk.
+    """
+    for table, columns in PAGINATION_INDEXES:
+        create_btree_index(table, columns)
+
+
+def create_btree_index(table, columns):
+    try:
+        clean_table = table.lower().replace("tab", "").replace(" ", "_")
+        index_name = f"{clean_table}_{'_'.join(columns)}_idx"
+
+        table_exists = frappe.db.sql(
+            f"SELECT 1 FROM information_schema.tables WHERE table_name = '{table}'",
+            pluck=True,
+        )
+        if not table_exists:
+            print(
+                f"ℹ️ Table {table} does not exist yet. Skipping index {index_name}.")
+            return
+
+        chk = frappe.db.sql(
+            f"SELECT 1 FROM pg_indexes WHERE indexname = '{index_name}'",
+            pluck=True,
+        )
+        if not chk:
+            column_list = ", ".join(f'"{column}"' for column in columns)
+            frappe.db.sql(
+                f'CREATE INDEX {index_name} ON "{table}" ({column_list})')
+    except Exception as e:
+        frappe.db.rollback()
+        print(f"⚠️ Failed to create index {index_name}: {str(e)}")
+
+
 def setup_vector_extension():
     """
     Enables the pgvector extension if not already enabled.
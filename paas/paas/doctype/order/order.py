@@ -1,62 +1,46 @@
 # Copyright (c) 2025 ROKCT INTELLIGENCE (PTY) LTD
 # For license information, please see license.txt
-import frappe
 from frappe.model.document import Document
+from frappe.utils import now_datetime
+from paas.pricing import order_pricing_changed, price_order
+from paas.paas.doctype.product_sales_counter.product_sales_counter import (
+    record_order_sale,
+)
 
 
 class Order(Document):
     def before_save(self):
         self.calculate_totals()
+        self.set_delivered_at()
+
+    def before_update_after_submit(self):
+        self.set_delivered_at()
+
+    def on_update(self):
+        self.update_sales_counters()
+
+    def on_update_after_submit(self):
+        self.update_sales_counters()
+
+    def set_delivered_at(self):
+        if self.status == "Delivered" and self.has_value_changed("status"):
+            self.delivered_at = now_datetime()
+
+    def update_sales_counters(self):
+        """
+        Counts the order's lines as sold when it becomes Delivered, and
+        takes them back out if a delivered order moves to another status.
+        """
+        if not self.has_value_changed("status"):
+            return
+
+        before = self.get_doc_before_save()
+        if self.status == "Delivered":
+            record_order_sale(self)
+        elif before and before.status == "Delivered":
+            record_order_sale(before, sign=-1)
 
     def calculate_totals(self):
-        # Calculate total price from order items
-        total_price = sum(
-            item.price *
-            item.quantity for item in self.order_items)
-        total_discount = sum(item.discount or 0 for item in self.order_items)
-
-        # Calculate shop tax
-        # Calculate shop tax
-        shop_tax = 0
-        if self.shop:
-            shop = frappe.get_doc("Shop", self.shop)
-            if shop.tax:
-                shop_tax = total_price * (shop.tax / 100)
-
-        total_price += shop_tax
-
-        # Apply coupon
-        if self.coupon_code:
-            coupon = frappe.db.get_value("Coupon", {"code": self.coupon_code}, [
-                                         "discount_type", "discount_amount"], as_dict=True)
-            if coupon:
-                if coupon.discount_type == "Percentage":
-                    coupon_discount = total_price * \
-                        (coupon.discount_amount / 100)
-                else:
-                    coupon_discount = coupon.discount_amount
-                total_discount += coupon_discount
-
-        total_price -= total_discount
-
-        # Add service fee
-        service_fee = 0
-        if frappe.db.exists("DocType", "Permission Settings"):
-            service_fee = frappe.db.get_single_value(
-                "Permission Settings", "service_fee") or 0
-
-        total_price += service_fee
-        total_price += self.delivery_fee or 0
-
-        # Commission fee
-        commission_fee = 0
-        if self.shop:
-            # Assuming commission percentage is stored on the Shop doctype
-            if shop.percentage:
-                commission_fee = total_price * (shop.percentage / 100)
-
-        self.total_price = total_price
-        self.tax = shop_tax
-        self.total_discount = total_discount
-        self.service_fee = service_fee
-        self.commission_fee = commission_fee
+        """Reprices the order when a pricing-relevant field or line changed."""
+        if order_pricing_changed(self):
+            price_order(self)
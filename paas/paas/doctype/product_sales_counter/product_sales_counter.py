@@ -0,0 +1,197 @@
+# Copyright (c) 2025 ROKCT INTELLIGENCE (PTY) LTD
+# For license information, please see license.txt
+from datetime import timedelta
+
+import frappe
+from frappe.model.document import Document
+from frappe.utils import flt, get_datetime, now_datetime
+
+
+class ProductSalesCounter(Document):
+    """
+    Units sold per product (all time, last 7 and last 30 days) from
+    Delivered orders. Updated incrementally when an order is delivered and
+    recomputed by the scheduler, so best-seller listings never aggregate
+    order lines at request time.
+    """
+
+    pass
+
+
+# Listing period -> counter column.
+SALES_PERIOD_FIELDS = {"total": "total_qty", "7d": "qty_7d", "30d": "qty_30d"}
+
+# Rolling window column -> length in days.
+SALES_WINDOWS = {"qty_7d": 7, "qty_30d": 30}
+
+
+def get_sales_field(period):
+    """Returns the counter column for a period, defaulting to all time."""
+    return SALES_PERIOD_FIELDS.get(period or "total", "total_qty")
+
+
+def record_order_sale(order, sign=1):
+    """
+    Adds a delivered order's quantities to the counters, or removes them
+    with sign=-1 when a delivered order is reversed. Window columns only
+    change if the delivery falls inside the window.
+    """
+    quantities = {}
+    for item in order.get("order_items") or []:
+        if item.product:
+            quantities[item.product] = quantities.get(item.product, 0) + flt(
+                item.quantity
+            )
+    if not quantities:
+        return
+
+    now = now_datetime()
+    delivered_at = get_datetime(order.get("delivered_at") or now)
+    in_window = {
+        field: delivered_at >= now - timedelta(days=days)
+        for field, days in SALES_WINDOWS.items()
+    }
+
+    rows = []
+    values = []
+    for product, qty in quantities.items():
+        qty *= sign
+        rows.append("(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, 0)")
+        values.extend(
+            [
+                product,
+                product,
+                order.shop,
+                qty,
+                qty if in_window["qty_7d"] else 0,
+                qty if in_window["qty_30d"] else 0,
+                delivered_at if sign > 0 else None,
+                now,
+                now,
+                frappe.session.user,
+                frappe.session.user,
+            ]
+        )
+
+    frappe.db.sql(
+        f"""
+        INSERT INTO "tabProduct Sales Counter" (
+            name, product, shop, total_qty, qty_7d, qty_30d, last_sold_at,
+            creation, modified, modified_by, owner, docstatus
+        )
+        VALUES {", ".join(rows)}
+        ON CONFLICT (name) DO UPDATE SET
+            shop = COALESCE(EXCLUDED.shop, "tabProduct Sales Counter".shop),
+            total_qty = GREATEST(
+                "tabProduct Sales Counter".total_qty + EXCLUDED.total_qty, 0
+            ),
+            qty_7d = GREATEST(
+                "tabProduct Sales Counter".qty_7d + EXCLUDED.qty_7d, 0
+            ),
+            qty_30d = GREATEST(
+                "tabProduct Sales Counter".qty_30d + EXCLUDED.qty_30d, 0
+            ),
+            last_sold_at = GREATEST(
+                "tabProduct Sales Counter".last_sold_at, EXCLUDED.last_sold_at
+            ),
+            modified = EXCLUDED.modified
+        """,
+        values,
+    )
+
+
+# Per-product quantities from Delivered orders. Orders delivered before
+# delivered_at existed fall back to their last modification time.
+_DELIVERED_LINES_SQL = """
+    SELECT
+        item.product AS product,
+        MAX(o.shop) AS shop,
+        SUM(item.quantity) AS total_qty,
+        SUM(CASE WHEN COALESCE(o.delivered_at, o.modified) >= %(since_7d)s
+            THEN item.quantity ELSE 0 END) AS qty_7d,
+        SUM(CASE WHEN COALESCE(o.delivered_at, o.modified) >= %(since_30d)s
+            THEN item.quantity ELSE 0 END) AS qty_30d,
+        MAX(COALESCE(o.delivered_at, o.modified)) AS last_sold_at
+    FROM "tabOrder Item" AS item
+    JOIN "tabOrder" AS o
+        ON o.name = item.parent AND item.parenttype = 'Order'
+    WHERE o.status = 'Delivered' AND item.product IS NOT NULL {condition}
+    GROUP BY item.product
+"""
+
+
+def _window_values():
+    now = now_datetime()
+    return {
+        "now": now,
+        "user": frappe.session.user,
+        "since_7d": now - timedelta(days=SALES_WINDOWS["qty_7d"]),
+        "since_30d": now - timedelta(days=SALES_WINDOWS["qty_30d"]),
+    }
+
+
+def refresh_sales_windows():
+    """
+    Recomputes the 7 and 30 day columns from orders delivered in the last
+    30 days, so sales age out of the windows. Runs daily.
+    """
+    recent_sales = _DELIVERED_LINES_SQL.format(
+        condition="AND COALESCE(o.delivered_at, o.modified) >= %(since_30d)s"
+    )
+    frappe.db.sql(
+        f"""
+        UPDATE "tabProduct Sales Counter" AS counter
+        SET
+            qty_7d = COALESCE(recent.qty_7d, 0),
+            qty_30d = COALESCE(recent.qty_30d, 0)
+        FROM "tabProduct Sales Counter" AS existing
+        LEFT JOIN ({recent_sales}) AS recent
+            ON recent.product = existing.name
+        WHERE counter.name = existing.name
+            AND (
+                counter.qty_7d <> COALESCE(recent.qty_7d, 0)
+                OR counter.qty_30d <> COALESCE(recent.qty_30d, 0)
+            )
+        """,
+        _window_values(),
+    )
+    frappe.db.commit()
+
+
+def rebuild_sales_counters():
+    """
+    Rebuilds every counter from Delivered orders, repairing any drift from
+    status changes that bypassed the Order controller. Runs weekly, or:
+        bench --site <site> execute paas.paas.doctype.product_sales_counter.product_sales_counter.rebuild_sales_counters
+    """
+    all_sales = _DELIVERED_LINES_SQL.format(condition="")
+    frappe.db.sql(
+        f"""
+        INSERT INTO "tabProduct Sales Counter" (
+            name, product, shop, total_qty, qty_7d, qty_30d, last_sold_at,
+            creation, modified, modified_by, owner, docstatus
+        )
+        SELECT
+            sales.product, sales.product, sales.shop, sales.total_qty,
+            sales.qty_7d, sales.qty_30d, sales.last_sold_at,
+            %(now)s, %(now)s, %(user)s, %(user)s, 0
+        FROM ({all_sales}) AS sales
+        ON CONFLICT (name) DO UPDATE SET
+            shop = EXCLUDED.shop,
+            total_qty = EXCLUDED.total_qty,
+            qty_7d = EXCLUDED.qty_7d,
+            qty_30d = EXCLUDED.qty_30d,
+            last_sold_at = EXCLUDED.last_sold_at,
+            modified = EXCLUDED.modified
+        """,
+        _window_values(),
+    )
+    frappe.db.sql(
+        f"""
+        UPDATE "tabProduct Sales Counter"
+        SET total_qty = 0, qty_7d = 0, qty_30d = 0
+        WHERE name NOT IN (SELECT product FROM ({all_sales}) AS sales)
+        """,
+        _window_values(),
+    )
+    frappe.db.commit()
@@ -7,7 +7,21 @@
 from __future__ import unicode_literals
 import frappe
 from frappe.model.document import Document
+from paas.paas.doctype.review_summary.review_summary import (
+    refresh_review_summary,
+)
 
 
 class Review(Document):
-    pass
+    def on_update(self):
+        # Also runs on insert, when there is no previous version
+        before = self.get_doc_before_save()
+        if before and (before.reviewable_type, before.reviewable_id) != (
+            self.reviewable_type,
+            self.reviewable_id,
+        ):
+            refresh_review_summary(before.reviewable_type, before.reviewable_id)
+        refresh_review_summary(self.reviewable_type, self.reviewable_id)
+
+    def after_delete(self):
+        refresh_review_summary(self.reviewable_type, self.reviewable_id)
@@ -0,0 +1,104 @@
+# Copyright (c) 2025 ROKCT INTELLIGENCE (PTY) LTD
+# For license information, please see license.txt
+import frappe
+from frappe.model.document import Document
+from frappe.utils import now_datetime
+
+
+class ReviewSummary(Document):
+    """
+    Precomputed review count and average rating for one reviewed document,
+    kept in sync by the Review controller so listings can filter and sort
+    on ratings without aggregating the Review table.
+    """
+
+    pass
+
+
+# Upserts summaries from the Review rows matched by {where}. The name
+# expression must match the doctype's autoname format.
+_UPSERT_SQL = """
+    INSERT INTO "tabReview Summary" (
+        name, creation, modified, modified_by, owner, docstatus,
+        reviewable_type, reviewable_id, review_count, rating_total, avg_rating
+    )
+    SELECT
+        reviewable_type || '-' || reviewable_id,
+        %(now)s, %(now)s, %(user)s, %(user)s, 0,
+        reviewable_type,
+        reviewable_id,
+        COUNT(*),
+        COALESCE(SUM(rating), 0),
+        COALESCE(AVG(rating), 0)
+    FROM "tabReview"
+    WHERE {where}
+    GROUP BY reviewable_type, reviewable_id
+    ON CONFLICT (name) DO UPDATE SET
+        review_count = EXCLUDED.review_count,
+        rating_total = EXCLUDED.rating_total,
+        avg_rating = EXCLUDED.avg_rating,
+        modified = EXCLUDED.modified
+"""
+
+
+def refresh_review_summary(reviewable_type, reviewable_id):
+    """
+    Recomputes the summary for one reviewed document from its reviews.
+    Uses the Review (reviewable_id) index, so the cost is proportional to
+    that document's reviews rather than the whole table.
+    """
+    if not reviewable_type or not reviewable_id:
+        return
+
+    values = {
+        "now": now_datetime(),
+        "user": frappe.session.user,
+        "reviewable_type": reviewable_type,
+        "reviewable_id": reviewable_id,
+    }
+    frappe.db.sql(
+        _UPSERT_SQL.format(
+            where="reviewable_type = %(reviewable_type)s"
+            " AND reviewable_id = %(reviewable_id)s"
+        ),
+        values,
+    )
+
+    # The last review was removed: the upsert matched nothing, so reset
+    frappe.db.sql(
+        """
+        UPDATE "tabReview Summary"
+        SET review_count = 0, rating_total = 0, avg_rating = 0
+        WHERE reviewable_type = %(reviewable_type)s
+            AND reviewable_id = %(reviewable_id)s
+            AND NOT EXISTS (
+                SELECT 1 FROM "tabReview"
+                WHERE reviewable_type = %(reviewable_type)s
+                    AND reviewable_id = %(reviewable_id)s
+            )
+        """,
+        values,
+    )
+
+
+def rebuild_review_summaries():
+    """
+    Rebuilds every summary from the Review table. Used to backfill and to
+    repair drift. Run with:
+        bench --site <site> execute paas.paas.doctype.review_summary.review_summary.rebuild_review_summaries
+    """
+    frappe.db.sql(
+        _UPSERT_SQL.format(where="1 = 1"),
+        {"now": now_datetime(), "user": frappe.session.user},
+    )
+    frappe.db.sql(
+        """
+        UPDATE "tabReview Summary" AS summary
+        SET review_count = 0, rating_total = 0, avg_rating = 0
+        WHERE NOT EXISTS (
+            SELECT 1 FROM "tabReview" AS review
+            WHERE review.reviewable_type = summary.reviewable_type
+                AND review.reviewable_id = summary.reviewable_id
+        )
+        """
+    )
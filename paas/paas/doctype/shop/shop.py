@@ -6,3 +6,15 @@ class Shop(Document):
     def before_insert(self):
         if not self.shared_secret:
             self.shared_secret = frappe.generate_hash(length=32)
+
+    def validate(self):
+        self.sync_coordinates()
+
+    def sync_coordinates(self):
+        """
+        Mirrors the Geolocation field into the latitude/longitude columns
+        so geo queries can use the earthdistance index.
+        """
+        from paas.api.utils import parse_coordinates
+
+        self.latitude, self.longitude = parse_coordinates(self.location)
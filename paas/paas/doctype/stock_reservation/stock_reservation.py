@@ -0,0 +1,13 @@
+# Copyright (c) 2025 ROKCT INTELLIGENCE (PTY) LTD
+# For license information, please see license.txt
+from frappe.model.document import Document
+
+
+class StockReservation(Document):
+    """
+    Quantity taken from one Stock row for an accepted order. Written and
+    released in bulk by paas.stock so cancellations restore exactly what
+    was deducted.
+    """
+
+    pass
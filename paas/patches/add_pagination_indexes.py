@@ -0,0 +1,13 @@
+# Copyright (c) 2025 ROKCT INTELLIGENCE (PTY) LTD
+# For license information, please see license.txt
+import frappe
+
+
+def execute():
+    """
+    Adds the composite (creation, name) indexes used by cursor pagination.
+    """
+    from paas.install import setup_pagination_indexes
+
+    setup_pagination_indexes()
+    frappe.db.commit()
@@ -0,0 +1,27 @@
+# Copyright (c) 2025 ROKCT INTELLIGENCE (PTY) LTD
+# For license information, please see license.txt
+import frappe
+
+
+def execute():
+    """
+    Adds Order.delivered_at and builds the best-seller counters from the
+    orders delivered so far.
+    """
+    from paas.paas.doctype.product_sales_counter.product_sales_counter import (
+        rebuild_sales_counters,
+    )
+
+    frappe.reload_doc("paas", "doctype", "order")
+    frappe.reload_doc("paas", "doctype", "product_sales_counter")
+
+    # Best available delivery time for historic orders
+    frappe.db.sql(
+        """
+        UPDATE "tabOrder"
+        SET delivered_at = modified
+        WHERE status = 'Delivered' AND delivered_at IS NULL
+        """
+    )
+
+    rebuild_sales_counters()
@@ -0,0 +1,19 @@
+# Copyright (c) 2025 ROKCT INTELLIGENCE (PTY) LTD
+# For license information, please see license.txt
+import frappe
+
+
+def execute():
+    """
+    Creates Review Summary rows for every reviewed document so product
+    listings can read ratings without aggregating the Review table.
+    """
+    from paas.paas.doctype.review_summary.review_summary import (
+        rebuild_review_summaries,
+    )
+
+    frappe.reload_doc("paas", "doctype", "review")
+    frappe.reload_doc("paas", "doctype", "review_summary")
+
+    rebuild_review_summaries()
+    frappe.db.commit()
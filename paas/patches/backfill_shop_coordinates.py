@@ -0,0 +1,29 @@
+# Copyright (c) 2025 ROKCT INTELLIGENCE (PTY) LTD
+# For license information, please see license.txt
+import frappe
+
+
+def execute():
+    """
+    Populates Shop.latitude/longitude from the Geolocation field and adds
+    the earthdistance index used by get_shops distance sorting.
+    """
+    from paas.api.utils import parse_coordinates
+    from paas.install import setup_geospatial_extensions, setup_geospatial_indexes
+
+    frappe.reload_doc("paas", "doctype", "shop")
+
+    shops = frappe.get_all("Shop", fields=["name", "location"])
+    for shop in shops:
+        lat, lng = parse_coordinates(shop.location)
+        frappe.db.set_value(
+            "Shop",
+            shop.name,
+            {"latitude": lat, "longitude": lng},
+            update_modified=False,
+        )
+
+    if setup_geospatial_extensions():
+        setup_geospatial_indexes()
+
+    frappe.db.commit()
@@ -0,0 +1,12 @@
+# Copyright (c) 2025 ROKCT INTELLIGENCE (PTY) LTD
+# For license information, please see license.txt
+
+
+def execute():
+    """
+    Drops cached shop cards built before working hours carried the
+    disabled flag.
+    """
+    from paas.api.shop.shop import clear_shop_card_cache
+
+    clear_shop_card_cache()
@@ -0,0 +1,313 @@
+# Copyright (c) 2025 ROKCT INTELLIGENCE (PTY) LTD
+# For license information, please see license.txt
+
+"""
+Pricing for cart quotes and orders.
+
+Everything pricing needs from the shop (tax, commission, distance rate,
+coordinates), the platform service fee and the shop's live coupons is kept
+as a per-shop pricing context in Redis. Contexts expire after
+PRICING_CONTEXT_TTL and are dropped by doc_events when a Shop, Coupon or
+Permission Settings changes, so a quote costs one bulk product query plus a
+cache read. Lookups are also memoized for the rest of the request, so
+saving many orders, or one order many times, reads the cache once.
+"""
+
+import time
+
+import frappe
+from frappe.utils import flt, get_datetime, now_datetime
+from paas.api.utils import haversine
+from paas.settings_cache import get_setting
+from paas.stock import get_product_prices
+
+# Redis hash of pricing contexts, one field per shop.
+PRICING_CONTEXT_KEY = "paas:pricing_context"
+PRICING_CONTEXT_TTL = 5 * 60
+
+# Fields and order line fields that feed into Order totals.
+ORDER_PRICING_FIELDS = ("shop", "coupon_code", "delivery_fee")
+ORDER_LINE_PRICING_FIELDS = ("product", "quantity", "price", "discount")
+
+
+def _request_cache():
+    """Lookups memoized for the current request or job."""
+    if not hasattr(frappe.local, "pricing_cache"):
+        frappe.local.pricing_cache = {}
+    return frappe.local.pricing_cache
+
+
+def get_pricing_context(shop):
+    """Returns the cached pricing context for a shop, rebuilding it if stale."""
+    local = _request_cache()
+    if shop in local:
+        return local[shop]
+
+    context = frappe.cache.hget(PRICING_CONTEXT_KEY, shop)
+    stale_before = time.time() - PRICING_CONTEXT_TTL
+    if not context or context["cached_at"] <= stale_before:
+        context = _build_pricing_context(shop)
+        frappe.cache.hset(PRICING_CONTEXT_KEY, shop, context)
+
+    local[shop] = context
+    return context
+
+
+def get_service_fee():
+    return flt(get_setting("Permission Settings", "service_fee"))
+
+
+def _build_pricing_context(shop):
+    values = frappe.db.get_value(
+        "Shop",
+        shop,
+        ["tax", "price_per_km", "latitude", "longitude", "percentage"],
+        as_dict=True,
+    )
+    if not values:
+        frappe.throw(f"Shop {shop} not found.", frappe.DoesNotExistError)
+
+    coupons = frappe.get_all(
+        "Coupon",
+        filters={"shop": shop, "expired_at": [">=", now_datetime()]},
+        fields=["code", "discount_type", "discount_amount", "expired_at"],
+    )
+
+    return {
+        "shop": shop,
+        "tax": flt(values.tax),
+        "price_per_km": flt(values.price_per_km),
+        "latitude": values.latitude,
+        "longitude": values.longitude,
+        "percentage": flt(values.percentage),
+        "service_fee": get_service_fee(),
+        "coupons": {
+            coupon.code: {
+                "discount_type": coupon.discount_type,
+                "discount_amount": flt(coupon.discount_amount),
+                "expired_at": coupon.expired_at,
+            }
+            for coupon in coupons
+        },
+        "cached_at": time.time(),
+    }
+
+
+def get_coupon(context, coupon_code):
+    """Returns the shop's coupon for the code if it has not expired."""
+    coupon = context["coupons"].get(coupon_code) if coupon_code else None
+    if coupon and get_datetime(coupon["expired_at"]) >= now_datetime():
+        return coupon
+    return None
+
+
+def get_coupon_by_code(coupon_code):
+    """
+    Returns a coupon by code regardless of shop or expiry. Orders keep the
+    coupon they were placed with, so repricing one must not drop it.
+    """
+    key = ("coupon", coupon_code)
+    local = _request_cache()
+    if key not in local:
+        coupon = frappe.db.get_value(
+            "Coupon",
+            {"code": coupon_code},
+            ["discount_type", "discount_amount"],
+            as_dict=True,
+        )
+        local[key] = coupon and {
+            "discount_type": coupon.discount_type,
+            "discount_amount": flt(coupon.discount_amount),
+        }
+    return local[key]
+
+
+def coupon_discount(coupon, amount):
+    """Discount a coupon gives on amount; Percentage coupons store the rate."""
+    if not coupon:
+        return 0
+    if coupon["discount_type"] == "Percentage":
+        return amount * (coupon["discount_amount"] / 100)
+    return coupon["discount_amount"]
+
+
+def delivery_fee(context, address):
+    """Distance-based delivery fee from the shop to the address."""
+    if not (
+        context["latitude"]
+        and context["longitude"]
+        and address.get("latitude")
+        and address.get("longitude")
+    ):
+        return 0
+
+    distance = haversine(
+        context["latitude"],
+        context["longitude"],
+        address["latitude"],
+        address["longitude"],
+    )
+    return distance * context["price_per_km"]
+
+
+def quote_cart(
+    cart, address=None, coupon_code=None, tips=0, delivery_type="Delivery"
+):
+    """
+    Prices a cart snapshot and returns the GetCalculateModel payload.
+    Alternatives are priced Pay-Max: a line is charged the higher of its
+    product's and its alternative's price, and the difference is reported
+    as subtotal_buffer.
+    """
+    context = get_pricing_context(cart.shop)
+    products = get_product_prices(
+        [line.item for line in cart.items]
+        + [line.alternative_product for line in cart.items]
+    )
+
+    # 1. Product totals
+    product_tax = 0
+    product_total = 0
+    subtotal_buffer = 0
+    discount = 0
+
+    for line in cart.items:
+        product = products.get(line.item) or frappe._dict()
+        item_price = flt(product.price)
+        item_qty = line.quantity or 0
+
+        effective_price = item_price
+        if line.alternative_product:
+            alternative = products.get(line.alternative_product)
+            alt_price = flt(alternative.price) if alternative else 0
+            if alt_price > item_price:
+                effective_price = alt_price
+                subtotal_buffer += (alt_price - item_price) * item_qty
+
+        product_total += effective_price * item_qty
+        product_tax += (
+            effective_price * flt(product.get("tax")) / 100
+        ) * item_qty
+        discount += (
+            effective_price * flt(line.get("discount_percentage")) / 100
+        ) * item_qty
+
+    # 2. Delivery fee
+    fee = 0
+    if delivery_type == "Delivery" and address:
+        fee = delivery_fee(context, address)
+
+    # 3. Shop tax on the discounted subtotal
+    shop_tax = (product_total - discount) * (context["tax"] / 100)
+
+    # 4. Coupon
+    coupon_price = coupon_discount(
+        get_coupon(context, coupon_code), product_total - discount
+    )
+
+    tips = flt(tips)
+    order_total = (
+        (product_total - discount)
+        + fee
+        + shop_tax
+        + context["service_fee"]
+        - coupon_price
+        + tips
+    )
+
+    return {
+        "total_tax": product_tax,
+        "price": product_total,
+        "total_shop_tax": shop_tax,
+        "total_price": max(order_total, 0),
+        "total_discount": discount + coupon_price,
+        "delivery_fee": fee,
+        "service_fee": context["service_fee"],
+        "tips": tips,
+        "coupon_price": coupon_price,
+        "subtotal_buffer": subtotal_buffer,
+    }
+
+
+def order_pricing_changed(order):
+    """
+    True if an order is new or any field or line that feeds into its
+    totals has changed since it was loaded.
+    """
+    before = order.get_doc_before_save()
+    if order.is_new() or not before:
+        return True
+
+    if any(order.has_value_changed(field) for field in ORDER_PRICING_FIELDS):
+        return True
+
+    def lines(doc):
+        return [
+            tuple(line.get(field) for field in ORDER_LINE_PRICING_FIELDS)
+            for line in doc.order_items
+        ]
+
+    return lines(order) != lines(before)
+
+
+def price_order(order):
+    """Sets an order's totals, tax, discount, service and commission fees."""
+    total_price = sum(
+        flt(line.price) * flt(line.quantity) for line in order.order_items
+    )
+    total_discount = sum(flt(line.discount) for line in order.order_items)
+
+    context = get_pricing_context(order.shop) if order.shop else None
+
+    # Shop tax
+    shop_tax = total_price * (context["tax"] / 100) if context else 0
+    total_price += shop_tax
+
+    # Coupon
+    if order.coupon_code:
+        total_discount += coupon_discount(
+            get_coupon_by_code(order.coupon_code), total_price
+        )
+    total_price -= total_discount
+
+    # Service and delivery fees
+    service_fee = get_service_fee()
+    total_price += service_fee
+    total_price += order.delivery_fee or 0
+
+    # Commission is a percentage stored on the Shop
+    commission_fee = (
+        total_price * (context["percentage"] / 100) if context else 0
+    )
+
+    order.total_price = total_price
+    order.tax = shop_tax
+    order.total_discount = total_discount
+    order.service_fee = service_fee
+    order.commission_fee = commission_fee
+
+
+def clear_pricing_context(shop=None):
+    """Drops one shop's pricing context, or all of them."""
+    # Request-local lookups include coupons as well as contexts
+    frappe.local.pricing_cache = {}
+    if shop:
+        frappe.cache.hdel(PRICING_CONTEXT_KEY, shop)
+    else:
+        frappe.cache.delete_value(PRICING_CONTEXT_KEY)
+
+
+def invalidate_pricing_context(doc, method=None, *args):
+    """
+    doc_events handler for Shop, Coupon and Permission Settings. The
+    service fee is part of every context, so settings changes drop them all.
+    """
+    if doc.doctype == "Shop" and method != "after_rename":
+        clear_pricing_context(doc.name)
+    elif doc.doctype == "Coupon" and doc.shop:
+        clear_pricing_context(doc.shop)
+        before = doc.get_doc_before_save()
+        if before and before.shop != doc.shop:
+            clear_pricing_context(before.shop)
+    else:
+        clear_pricing_context()
@@ -0,0 +1,60 @@
+# Copyright (c) 2025 ROKCT INTELLIGENCE (PTY) LTD
+# For license information, please see license.txt
+
+"""
+Process-level cache for single doctypes read on hot paths.
+
+Each worker keeps the loaded settings documents in memory, tagged with a
+per-doctype version held in Redis. Saving one of the singles bumps its
+version through doc_events, and every process reloads it on next use, so
+a request costs one Redis read per doctype instead of rebuilding the doc.
+"""
+
+from functools import partial
+
+import frappe
+from frappe.model.document import Document
+
+# Redis hash of settings versions, one field per doctype.
+SETTINGS_VERSION_KEY = "paas:settings_version"
+
+# (site, doctype) -> (version, document)
+_settings = {}
+
+
+def get_settings(doctype: str) -> Document:
+    """
+    Returns a single doctype's document from the process cache. The doc is
+    shared, so treat it as read-only and use frappe.get_single to edit.
+    """
+    version = frappe.cache.hget(SETTINGS_VERSION_KEY, doctype)
+    key = (frappe.local.site, doctype)
+    cached = _settings.get(key)
+
+    if cached is None or cached[0] != version:
+        cached = (version, frappe.get_single(doctype))
+        _settings[key] = cached
+
+    return cached[1]
+
+
+def get_setting(doctype: str, fieldname: str, default=None):
+    """Returns one field of a cached single, or default if it is unset."""
+    value = get_settings(doctype).get(fieldname)
+    return default if value is None else value
+
+
+def _bump_settings_version(doctype):
+    frappe.cache.hset(
+        SETTINGS_VERSION_KEY, doctype, frappe.generate_hash(length=10)
+    )
+
+
+def invalidate_settings(doc, method=None):
+    """
+    doc_events handler for the cached singles. Like the delivery zone
+    index, the version is bumped again once the transaction ends.
+    """
+    _bump_settings_version(doc.doctype)
+    frappe.db.after_commit.add(partial(_bump_settings_version, doc.doctype))
+    frappe.db.after_rollback.add(partial(_bump_settings_version, doc.doctype))
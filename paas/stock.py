@@ -0,0 +1,292 @@
+# Copyright (c) 2025 ROKCT INTELLIGENCE (PTY) LTD
+# For license information, please see license.txt
+
+"""
+Bulk stock and price lookups for order lines, and stock reservations.
+
+Order creation resolves every line (stock for the product and its
+alternative, price and cost of the chosen product) from two queries,
+however large the basket is.
+
+Accepting an order reserves stock for all of its lines with one guarded
+UPDATE and records Stock Reservation rows; cancelling releases exactly
+those rows. Stock rows are locked in name order first, so concurrent
+acceptances touching the same products queue instead of deadlocking or
+losing updates.
+"""
+
+import frappe
+from frappe.utils import cint, flt, now_datetime
+
+
+def get_stock_levels(shop, products):
+    """
+    Returns {product: quantity} for the shop's Stock rows of the given
+    products in one query. Products without a Stock row are omitted.
+    """
+    products = list({product for product in products if product})
+    if not shop or not products:
+        return {}
+
+    levels = {}
+    for row in frappe.get_all(
+        "Stock",
+        filters={"shop": shop, "product": ["in", products]},
+        fields=["product", "quantity"],
+        order_by="creation asc",
+    ):
+        # Keep the first row per product, like a get_value lookup would
+        levels.setdefault(row.product, row.quantity or 0)
+    return levels
+
+
+def get_product_prices(products):
+    """
+    Returns {product: frappe._dict(price, cost, track_stock)} for the given
+    products in one query.
+    """
+    products = list({product for product in products if product})
+    if not products:
+        return {}
+
+    return {
+        row.name: row
+        for row in frappe.get_all(
+            "Product",
+            filters={"name": ["in", products]},
+            fields=["name", "price", "cost", "track_stock"],
+        )
+    }
+
+
+def resolve_order_lines(shop, items):
+    """
+    Applies real-time stock checks and auto-substitution to order lines.
+    A line whose product is out of stock switches to its alternative if the
+    alternative is in stock. Prices are the chosen product's current price
+    and cost. Returns the order_items rows to append.
+    """
+    levels = get_stock_levels(
+        shop,
+        [item.get("product") for item in items]
+        + [item.get("alternative_product") for item in items],
+    )
+
+    lines = []
+    for item in items:
+        product_id = item.get("product")
+        alt_product_id = item.get("alternative_product")
+
+        is_substituted = 0
+        original_product = None
+
+        if levels.get(product_id, 0) <= 0 and alt_product_id:
+            if levels.get(alt_product_id, 0) > 0:
+                original_product = product_id
+                product_id = alt_product_id
+                is_substituted = 1
+
+        lines.append(
+            frappe._dict(
+                product=product_id,
+                quantity=item.get("quantity"),
+                alternative_product=alt_product_id,
+                is_substituted=is_substituted,
+                original_product=original_product,
+            )
+        )
+
+    prices = get_product_prices([line.product for line in lines])
+    for line in lines:
+        product = prices.get(line.product) or frappe._dict()
+        line.price = flt(product.price)
+        line.cost_price = flt(product.cost)
+
+    return lines
+
+
+def _stock_quantities(order):
+    """
+    Returns {product: quantity} for the order's lines whose product tracks
+    stock.
+    """
+    products = get_product_prices([item.product for item in order.order_items])
+
+    quantities = {}
+    for item in order.order_items:
+        product = products.get(item.product)
+        if product and product.track_stock and cint(item.quantity) > 0:
+            quantities[item.product] = quantities.get(item.product, 0) + cint(
+                item.quantity
+            )
+    return quantities
+
+
+def _lock_stock_rows(shop, products):
+    """
+    Locks the shop's Stock row for each product (the oldest one if there
+    are duplicates) and returns {product: frappe._dict(name, quantity)}.
+    """
+    rows = frappe.db.sql(
+        """
+        SELECT name, product, quantity
+        FROM "tabStock"
+        WHERE name IN (
+            SELECT DISTINCT ON (product) name
+            FROM "tabStock"
+            WHERE shop = %(shop)s AND product IN %(products)s
+            ORDER BY product, creation
+        )
+        ORDER BY name
+        FOR UPDATE
+        """,
+        {"shop": shop, "products": tuple(products)},
+        as_dict=True,
+    )
+    return {row.product: row for row in rows}
+
+
+def reserve_order_stock(order):
+    """
+    Deducts stock for every stock-tracked line of the order in a single
+    guarded UPDATE and records a Stock Reservation per line. Lines whose
+    product has no Stock row in the shop are skipped. Throws a
+    ValidationError, leaving stock untouched, if any product is short.
+    Does nothing if the order already holds reservations.
+    """
+    if frappe.db.exists(
+        "Stock Reservation", {"order": order.name, "status": "Reserved"}
+    ):
+        return
+
+    quantities = _stock_quantities(order)
+    if not quantities:
+        return
+
+    stock_rows = _lock_stock_rows(order.shop, quantities)
+    # Products the shop keeps no Stock row for are not tracked here
+    quantities = {
+        product: qty
+        for product, qty in quantities.items()
+        if product in stock_rows
+    }
+    if not quantities:
+        return
+
+    short = [
+        product
+        for product, qty in quantities.items()
+        if cint(stock_rows[product].quantity) < qty
+    ]
+    if short:
+        frappe.throw(
+            f"Insufficient stock for: {', '.join(short)}",
+            frappe.ValidationError,
+        )
+
+    lines = [
+        (stock_rows[product].name, product, qty)
+        for product, qty in quantities.items()
+    ]
+    now = now_datetime()
+
+    updated = frappe.db.sql(
+        f"""
+        UPDATE "tabStock" AS stock
+        SET quantity = stock.quantity - line.qty, modified = %s
+        FROM (VALUES {", ".join(["(%s, %s::int)"] * len(lines))})
+            AS line(name, qty)
+        WHERE stock.name = line.name AND stock.quantity >= line.qty
+        RETURNING stock.name
+        """,
+        [now] + [value for name, _, qty in lines for value in (name, qty)],
+    )
+    if len(updated) != len(lines):
+        # Unreachable while the rows are locked; guards against misuse
+        frappe.throw("Stock changed while reserving.", frappe.ValidationError)
+
+    user = frappe.session.user
+    frappe.db.bulk_insert(
+        "Stock Reservation",
+        fields=[
+            "name",
+            "order",
+            "shop",
+            "product",
+            "stock",
+            "quantity",
+            "status",
+            "creation",
+            "modified",
+            "owner",
+            "modified_by",
+        ],
+        values=[
+            (
+                frappe.generate_hash(length=10),
+                order.name,
+                order.shop,
+                product,
+                stock_name,
+                qty,
+                "Reserved",
+                now,
+                now,
+                user,
+                user,
+            )
+            for stock_name, product, qty in lines
+        ],
+    )
+
+
+def release_order_stock(order):
+    """
+    Returns the order's reserved stock in one statement and marks the
+    reservations Released. Orders accepted before reservations existed are
+    restored from their lines instead.
+    """
+    released = frappe.db.sql(
+        """
+        WITH released AS (
+            UPDATE "tabStock Reservation"
+            SET status = 'Released', modified = %(now)s
+            WHERE "order" = %(order)s AND status = 'Reserved'
+            RETURNING stock, quantity
+        )
+        UPDATE "tabStock" AS stock
+        SET quantity = stock.quantity + line.qty, modified = %(now)s
+        FROM (
+            SELECT stock, SUM(quantity) AS qty FROM released GROUP BY stock
+        ) AS line
+        WHERE stock.name = line.stock
+        RETURNING stock.name
+        """,
+        {"order": order.name, "now": now_datetime()},
+    )
+    if released or frappe.db.exists("Stock Reservation", {"order": order.name}):
+        return
+
+    quantities = _stock_quantities(order)
+    if not quantities:
+        return
+
+    stock_rows = _lock_stock_rows(order.shop, quantities)
+    lines = [
+        (stock_rows[product].name, qty)
+        for product, qty in quantities.items()
+        if product in stock_rows
+    ]
+    if not lines:
+        return
+
+    frappe.db.sql(
+        f"""
+        UPDATE "tabStock" AS stock
+        SET quantity = stock.quantity + line.qty, modified = %s
+        FROM (VALUES {", ".join(["(%s, %s::int)"] * len(lines))})
+            AS line(name, qty)
+        WHERE stock.name = line.name
+        """,
+        [now_datetime()] + [value for line in lines for value in line],
+    )
@@ -227,3 +227,59 @@ def process_repeating_orders():  # noqa: C901
     if expired_ro:
         frappe.db.commit()
         print(f"Cleaned up {len(expired_ro)} expired auto-orders.")
+
+
+def refresh_sales_windows():
+    """
+    Ages sales out of the 7 and 30 day best-seller counters.
+    This is run daily by the scheduler on tenant sites.
+    """
+    if frappe.conf.get("app_role", "tenant") != "tenant":
+        return
+
+    from paas.paas.doctype.product_sales_counter.product_sales_counter import (
+        refresh_sales_windows as refresh_windows,
+    )
+
+    refresh_windows()
+
+
+def rebuild_sales_counters():
+    """
+    Rebuilds the best-seller counters from Delivered orders.
+    This is run weekly by the scheduler on tenant sites.
+    """
+    if frappe.conf.get("app_role", "tenant") != "tenant":
+        return
+
+    from paas.paas.doctype.product_sales_counter.product_sales_counter import (
+        rebuild_sales_counters as rebuild_counters,
+    )
+
+    rebuild_counters()
+
+
+def flush_hot_carts():
+    """
+    Persists changed hot carts and evicts idle ones.
+    This is run by the scheduler on tenant sites with hot carts enabled.
+    """
+    if frappe.conf.get("app_role", "tenant") != "tenant":
+        return
+
+    from paas import cart_store
+
+    cart_store.flush_carts()
+
+
+def process_payment_webhooks():
+    """
+    Drains payment callbacks left in the inbox, e.g. if a drain job was
+    never queued. This is run by the scheduler on tenant sites.
+    """
+    if frappe.conf.get("app_role", "tenant") != "tenant":
+        return
+
+    from paas.api.payment import webhooks
+
+    webhooks.process_payment_webhooks()
@@ -0,0 +1,173 @@
+# Copyright (c) 2025 ROKCT INTELLIGENCE (PTY) LTD
+# For license information, please see license.txt
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from unittest.mock import patch
+from paas import cart_store
+from paas.api.cart.cart import add_to_cart, apply_cart_ops, remove_from_cart
+import json
+
+
+class TestCartAPI(FrappeTestCase):
+    def setUp(self):
+        if not frappe.db.exists("User", "test_cart_user@example.com"):
+            self.test_user = frappe.get_doc({
+                "doctype": "User",
+                "email": "test_cart_user@example.com",
+                "first_name": "Test",
+                "last_name": "Cart"
+            }).insert(ignore_permissions=True)
+        else:
+            self.test_user = frappe.get_doc(
+                "User", "test_cart_user@example.com")
+
+        if not frappe.db.exists("Shop", "Test Cart Shop"):
+            self.test_shop = frappe.get_doc({
+                "doctype": "Shop",
+                "shop_name": "Test Cart Shop",
+                "user": self.test_user.name,
+                "uuid": "test_cart_shop_uuid",
+                "phone": "+14155552672"
+            }).insert(ignore_permissions=True)
+        else:
+            self.test_shop = frappe.get_doc("Shop", "Test Cart Shop")
+
+        self.product_a = frappe.get_doc({
+            "doctype": "Product",
+            "title": "Test Cart Product A",
+            "shop": self.test_shop.name,
+            "price": 100
+        }).insert(ignore_permissions=True)
+        self.product_b = frappe.get_doc({
+            "doctype": "Product",
+            "title": "Test Cart Product B",
+            "shop": self.test_shop.name,
+            "price": 30
+        }).insert(ignore_permissions=True)
+
+        frappe.set_user(self.test_user.name)
+
+    def tearDown(self):
+        frappe.set_user("Administrator")
+        frappe.db.rollback()
+
+    def test_apply_cart_ops_single_save(self):
+        cart = apply_cart_ops(self.test_shop.name, json.dumps([
+            {"op": "add", "item_code": self.product_a.name, "qty": 1},
+            {"op": "add", "item_code": self.product_a.name, "qty": 2},
+            {"op": "add", "item_code": self.product_b.name, "qty": 1},
+        ]))
+
+        self.assertEqual(len(cart["items"]), 2)
+        self.assertEqual(cart["total_price"], 330)
+
+        line_a = next(
+            row for row in cart["items"] if row.item == self.product_a.name)
+        line_b = next(
+            row for row in cart["items"] if row.item == self.product_b.name)
+        self.assertEqual(line_a.quantity, 3)
+
+        cart = apply_cart_ops(self.test_shop.name, [
+            {"op": "update", "cart_detail": line_a.name, "qty": 1},
+            {"op": "remove", "cart_detail": line_b.name},
+        ])
+        self.assertEqual(len(cart["items"]), 1)
+        self.assertEqual(cart["total_price"], 100)
+        self.assertEqual(
+            frappe.db.get_value("Cart", cart["name"], "total_price"), 100)
+
+    def test_add_and_remove_keep_totals_fresh(self):
+        cart = add_to_cart(2, self.test_shop.name, item_code=self.product_b.name)
+        self.assertEqual(cart["total_price"], 60)
+
+        addons = json.dumps([{"stock_id": 1, "quantity": 1}])
+        cart = add_to_cart(
+            1, self.test_shop.name, item_code=self.product_b.name,
+            addons=addons)
+        self.assertEqual(len(cart["items"]), 2)
+        self.assertEqual(cart["total_price"], 90)
+
+        remove_from_cart(cart["items"][0].name)
+        self.assertEqual(
+            frappe.db.get_value("Cart", cart["name"], "total_price"), 30)
+
+    def is_dirty(self, cart_name):
+        return frappe.cache.sismember(cart_store.DIRTY_CARTS_KEY, cart_name)
+
+    def test_hot_cart_write_behind(self):
+        frappe.conf.hot_carts = 1
+        try:
+            cart = add_to_cart(
+                2, self.test_shop.name, item_code=self.product_a.name)
+            self.assertFalse(frappe.db.exists("Cart", cart["name"]))
+
+            # cart_id lookups see the hot copy before it is persisted
+            hot = cart_store.get_cart(cart["name"])
+            self.assertEqual(hot.total_price, 200)
+
+            # Commits are left to the test transaction; the after_commit
+            # callbacks are run by hand instead
+            with patch("frappe.db.commit"):
+                cart_store.flush_carts()
+            self.assertEqual(
+                frappe.db.get_value("Cart", cart["name"], "total_price"), 200)
+            self.assertTrue(
+                frappe.db.exists("Cart Detail", cart["items"][0].name))
+            self.assertTrue(self.is_dirty(cart["name"]))
+            frappe.db.after_commit.run()
+            self.assertFalse(self.is_dirty(cart["name"]))
+
+            cart = add_to_cart(
+                1, self.test_shop.name, item_code=self.product_b.name)
+            persisted = cart_store.persist_cart(cart["name"], evict=True)
+            self.assertEqual(len(persisted.items), 2)
+            self.assertEqual(persisted.total_price, 230)
+
+            # The hot copy outlives the persist until the transaction commits
+            self.assertTrue(cart_store.get_cart(cart["name"]).flags.hot_cart)
+            frappe.db.after_commit.run()
+            self.assertFalse(
+                frappe.cache.hget(cart_store.CART_INDEX_KEY, cart["name"]))
+        finally:
+            cart_store.discard_cart(cart["name"])
+            frappe.conf.hot_carts = 0
+
+    def test_hot_cart_stays_dirty_when_persist_fails(self):
+        frappe.conf.hot_carts = 1
+        try:
+            cart = add_to_cart(
+                2, self.test_shop.name, item_code=self.product_a.name)
+
+            with patch(
+                    "frappe.model.document.Document.insert",
+                    side_effect=frappe.ValidationError):
+                with self.assertRaises(frappe.ValidationError):
+                    cart_store.persist_cart(cart["name"], evict=True)
+
+            # Still hot and dirty, so the next flush writes it
+            self.assertTrue(self.is_dirty(cart["name"]))
+            self.assertTrue(cart_store.get_cart(cart["name"]).flags.hot_cart)
+        finally:
+            frappe.db.after_commit.reset()
+            cart_store.discard_cart(cart["name"])
+            frappe.conf.hot_carts = 0
+
+    def test_cart_changed_after_persist_is_not_evicted(self):
+        frappe.conf.hot_carts = 1
+        try:
+            cart = add_to_cart(
+                2, self.test_shop.name, item_code=self.product_a.name)
+            cart_store.persist_cart(cart["name"], evict=True)
+
+            # A change lands between the persist and the commit
+            cart = add_to_cart(
+                1, self.test_shop.name, item_code=self.product_b.name)
+            frappe.db.after_commit.run()
+
+            self.assertTrue(self.is_dirty(cart["name"]))
+            hot = cart_store.get_cart(cart["name"])
+            self.assertTrue(hot.flags.hot_cart)
+            self.assertEqual(len(hot.items), 2)
+        finally:
+            cart_store.discard_cart(cart["name"])
+            frappe.conf.hot_carts = 0
@@ -2,7 +2,9 @@
 # For license information, please see license.txt
 import frappe
 from frappe.tests.utils import FrappeTestCase
-from paas.api.order.order import create_order, list_orders, get_order_details, update_order_status, add_order_review, cancel_order
+from paas.api.order.order import create_order, list_orders, get_order_details, update_order_status, add_order_review, cancel_order, get_calculate
+from frappe.utils import add_days, now_datetime
+from paas.pricing import clear_pricing_context
 import json
 
 
@@ -262,3 +264,209 @@ class TestOrderAPI(FrappeTestCase):
         update_order_status(order.name, "Cancelled")
         self.test_stock.reload()
         self.assertEqual(self.test_stock.quantity, 10)
+
+    def test_delivered_order_updates_sales_counters(self):
+        def sold():
+            return frappe.db.get_value(
+                "Product Sales Counter", self.test_product.name,
+                ["total_qty", "qty_7d", "qty_30d"], as_dict=True
+            ) or frappe._dict(total_qty=0, qty_7d=0, qty_30d=0)
+
+        before = sold()
+        order = frappe.get_doc({
+            "doctype": "Order",
+            "user": self.test_user.name,
+            "shop": self.test_shop.name,
+            "order_items": [
+                {
+                    "product": self.test_product.name,
+                    "quantity": 3,
+                    "price": 100
+                }
+            ]
+        }).insert(ignore_permissions=True)
+        self.assertEqual(sold().total_qty, before.total_qty)
+
+        order.status = "Delivered"
+        order.save(ignore_permissions=True)
+        self.assertIsNotNone(order.delivered_at)
+        after = sold()
+        self.assertEqual(after.total_qty, before.total_qty + 3)
+        self.assertEqual(after.qty_7d, before.qty_7d + 3)
+        self.assertEqual(after.qty_30d, before.qty_30d + 3)
+
+        # Reversing a delivered order takes the quantities back out
+        order.status = "Cancelled"
+        order.save(ignore_permissions=True)
+        self.assertEqual(sold().total_qty, before.total_qty)
+
+    def test_create_order_substitutes_out_of_stock_lines(self):
+        alternative = frappe.get_doc({
+            "doctype": "Product",
+            "title": "Test Order Alternative",
+            "shop": self.test_shop.name,
+            "price": 80,
+            "cost": 50
+        }).insert(ignore_permissions=True)
+        frappe.get_doc({
+            "doctype": "Stock",
+            "shop": self.test_shop.name,
+            "product": alternative.name,
+            "price": 80,
+            "quantity": 5
+        }).insert(ignore_permissions=True)
+        self.test_stock.quantity = 0
+        self.test_stock.save(ignore_permissions=True)
+
+        order_dict = create_order(json.dumps({
+            "user": self.test_user.name,
+            "shop": self.test_shop.name,
+            "order_items": [
+                {
+                    "product": self.test_product.name,
+                    "quantity": 1,
+                    "alternative_product": alternative.name
+                },
+                {
+                    "product": alternative.name,
+                    "quantity": 2
+                }
+            ]
+        }))
+
+        order = frappe.get_doc("Order", order_dict["data"].get("name"))
+        substituted, regular = order.order_items
+        self.assertEqual(substituted.product, alternative.name)
+        self.assertEqual(substituted.original_product, self.test_product.name)
+        self.assertEqual(substituted.is_substituted, 1)
+        self.assertEqual(substituted.price, 80)
+        self.assertEqual(substituted.cost_price, 50)
+        self.assertEqual(regular.product, alternative.name)
+        self.assertEqual(regular.is_substituted, 0)
+
+    def test_accept_and_cancel_reserve_stock_exactly(self):
+        order = frappe.get_doc({
+            "doctype": "Order",
+            "user": self.test_user.name,
+            "shop": self.test_shop.name,
+            "order_items": [
+                {"product": self.test_product.name, "quantity": 2, "price": 100},
+                {"product": self.test_product.name, "quantity": 1, "price": 100}
+            ]
+        }).insert(ignore_permissions=True)
+
+        update_order_status(order.name, "Accepted")
+        self.test_stock.reload()
+        self.assertEqual(self.test_stock.quantity, 7)
+        reservations = frappe.get_all(
+            "Stock Reservation",
+            filters={"order": order.name},
+            fields=["quantity", "status"])
+        self.assertEqual(reservations, [{"quantity": 3, "status": "Reserved"}])
+
+        # Stock changes after acceptance must survive the cancellation
+        frappe.db.set_value("Stock", self.test_stock.name, "quantity", 20)
+        update_order_status(order.name, "Cancelled")
+        self.test_stock.reload()
+        self.assertEqual(self.test_stock.quantity, 23)
+        self.assertEqual(
+            frappe.db.get_value(
+                "Stock Reservation", {"order": order.name}, "status"),
+            "Released")
+
+    def test_accept_with_insufficient_stock_fails(self):
+        order = frappe.get_doc({
+            "doctype": "Order",
+            "user": self.test_user.name,
+            "shop": self.test_shop.name,
+            "order_items": [
+                {"product": self.test_product.name, "quantity": 11, "price": 100}
+            ]
+        }).insert(ignore_permissions=True)
+
+        with self.assertRaises(frappe.ValidationError):
+            update_order_status(order.name, "Accepted")
+        self.test_stock.reload()
+        self.assertEqual(self.test_stock.quantity, 10)
+
+    def test_accept_skips_products_without_stock_row(self):
+        untracked = frappe.get_doc({
+            "doctype": "Product",
+            "title": "Test Product Without Stock",
+            "shop": self.test_shop.name,
+            "price": 50,
+            "track_stock": 1
+        }).insert(ignore_permissions=True)
+        order = frappe.get_doc({
+            "doctype": "Order",
+            "user": self.test_user.name,
+            "shop": self.test_shop.name,
+            "order_items": [
+                {"product": self.test_product.name, "quantity": 2, "price": 100},
+                {"product": untracked.name, "quantity": 1, "price": 50}
+            ]
+        }).insert(ignore_permissions=True)
+
+        update_order_status(order.name, "Accepted")
+        self.test_stock.reload()
+        self.assertEqual(self.test_stock.quantity, 8)
+        self.assertEqual(
+            frappe.get_all(
+                "Stock Reservation",
+                filters={"order": order.name},
+                pluck="product"),
+            [self.test_product.name])
+
+    def test_get_calculate_quote(self):
+        cart = frappe.get_doc({
+            "doctype": "Cart",
+            "owner": self.test_user.name,
+            "shop": self.test_shop.name,
+            "items": [
+                {"item": self.test_product.name, "quantity": 2, "price": 100}
+            ]
+        }).insert(ignore_permissions=True)
+
+        quote = get_calculate(cart.name)["data"]
+        self.assertEqual(quote["price"], 200)
+        self.assertEqual(quote["total_shop_tax"], 20)
+        self.assertEqual(
+            quote["total_price"], 220 + quote["service_fee"])
+
+        # New coupons drop the cached pricing context for the shop
+        frappe.get_doc({
+            "doctype": "Coupon",
+            "shop": self.test_shop.name,
+            "code": "TESTQUOTE10",
+            "discount_type": "Percentage",
+            "discount_amount": 10,
+            "expired_at": add_days(now_datetime(), 1)
+        }).insert(ignore_permissions=True)
+
+        quote = get_calculate(cart.name, coupon_code="TESTQUOTE10")["data"]
+        self.assertEqual(quote["coupon_price"], 20)
+        self.assertEqual(
+            quote["total_price"], 200 + quote["service_fee"])
+
+    def test_order_reprices_only_on_pricing_changes(self):
+        order = frappe.get_doc({
+            "doctype": "Order",
+            "user": self.test_user.name,
+            "shop": self.test_shop.name,
+            "order_items": [
+                {"product": self.test_product.name, "quantity": 1, "price": 100}
+            ]
+        }).insert(ignore_permissions=True)
+        self.assertEqual(order.tax, 10)
+
+        frappe.db.set_value("Shop", self.test_shop.name, "tax", 50)
+        clear_pricing_context(self.test_shop.name)
+
+        # A status change keeps the totals the order was placed with
+        order.status = "Accepted"
+        order.save(ignore_permissions=True)
+        self.assertEqual(order.tax, 10)
+
+        order.order_items[0].quantity = 2
+        order.save(ignore_permissions=True)
+        self.assertEqual(order.tax, 100)
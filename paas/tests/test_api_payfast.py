@@ -3,6 +3,7 @@
 import json
 import frappe
 from frappe.tests.utils import FrappeTestCase
+from paas.api.payment.gateway_config import get_gateway_config
 from paas.api.payment.payment import get_payfast_settings, save_payfast_card, get_saved_payfast_cards, delete_payfast_card, handle_payfast_callback, process_payfast_token_payment
 
 
@@ -115,6 +116,21 @@ class TestPayFastAPI(FrappeTestCase):
         self.assertIn("merchant_id", settings)
         self.assertIn("merchant_key", settings)
 
+    def test_gateway_config_is_cached_until_saved(self):
+        config = get_gateway_config("PayFast")
+        self.assertIs(get_gateway_config("PayFast"), config)
+
+        gateway = frappe.get_doc("PaaS Payment Gateway", "PayFast")
+        gateway.append("settings", {"key": "test_key", "value": "test"})
+        gateway.save(ignore_permissions=True)
+
+        refreshed = get_gateway_config("PayFast")
+        self.assertIsNot(refreshed, config)
+        self.assertEqual(refreshed.get("test_key"), "test")
+        self.assertEqual(
+            get_payfast_settings()["merchant_id"],
+            refreshed.get("merchant_id"))
+
     def test_card_management(self):
         # Test saving, getting, and deleting a saved card
         frappe.set_user(self.test_user.name)
@@ -3,11 +3,15 @@
 import frappe
 from frappe.tests.utils import FrappeTestCase
 from unittest.mock import patch, Mock
+from paas.api.payment.http_client import clear_oauth_token
+from paas.api.payment.webhooks import process_payment_webhooks
 from paas.api.payment.payment import initiate_paypal_payment, handle_paypal_callback
 
 
 class TestPayPalAPI(FrappeTestCase):
     def setUp(self):
+        clear_oauth_token()
+
         # Create a test user
         if not frappe.db.exists("User", "test_paypal_user@example.com"):
             self.test_user = frappe.get_doc({
@@ -107,7 +111,7 @@ class TestPayPalAPI(FrappeTestCase):
             except Exception:
                 pass
 
-    @patch('paas.api.payment.payment.requests.post')
+    @patch('paas.api.payment.http_client.gateway_request')
     def test_initiate_paypal_payment(self, mock_post):
         # Mock the responses from PayPal API
         mock_auth_response = Mock()
@@ -130,9 +134,8 @@ class TestPayPalAPI(FrappeTestCase):
                 "Transaction", {
                     "payment_reference": "test_paypal_order_id"}))
 
-    @patch('paas.api.payment.payment.requests.get')
-    @patch('paas.api.payment.payment.requests.post')
-    def test_handle_paypal_callback(self, mock_post, mock_get):
+    @patch('paas.api.payment.http_client.gateway_request')
+    def test_handle_paypal_callback(self, mock_request):
         # Create a dummy transaction to be updated by the callback
         frappe.get_doc({
             "doctype": "Transaction",
@@ -146,16 +149,34 @@ class TestPayPalAPI(FrappeTestCase):
         mock_auth_response = Mock()
         mock_auth_response.json.return_value = {
             "access_token": "test_access_token"}
-        mock_post.return_value = mock_auth_response
 
         mock_order_response = Mock()
         mock_order_response.json.return_value = {"status": "COMPLETED"}
-        mock_get.return_value = mock_order_response
-
-        # Simulate a callback from PayPal
-        with patch('frappe.form_dict', {"token": "test_paypal_order_id_callback"}):
+        mock_request.side_effect = [mock_auth_response, mock_order_response]
+
+        # Simulate a callback from PayPal, delivered twice
+        frappe.local.response = frappe._dict()
+        with patch("frappe.form_dict", {
+                "token": "test_paypal_order_id_callback",
+                "PayerID": "test_payer"}), \
+                patch('frappe.enqueue'), patch('frappe.db.commit'):
+            handle_paypal_callback()
             handle_paypal_callback()
 
+        # The callback is queued once and not yet applied
+        self.assertEqual(
+            frappe.db.count(
+                "Payment Payload", {
+                    "idempotency_key": "PayPal:test_paypal_order_id_callback:approved",
+                    "status": "Pending"}), 1)
+        self.assertEqual(
+            frappe.db.get_value(
+                "Transaction", {"payment_reference": "test_paypal_order_id_callback"}, "status"),
+            "Pending")
+
+        with patch('frappe.db.commit'):
+            process_payment_webhooks()
+
         # Check if the transaction and order status were updated
         updated_transaction = frappe.get_doc(
             "Transaction", {
@@ -164,3 +185,70 @@ class TestPayPalAPI(FrappeTestCase):
 
         updated_order = frappe.get_doc("Order", self.test_order.name)
         self.assertEqual(updated_order.status, "Paid")
+
+    @patch('paas.api.payment.http_client.gateway_request')
+    def test_early_callback_does_not_block_real_one(self, mock_request):
+        frappe.get_doc({
+            "doctype": "Transaction",
+            "payable_type": "Order",
+            "payable_id": self.test_order.name,
+            "payment_reference": "test_paypal_order_id_early",
+            "status": "Pending"
+        }).insert(ignore_permissions=True)
+
+        mock_auth_response = Mock()
+        mock_auth_response.json.return_value = {
+            "access_token": "test_access_token"}
+        mock_approved = Mock()
+        mock_approved.json.return_value = {"status": "APPROVED"}
+        mock_completed = Mock()
+        mock_completed.json.return_value = {"status": "COMPLETED"}
+        mock_request.side_effect = [
+            mock_auth_response, mock_approved,
+            mock_auth_response, mock_completed]
+
+        frappe.local.response = frappe._dict()
+        with patch("frappe.form_dict", {
+                "token": "test_paypal_order_id_early",
+                "PayerID": "test_payer"}), \
+                patch('frappe.enqueue'), patch('frappe.db.commit'), \
+                patch('frappe.db.rollback'):
+            # Someone calls the endpoint before the order is completed
+            handle_paypal_callback()
+            process_payment_webhooks()
+            self.assertEqual(
+                frappe.db.get_value(
+                    "Transaction", {"payment_reference": "test_paypal_order_id_early"}, "status"),
+                "Pending")
+
+            # The buyer's real return is not dropped as a duplicate
+            handle_paypal_callback()
+            process_payment_webhooks()
+
+        self.assertEqual(
+            frappe.db.get_value(
+                "Transaction", {"payment_reference": "test_paypal_order_id_early"}, "status"),
+            "Paid")
+
+    @patch('paas.api.payment.http_client.gateway_request')
+    def test_revoked_token_is_refreshed_once(self, mock_request):
+        cached_auth = Mock()
+        cached_auth.json.return_value = {
+            "access_token": "revoked_token", "expires_in": 3600}
+        fresh_auth = Mock()
+        fresh_auth.json.return_value = {
+            "access_token": "fresh_token", "expires_in": 3600}
+        unauthorized = Mock(status_code=401)
+        created = Mock(status_code=201)
+        created.json.return_value = {"id": "test_paypal_order_id_401", "links": [
+            {"rel": "approve", "href": "https://www.sandbox.paypal.com/checkoutnow?token=test_paypal_order_id_401"}]}
+        mock_request.side_effect = [
+            cached_auth, unauthorized, fresh_auth, created]
+
+        response = initiate_paypal_payment(self.test_order.name)
+
+        self.assertIn("test_paypal_order_id_401", response["redirect_url"])
+        self.assertEqual(mock_request.call_count, 4)
+        self.assertEqual(
+            mock_request.call_args.kwargs["headers"]["Authorization"],
+            "Bearer fresh_token")
@@ -3,6 +3,7 @@
 import frappe
 from frappe.tests.utils import FrappeTestCase
 from unittest.mock import patch, Mock
+from paas.api.payment.webhooks import process_payment_webhooks
 from paas.api.payment.payment import initiate_paystack_payment, handle_paystack_callback
 
 
@@ -104,7 +105,7 @@ class TestPayStackAPI(FrappeTestCase):
             except Exception:
                 pass
 
-    @patch('paas.api.payment.payment.requests.post')
+    @patch('paas.api.payment.http_client.gateway_request')
     def test_initiate_paystack_payment(self, mock_post):
         # Mock the response from PayStack API
         mock_response = Mock()
@@ -128,7 +129,7 @@ class TestPayStackAPI(FrappeTestCase):
                 "Transaction", {
                     "payment_reference": "test_reference"}))
 
-    @patch('paas.api.payment.payment.requests.get')
+    @patch('paas.api.payment.http_client.gateway_request')
     def test_handle_paystack_callback(self, mock_get):
         # Create a dummy transaction to be updated by the callback
         frappe.get_doc({
@@ -144,9 +145,26 @@ class TestPayStackAPI(FrappeTestCase):
         mock_response.json.return_value = {"data": {"status": "success"}}
         mock_get.return_value = mock_response
 
-        # Simulate a callback from PayStack
-        with patch('frappe.form_dict', {"reference": "test_reference_callback"}):
+        # Simulate a callback from PayStack, delivered twice
+        frappe.local.response = frappe._dict()
+        with patch('frappe.form_dict', {"reference": "test_reference_callback"}), \
+                patch('frappe.enqueue'), patch('frappe.db.commit'):
             handle_paystack_callback()
+            handle_paystack_callback()
+
+        # The callback is queued once and not yet applied
+        self.assertEqual(
+            frappe.db.count(
+                "Payment Payload", {
+                    "idempotency_key": "PayStack:test_reference_callback:redirect",
+                    "status": "Pending"}), 1)
+        self.assertEqual(
+            frappe.db.get_value(
+                "Transaction", {"payment_reference": "test_reference_callback"}, "status"),
+            "Pending")
+
+        with patch('frappe.db.commit'):
+            process_payment_webhooks()
 
         # Check if the transaction and order status were updated
         updated_transaction = frappe.get_doc(
@@ -155,3 +173,46 @@ class TestPayStackAPI(FrappeTestCase):
 
         updated_order = frappe.get_doc("Order", self.test_order.name)
         self.assertEqual(updated_order.status, "Paid")
+
+    @patch('paas.api.payment.http_client.gateway_request')
+    def test_redelivery_retries_failed_callback(self, mock_get):
+        frappe.get_doc({
+            "doctype": "Transaction",
+            "payable_type": "Order",
+            "payable_id": self.test_order.name,
+            "payment_reference": "test_reference_retry",
+            "status": "Pending"
+        }).insert(ignore_permissions=True)
+
+        mock_response = Mock()
+        mock_response.json.return_value = {"data": {"status": "success"}}
+        # PayStack times out the first time round
+        mock_get.side_effect = [Exception("timed out"), mock_response]
+
+        frappe.local.response = frappe._dict()
+        with patch('frappe.form_dict', {"reference": "test_reference_retry"}), \
+                patch('frappe.enqueue'), patch('frappe.db.commit'), \
+                patch('frappe.db.rollback'):
+            handle_paystack_callback()
+            process_payment_webhooks()
+            self.assertEqual(
+                frappe.db.get_value(
+                    "Payment Payload",
+                    {"idempotency_key": "PayStack:test_reference_retry:redirect"},
+                    "status"),
+                "Failed")
+
+            # PayStack redelivers the same event
+            handle_paystack_callback()
+            process_payment_webhooks()
+
+        self.assertEqual(
+            frappe.db.get_value(
+                "Payment Payload",
+                {"idempotency_key": "PayStack:test_reference_retry:redirect"},
+                "status"),
+            "Processed")
+        self.assertEqual(
+            frappe.db.get_value(
+                "Transaction", {"payment_reference": "test_reference_retry"}, "status"),
+            "Paid")
@@ -170,3 +170,38 @@ class TestProductAPI(FrappeTestCase):
         self.assertIsNotNone(product_details)
         self.assertEqual(product_details['name'], "Test Product 1")
         self.assertEqual(product_details['uuid'], self.product.uuid)
+
+    def test_review_summary_drives_rating_filter(self):
+        """Reviews keep the Review Summary in sync with get_products."""
+        reviews = [
+            frappe.get_doc({
+                "doctype": "Review",
+                "reviewable_type": "Item",
+                "reviewable_id": self.product.name,
+                "user": "Administrator",
+                "rating": rating,
+            }).insert(ignore_permissions=True)
+            for rating in (4, 5)
+        ]
+
+        summary = frappe.get_doc(
+            "Review Summary", f"Item-{self.product.name}")
+        self.assertEqual(summary.review_count, 2)
+        self.assertAlmostEqual(summary.avg_rating, 4.5)
+
+        products = get_products(rating="4,5").get("data")
+        test_prod = next(
+            p for p in products if p['name'] == self.product.name)
+        self.assertEqual(test_prod["reviews"]["reviews_count"], 2)
+
+        reviews[1].delete(ignore_permissions=True)
+        summary.reload()
+        self.assertEqual(summary.review_count, 1)
+        self.assertAlmostEqual(summary.avg_rating, 4)
+
+        reviews[0].delete(ignore_permissions=True)
+        response = get_products(rating="4,5")
+        # An empty page is returned as a bare list
+        products = response.get("data") if response else []
+        self.assertNotIn(
+            self.product.name, [p['name'] for p in products])
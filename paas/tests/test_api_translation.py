@@ -0,0 +1,141 @@
+# Copyright (c) 2025 ROKCT INTELLIGENCE (PTY) LTD
+# For license information, please see license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from unittest.mock import patch
+from paas.api import translation
+from paas.api.translation import get_mobile_translations, run_translation_import
+
+
+class TestMobileTranslations(FrappeTestCase):
+    locale = "zz"
+
+    def setUp(self):
+        frappe.db.delete("PaaS Translation", {"locale": self.locale})
+        for key, value in (("hello", "Hello"), ("bye", "Bye")):
+            frappe.get_doc({
+                "doctype": "PaaS Translation",
+                "locale": self.locale,
+                "group": "mobile",
+                "key": key,
+                "value": value,
+                "status": 1
+            }).insert(ignore_permissions=True)
+        frappe.local.response = frappe._dict()
+
+    def tearDown(self):
+        frappe.db.rollback()
+
+    def test_bundle_versions_and_deltas(self):
+        full = get_mobile_translations(self.locale)
+        self.assertFalse(full["delta"])
+        self.assertEqual(full["data"], {"hello": "Hello", "bye": "Bye"})
+
+        # Unchanged bundle: nothing to send
+        self.assertIsNone(
+            get_mobile_translations(self.locale, version=full["version"]))
+        self.assertEqual(frappe.local.response["http_status_code"], 304)
+
+        doc = frappe.get_doc(
+            "PaaS Translation", {"locale": self.locale, "key": "hello"})
+        doc.value = "Hi"
+        doc.save(ignore_permissions=True)
+        frappe.delete_doc(
+            "PaaS Translation",
+            frappe.db.get_value(
+                "PaaS Translation", {"locale": self.locale, "key": "bye"}),
+            ignore_permissions=True)
+
+        delta = get_mobile_translations(self.locale, version=full["version"])
+        self.assertTrue(delta["delta"])
+        self.assertNotEqual(delta["version"], full["version"])
+        self.assertEqual(delta["data"], {"hello": "Hi"})
+        self.assertEqual(delta["deleted"], ["bye"])
+
+        unknown = get_mobile_translations(self.locale, version="unknown")
+        self.assertFalse(unknown["delta"])
+        self.assertEqual(unknown["data"], {"hello": "Hi"})
+
+    def test_bundle_history_is_trimmed(self):
+        frappe.cache.hdel(translation.TRANSLATION_VERSIONS_KEY, self.locale)
+        doc = frappe.get_doc(
+            "PaaS Translation", {"locale": self.locale, "key": "hello"})
+        versions = []
+        with patch.object(translation, "TRANSLATION_BUNDLE_HISTORY", 2):
+            for value in ("One", "Two", "Three"):
+                doc.value = value
+                doc.save(ignore_permissions=True)
+                versions.append(
+                    get_mobile_translations(self.locale)["version"])
+
+        # Each version is its own field; the oldest one has been dropped
+        self.assertIsNone(
+            translation._get_bundle_version(self.locale, versions[0]))
+        self.assertEqual(
+            translation._get_bundle_version(self.locale, versions[2]),
+            {"hello": "Three", "bye": "Bye"})
+        self.assertEqual(
+            frappe.cache.hget(
+                translation.TRANSLATION_VERSIONS_KEY, self.locale),
+            versions[1:])
+
+    def test_truncate_clears_bundles_again_on_commit(self):
+        get_mobile_translations(self.locale)
+        translation.truncate_translations()
+
+        # A request between the truncate and the commit recompiles the bundle
+        frappe.cache.hset(
+            translation.TRANSLATION_BUNDLE_KEY, self.locale,
+            {"version": "stale", "translations": {"hello": "Hello"}})
+        frappe.db.after_commit.run()
+
+        self.assertIsNone(
+            frappe.cache.hget(translation.TRANSLATION_BUNDLE_KEY, self.locale))
+
+    def test_import_upserts_in_bulk(self):
+        version = get_mobile_translations(self.locale)["version"]
+
+        csv = "key,locale,value,group\n" \
+            "hello,zz,Howdy,mobile\n" \
+            "bye,zz,Bye,mobile\n" \
+            "new,zz,New,web\n"
+        file_doc = frappe.get_doc({
+            "doctype": "File",
+            "file_name": "translations.csv",
+            "content": csv.encode(),
+            "is_private": 1
+        }).insert(ignore_permissions=True)
+
+        run_translation_import(file_doc.name)
+
+        rows = frappe.get_all(
+            "PaaS Translation",
+            filters={"locale": self.locale},
+            fields=["key", "value", "group"])
+        self.assertEqual(
+            {row.key: (row.value, row.group) for row in rows},
+            {
+                "hello": ("Howdy", "mobile"),
+                "bye": ("Bye", "mobile"),
+                "new": ("New", "web"),
+            })
+
+        delta = get_mobile_translations(self.locale, version=version)
+        self.assertEqual(delta["data"], {"hello": "Howdy", "new": "New"})
+
+    def test_export_streams_to_file(self):
+        from paas.exports import export_to_file
+
+        file_doc = export_to_file(
+            "PaaS Translation",
+            [("key", "key"), ("value", "value")],
+            "translations_test",
+            filters={"locale": self.locale},
+        )
+        content = file_doc.get_content()
+        if isinstance(content, bytes):
+            content = content.decode()
+        lines = content.splitlines()
+        self.assertEqual(lines[0], "key,value")
+        self.assertCountEqual(lines[1:], ["hello,Hello", "bye,Bye"])
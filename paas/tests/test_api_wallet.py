@@ -96,3 +96,31 @@ class TestWalletAPI(FrappeTestCase):
         history = get_wallet_history(start=1, limit=1)
         self.assertEqual(len(history["data"]), 1)
         self.assertEqual(history["data"][0].get("transaction_type"), "Topup")
+
+    def test_get_wallet_history_cursor(self):
+        frappe.get_doc({
+            "doctype": "Wallet History",
+            "uuid": str(uuid.uuid4()),
+            "wallet": self.wallet.name,
+            "transaction_type": "Withdraw",
+            "amount": 50.0,
+            "status": "Paid"
+        }).insert(ignore_permissions=True)
+
+        # An empty cursor opts into keyset paging from the first page
+        first = get_wallet_history(limit=1, cursor="")
+        self.assertEqual(len(first["data"]), 1)
+        self.assertTrue(first.get("next_cursor"))
+
+        second = get_wallet_history(limit=1, cursor=first["next_cursor"])
+        self.assertEqual(len(second["data"]), 1)
+        self.assertNotEqual(
+            first["data"][0]["name"], second["data"][0]["name"])
+
+        # The last page has no next_cursor
+        last = get_wallet_history(limit=1, cursor=second["next_cursor"])
+        self.assertEqual(last["data"], [])
+        self.assertNotIn("next_cursor", last)
+
+        with self.assertRaises(frappe.ValidationError):
+            get_wallet_history(limit=1, cursor="not-a-cursor")
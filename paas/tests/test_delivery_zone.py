@@ -6,7 +6,9 @@ import json
 from frappe.tests.utils import FrappeTestCase
 from paas.api.delivery_zone.delivery_zone import (
     create_delivery_zone,
-    check_delivery_availability
+    update_delivery_zone,
+    check_delivery_availability,
+    DeliveryZoneIndex
 )
 
 
@@ -66,3 +68,45 @@ class TestDeliveryZone(FrappeTestCase):
         # 4. Check point OUTSIDE polygon (5, 5)
         result_outside = check_delivery_availability(5, 5, self.shop.name)
         self.assertEqual(len(result_outside), 0)
+
+    def test_zone_index_refreshes_on_update(self):
+        zone = create_delivery_zone({
+            "shop": self.shop.name,
+            "coordinates": json.dumps([[10, 10], [20, 10], [20, 20], [10, 20]])
+        })
+        self.assertTrue(check_delivery_availability(15, 15, self.shop.name))
+
+        # Move the zone away from the point
+        update_delivery_zone(zone["name"], {
+            "coordinates": json.dumps([[30, 30], [40, 30], [40, 40], [30, 40]])
+        })
+        self.assertFalse(check_delivery_availability(15, 15, self.shop.name))
+        self.assertTrue(check_delivery_availability(35, 35, self.shop.name))
+
+    def test_zone_index_grid_prefilter(self):
+        # 1,000 small square zones on a grid, one per 0.5 degree
+        zones = []
+        for i in range(1000):
+            lng, lat = (i % 40) * 0.5, (i // 40) * 0.5
+            zones.append(frappe._dict(
+                name=f"zone-{i}",
+                shop=f"shop-{i}",
+                delivery_fee=0,
+                coordinates=json.dumps([
+                    [lng, lat], [lng + 0.4, lat],
+                    [lng + 0.4, lat + 0.4], [lng, lat + 0.4]
+                ])
+            ))
+        # One continent-sized zone lands in the wide list
+        zones.append(frappe._dict(
+            name="zone-wide", shop="shop-wide", delivery_fee=0,
+            coordinates=json.dumps([[-50, -50], [50, -50], [50, 50], [-50, 50]])
+        ))
+        index = DeliveryZoneIndex(zones)
+
+        self.assertEqual(index.wide, [1000])
+        self.assertLessEqual(len(list(index.candidates(0.2, 0.2))), 2)
+        hits = [z.name for z in index.lookup(0.2, 0.2)]
+        self.assertEqual(hits, ["zone-0", "zone-wide"])
+        hits = [z.name for z in index.lookup(0.45, 0.45)]
+        self.assertEqual(hits, ["zone-wide"])
@@ -3,7 +3,10 @@
 import frappe
 from frappe.tests.utils import FrappeTestCase
 from unittest.mock import patch, MagicMock
-from paas.api.payment.payment import initiate_flutterwave_payment, flutterwave_callback
+from paas.api.payment.gateway_config import GatewayConfig
+from paas.api.payment.gateways import get_gateway
+from paas.api.payment.payment import (
+    flutterwave_callback, initiate_flutterwave_payment)
 
 
 class TestFlutterwave(FrappeTestCase):
@@ -27,12 +30,17 @@ class TestFlutterwave(FrappeTestCase):
         self.order.payment_status = "Pending"
         self.order.grand_total = 100.00
 
-        # Create mock Flutterwave settings
-        self.flutterwave_settings = MagicMock()
-        self.flutterwave_settings.enabled = 1
-        self.flutterwave_settings.get_password.return_value = "test_secret_key"
-        self.flutterwave_settings.success_redirect_url = "https://test.com/success"
-        self.flutterwave_settings.failure_redirect_url = "https://test.com/failure"
+        # Mock Flutterwave configuration
+        self.flutterwave_config = GatewayConfig(
+            gateway="Flutterwave",
+            enabled=True,
+            success_redirect_url="https://test.com/success",
+            failure_redirect_url="https://test.com/failure",
+            settings={"secret_key": "test_secret_key"})
+        self.patcher_config = patch(
+            "paas.api.payment.gateways.get_gateway_config",
+            return_value=self.flutterwave_config)
+        self.patcher_config.start()
 
         # Patch get_website_settings to return a dummy logo
         self.patcher_settings = patch(
@@ -49,15 +57,15 @@ class TestFlutterwave(FrappeTestCase):
             frappe.local.response = self._original_response
         frappe.set_user("Administrator")
         self.patcher_settings.stop()
+        self.patcher_config.stop()
 
     @patch('paas.api.payment.payment.frappe.db.commit')
     @patch('paas.api.payment.payment.frappe.get_doc')
-    @patch('paas.api.payment.payment.requests.post')
+    @patch('paas.api.payment.http_client.gateway_request')
     def test_initiate_flutterwave_payment_success(
             self, mock_post, mock_get_doc, mock_commit):
         # Arrange
-        mock_get_doc.side_effect = [
-            self.order, self.flutterwave_settings, self.user]
+        mock_get_doc.return_value = self.order
 
         mock_response = MagicMock()
         mock_response.json.return_value = {
@@ -89,13 +97,40 @@ class TestFlutterwave(FrappeTestCase):
         with self.assertRaises(frappe.ValidationError):
             initiate_flutterwave_payment(self.order.name)
 
-    @patch('paas.api.payment.payment.frappe.db.commit')
+    @patch('paas.api.payment.payment.receive_webhook')
+    def test_flutterwave_callback_queues_payment(self, mock_receive):
+        # Arrange
+        frappe.request = MagicMock()
+        frappe.request.args = {
+            "status": "successful",
+            "tx_ref": "TEST-ORDER-001-12345",
+            "transaction_id": "FLW-TXN-123"
+        }
+        frappe.local.response = {}
+
+        # Act
+        flutterwave_callback()
+
+        # Assert
+        mock_receive.assert_called_once_with(
+            "Flutterwave",
+            {
+                "status": "successful",
+                "tx_ref": "TEST-ORDER-001-12345",
+                "transaction_id": "FLW-TXN-123"
+            },
+            "TEST-ORDER-001-12345:FLW-TXN-123:successful")
+        self.order.save.assert_not_called()
+        self.assertEqual(frappe.local.response["type"], "redirect")
+        self.assertEqual(
+            frappe.local.response["location"],
+            self.flutterwave_config.success_redirect_url)
+
     @patch('paas.api.payment.payment.frappe.get_doc')
-    @patch('paas.api.payment.payment.requests.get')
-    def test_flutterwave_callback_success(
-            self, mock_get, mock_get_doc, mock_commit):
+    @patch('paas.api.payment.http_client.gateway_request')
+    def test_verify_flutterwave_callback_success(self, mock_get, mock_get_doc):
         # Arrange
-        mock_get_doc.side_effect = [self.flutterwave_settings, self.order]
+        mock_get_doc.return_value = self.order
 
         mock_verification_response = MagicMock()
         mock_verification_response.json.return_value = {
@@ -107,16 +142,12 @@ class TestFlutterwave(FrappeTestCase):
         }
         mock_get.return_value = mock_verification_response
 
-        frappe.request = MagicMock()
-        frappe.request.args = {
+        # Act
+        get_gateway("Flutterwave").verify({
             "status": "successful",
             "tx_ref": "TEST-ORDER-001-12345",
             "transaction_id": "FLW-TXN-123"
-        }
-        frappe.local.response = {}
-
-        # Act
-        flutterwave_callback()
+        })
 
         # Assert
         self.assertEqual(self.order.payment_status, "Paid")
@@ -124,17 +155,12 @@ class TestFlutterwave(FrappeTestCase):
             self.order.custom_payment_transaction_id,
             "FLW-TXN-123")
         self.order.save.assert_called_once()
-        mock_commit.assert_called_once()
-        self.assertEqual(frappe.local.response["type"], "redirect")
-        self.assertEqual(
-            frappe.local.response["location"],
-            self.flutterwave_settings.success_redirect_url)
 
-    @patch('paas.api.payment.payment.frappe.db.commit')
+    @patch('paas.api.payment.payment.receive_webhook')
     @patch('paas.api.payment.payment.frappe.get_doc')
-    def test_flutterwave_callback_cancelled(self, mock_get_doc, mock_commit):
+    def test_flutterwave_callback_cancelled(self, mock_get_doc, mock_receive):
         # Arrange
-        mock_get_doc.side_effect = [self.flutterwave_settings, self.order]
+        mock_get_doc.return_value = self.order
 
         frappe.request = MagicMock()
         frappe.request.args = {
@@ -145,13 +171,13 @@ class TestFlutterwave(FrappeTestCase):
 
         # Act
         flutterwave_callback()
+        get_gateway("Flutterwave").verify(mock_receive.call_args.args[1])
 
         # Assert
         self.assertEqual(self.order.payment_status, "Failed")
         self.order.save.assert_called_once()
-        mock_commit.assert_called_once()
         self.assertEqual(frappe.local.response["type"], "redirect")
         self.assertIn(
-            self.flutterwave_settings.failure_redirect_url,
+            self.flutterwave_config.failure_redirect_url,
             frappe.local.response["location"])
         self.assertIn("reason=cancelled", frappe.local.response["location"])
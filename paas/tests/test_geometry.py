@@ -0,0 +1,72 @@
+# Copyright (c) 2025 ROKCT INTELLIGENCE (PTY) LTD
+# For license information, please see license.txt
+
+import json
+import unittest
+
+from paas.geometry import (
+    PolygonSet,
+    distance_fees,
+    haversine_km,
+    point_in_polygon,
+    points_in_polygon,
+    to_vertices,
+)
+
+# Square from (lng 10, lat 10) to (lng 20, lat 20) in GeoJSON order
+SQUARE = [[10, 10], [20, 10], [20, 20], [10, 20], [10, 10]]
+# Triangle that is not symmetric in lat/lng, to catch axis mix-ups
+TRIANGLE = [[0, 0], [10, 0], [0, 5]]
+
+
+class TestGeometry(unittest.TestCase):
+    def test_to_vertices_formats(self):
+        expected = [[10.0, 10.0], [20.0, 10.0], [20.0, 20.0]]
+        self.assertEqual(to_vertices(SQUARE[:3]).tolist(), expected)
+        self.assertEqual(
+            to_vertices(json.dumps(SQUARE[:3])).tolist(), expected)
+        self.assertEqual(
+            to_vertices([{"lat": 1, "lng": 2}]).tolist(), [[2.0, 1.0]])
+        self.assertEqual(
+            to_vertices([{"latitude": 1, "longitude": 2}]).tolist(),
+            [[2.0, 1.0]])
+        self.assertEqual(
+            to_vertices([[1, 2]], lat_first=True).tolist(), [[2.0, 1.0]])
+        self.assertEqual(to_vertices("not json").shape, (0, 2))
+
+    def test_point_in_polygon(self):
+        self.assertTrue(point_in_polygon(15, 15, SQUARE))
+        self.assertFalse(point_in_polygon(5, 5, SQUARE))
+        # lat 1, lng 6 is inside; lat 6, lng 1 is not
+        self.assertTrue(point_in_polygon(1, 6, TRIANGLE))
+        self.assertFalse(point_in_polygon(6, 1, TRIANGLE))
+        self.assertFalse(point_in_polygon(1, 1, []))
+
+    def test_points_in_polygon(self):
+        inside = points_in_polygon(
+            [15, 5, 19.9, 25], [15, 5, 10.1, 15], SQUARE)
+        self.assertEqual(inside.tolist(), [True, False, True, False])
+
+    def test_polygon_set(self):
+        big_square = [[0, 0], [30, 0], [30, 30], [0, 30]]
+        compiled = PolygonSet([SQUARE, "invalid", TRIANGLE, big_square])
+        self.assertEqual(
+            compiled.contains(15, 15).tolist(), [True, False, False, True])
+        self.assertEqual(
+            compiled.contains(1, 6).tolist(), [False, False, True, True])
+        self.assertEqual(PolygonSet([]).contains(1, 1).tolist(), [])
+
+    def test_haversine_km_broadcasts(self):
+        # One degree of latitude is ~111.19 km
+        self.assertAlmostEqual(float(haversine_km(0, 0, 1, 0)), 111.19, 2)
+        distances = haversine_km(0, 0, [0, 1, -1], [0, 0, 0])
+        self.assertEqual(distances.shape, (3,))
+        self.assertAlmostEqual(distances[0], 0)
+        self.assertAlmostEqual(distances[1], distances[2])
+
+    def test_distance_fees(self):
+        fees = distance_fees([0, 10, 100], base=5, per_km=2, minimum=10)
+        self.assertEqual(fees.tolist(), [10.0, 25.0, 205.0])
+        # One distance against many rate cards, None treated as 0
+        fees = distance_fees(10, base=[1, None], per_km=[None, 3])
+        self.assertEqual(fees.tolist(), [1.0, 30.0])
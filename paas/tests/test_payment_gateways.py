@@ -0,0 +1,96 @@
+# Copyright (c) 2025 ROKCT INTELLIGENCE (PTY) LTD
+# For license information, please see license.txt
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from unittest.mock import patch
+from paas.api.payment.gateways import get_gateway
+from paas.api.payment.payment import (
+    _charge_card_token, initiate_payment, process_wallet_top_up)
+from paas.api.payment.webhooks import process_payment_webhooks
+
+
+class TestFakeGateway(FrappeTestCase):
+    def setUp(self):
+        frappe.conf.fake_payment_gateway = 1
+        if not frappe.db.exists("User", "test_fake_gateway@example.com"):
+            frappe.get_doc({
+                "doctype": "User",
+                "email": "test_fake_gateway@example.com",
+                "first_name": "Fake",
+                "last_name": "Gateway"
+            }).insert(ignore_permissions=True)
+        self.user = "test_fake_gateway@example.com"
+
+        if not frappe.db.exists("PaaS Payment Gateway", "Fake"):
+            frappe.get_doc({
+                "doctype": "PaaS Payment Gateway",
+                "gateway_controller": "Fake",
+                "is_sandbox": 1,
+            }).insert(ignore_permissions=True)
+        self.set_failure_rate(0)
+
+        self.card = frappe.get_doc({
+            "doctype": "Saved Card",
+            "user": self.user,
+            "gateway": "Fake",
+            "token": frappe.generate_hash(length=12),
+            "last_four": "4242",
+            "card_type": "Visa",
+        }).insert(ignore_permissions=True)
+
+    def tearDown(self):
+        frappe.set_user("Administrator")
+        frappe.conf.fake_payment_gateway = 0
+        frappe.db.rollback()
+
+    def set_failure_rate(self, rate):
+        gateway = frappe.get_doc("PaaS Payment Gateway", "Fake")
+        gateway.set("settings", [{"key": "failure_rate", "value": rate}])
+        gateway.save(ignore_permissions=True)
+
+    def test_registry(self):
+        self.assertIsNone(get_gateway("Unknown", raise_exception=False))
+        self.assertTrue(get_gateway("PayFast").supports("charge_token"))
+        self.assertFalse(get_gateway("PayFast").supports("initiate"))
+
+    def test_token_charges_go_through_adapter(self):
+        result = _charge_card_token(
+            self.card.token, 10, "ZAR", "Test charge", self.user)
+        self.assertEqual(result["status"], "success")
+        self.assertTrue(result["data"]["reference"].startswith("fake-"))
+
+        self.set_failure_rate(1)
+        with self.assertRaises(frappe.ValidationError):
+            _charge_card_token(
+                self.card.token, 10, "ZAR", "Test charge", self.user)
+
+    def test_wallet_top_up(self):
+        frappe.set_user(self.user)
+        result = process_wallet_top_up(25, token=self.card.token)
+        self.assertEqual(result["status"], "success")
+        self.assertTrue(frappe.db.exists("Transaction", result["transaction_id"]))
+
+    def test_checkout_settles_through_inbox(self):
+        order = frappe.get_doc({
+            "doctype": "Order",
+            "user": self.user,
+            "total_price": 50,
+        }).insert(ignore_permissions=True)
+
+        frappe.set_user(self.user)
+        with patch("frappe.enqueue"), patch("frappe.db.commit"):
+            initiate_payment("Fake", order.name)
+            process_payment_webhooks()
+
+        self.assertEqual(
+            frappe.db.get_value(
+                "Transaction", {"payable_id": order.name}, "status"),
+            "Paid")
+        self.assertEqual(
+            frappe.db.get_value("Order", order.name, "status"), "Paid")
+
+    def test_disabled_without_site_config(self):
+        frappe.conf.fake_payment_gateway = 0
+        with self.assertRaises(frappe.PermissionError):
+            get_gateway("Fake").charge_token(
+                self.card.token, 10, "ZAR", "Test charge", self.user)
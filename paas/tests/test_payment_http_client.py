@@ -0,0 +1,83 @@
+# Copyright (c) 2025 ROKCT INTELLIGENCE (PTY) LTD
+# For license information, please see license.txt
+import unittest
+from unittest.mock import MagicMock, patch
+
+import requests
+from paas.api.payment import http_client
+
+
+def _response(status_code, data=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.json.return_value = data or {}
+    return response
+
+
+@patch("paas.api.payment.http_client.time.sleep")
+class TestGatewayHTTPClient(unittest.TestCase):
+    def setUp(self):
+        self.session = MagicMock()
+        patcher = patch(
+            "paas.api.payment.http_client.get_session",
+            return_value=self.session)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_idempotent_calls_are_retried(self, mock_sleep):
+        self.session.request.side_effect = [
+            requests.ConnectionError(), _response(503), _response(200)]
+
+        response = http_client.gateway_get("PayStack", "https://example.com")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.session.request.call_count, 3)
+        self.assertEqual(mock_sleep.call_count, 2)
+        self.assertEqual(
+            self.session.request.call_args.kwargs["timeout"],
+            http_client.GATEWAY_TIMEOUT)
+
+    def test_posts_are_not_retried(self, mock_sleep):
+        self.session.request.return_value = _response(503)
+
+        response = http_client.gateway_post("PayStack", "https://example.com")
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(self.session.request.call_count, 1)
+        mock_sleep.assert_not_called()
+
+        self.session.request.side_effect = requests.Timeout()
+        with self.assertRaises(requests.Timeout):
+            http_client.gateway_post("PayStack", "https://example.com")
+        self.assertEqual(self.session.request.call_count, 2)
+
+    @patch("paas.api.payment.http_client.frappe")
+    def test_oauth_token_is_cached_per_client(self, mock_frappe, mock_sleep):
+        store = {}
+        mock_frappe.cache.hget.side_effect = lambda key, field: store.get(
+            field)
+        mock_frappe.cache.hset.side_effect = (
+            lambda key, field, value: store.__setitem__(field, value))
+        self.session.request.return_value = _response(
+            200, {"access_token": "token-a", "expires_in": 3600})
+
+        for _ in range(3):
+            token = http_client.get_oauth_token(
+                "PayPal", "https://example.com/token", "client-a", "secret")
+        self.assertEqual(token, "token-a")
+        self.assertEqual(self.session.request.call_count, 1)
+
+        self.session.request.return_value = _response(
+            200, {"access_token": "token-b", "expires_in": 3600})
+        token = http_client.get_oauth_token(
+            "PayPal", "https://example.com/token", "client-b", "secret")
+        self.assertEqual(token, "token-b")
+        self.assertEqual(self.session.request.call_count, 2)
+
+        # Expired tokens are fetched again
+        store["client-a"]["expires_at"] = 0
+        self.session.request.return_value = _response(
+            200, {"access_token": "token-c", "expires_in": 3600})
+        token = http_client.get_oauth_token(
+            "PayPal", "https://example.com/token", "client-a", "secret")
+        self.assertEqual(token, "token-c")
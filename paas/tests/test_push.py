@@ -0,0 +1,106 @@
+# Copyright (c) 2025 ROKCT INTELLIGENCE (PTY) LTD
+# For license information, please see license.txt
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from unittest.mock import MagicMock, patch
+from paas.api.notification import push
+from paas.api.notification.notification import send_push_notification
+
+
+class TestPushFanOut(FrappeTestCase):
+    def setUp(self):
+        self.users = []
+        for index in range(2):
+            email = f"test_push_{index}@example.com"
+            if not frappe.db.exists("User", email):
+                frappe.get_doc({
+                    "doctype": "User",
+                    "email": email,
+                    "first_name": "Push",
+                    "send_welcome_email": 0
+                }).insert(ignore_permissions=True)
+            self.users.append(email)
+            frappe.db.delete("Device Token", {"user": email})
+
+        for user, token in (
+            (self.users[0], "token-a"),
+            (self.users[0], "token-dead"),
+            (self.users[1], "token-b"),
+            (self.users[1], "token-a"),
+        ):
+            frappe.get_doc({
+                "doctype": "Device Token",
+                "user": user,
+                "device_token": token,
+                "provider": "fcm"
+            }).insert(ignore_permissions=True)
+
+        settings = frappe._dict(server_key="test-key")
+        patcher = patch(
+            "paas.api.notification.push.get_settings", return_value=settings)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch(
+            "paas.api.notification.notification.get_settings",
+            return_value=settings)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        frappe.db.rollback()
+
+    def fcm_response(self, tokens):
+        response = MagicMock()
+        response.status_code = 200
+        response.json.return_value = {"results": [
+            {"error": "NotRegistered"} if token == "token-dead"
+            else {"message_id": token}
+            for token in tokens
+        ]}
+        return response
+
+    @patch("paas.api.notification.push._get_session")
+    def test_batches_and_prunes_dead_tokens(self, mock_session):
+        session = mock_session.return_value
+        session.post.side_effect = lambda url, headers, json, timeout: \
+            self.fcm_response(json["registration_ids"])
+
+        with patch.object(push, "FCM_BATCH_SIZE", 2):
+            result = send_push_notification(
+                frappe.as_json(self.users), "Title", "Body")
+
+        # Duplicate tokens are sent once, in batches of FCM_BATCH_SIZE
+        self.assertEqual(session.post.call_count, 2)
+        sent = [
+            token
+            for call in session.post.call_args_list
+            for token in call.kwargs["json"]["registration_ids"]
+        ]
+        self.assertCountEqual(sent, ["token-a", "token-dead", "token-b"])
+
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(result["details"]["sent"], 2)
+        self.assertEqual(result["details"]["failed"], 1)
+        self.assertEqual(result["details"]["pruned"], 1)
+        self.assertFalse(
+            frappe.db.exists("Device Token", {"device_token": "token-dead"}))
+
+    @patch("paas.api.notification.push._get_session")
+    def test_single_user(self, mock_session):
+        session = mock_session.return_value
+        session.post.side_effect = lambda url, headers, json, timeout: \
+            self.fcm_response(json["registration_ids"])
+
+        result = send_push_notification(self.users[1], "Title", "Body")
+
+        self.assertEqual(session.post.call_count, 1)
+        self.assertEqual(result["details"]["sent"], 2)
+
+    def test_multi_user_send_requires_admin(self):
+        frappe.set_user(self.users[0])
+        try:
+            with self.assertRaises(frappe.PermissionError):
+                send_push_notification(
+                    frappe.as_json(self.users), "Title", "Body")
+        finally:
+            frappe.set_user("Administrator")
@@ -14,10 +14,16 @@ class TestRemoteConfig(unittest.TestCase):
         self.db_get_single_value_patcher = patch('frappe.db.get_single_value')
         self.db_get_value_patcher = patch('frappe.db.get_value')
         self.get_doc_patcher = patch('frappe.get_doc')
+        self.cache_patcher = patch('frappe.cache')
+        self.request_header_patcher = patch(
+            'frappe.get_request_header', return_value=None)
 
         self.mock_db_get_single_value = self.db_get_single_value_patcher.start()
         self.mock_db_get_value = self.db_get_value_patcher.start()
         self.mock_get_doc = self.get_doc_patcher.start()
+        self.mock_cache = self.cache_patcher.start()
+        self.mock_cache.hget.return_value = None
+        self.mock_request_header = self.request_header_patcher.start()
 
         # Patch frappe.throw to raise Exception with the message
         self.throw_patcher = patch('frappe.throw',
@@ -35,6 +41,8 @@ class TestRemoteConfig(unittest.TestCase):
         self.db_get_single_value_patcher.stop()
         self.db_get_value_patcher.stop()
         self.get_doc_patcher.stop()
+        self.cache_patcher.stop()
+        self.request_header_patcher.stop()
 
     @patch('paas.api.remote_config.get_subscription_details')
     def test_get_remote_config_inactive_subscription(self, mock_get_sub):
@@ -115,3 +123,24 @@ class TestRemoteConfig(unittest.TestCase):
 
         # Verify Unique to Common
         self.assertEqual(config["localeCodeEn"], "en")
+
+        # The merged config is cached per app_type with its ETag
+        cache_key, app_type, cached = self.mock_cache.hset.call_args[0]
+        self.assertEqual(app_type, "Customer")
+        self.assertEqual(cached["config"], config)
+
+    @patch('paas.api.remote_config.get_subscription_details')
+    def test_get_remote_config_not_modified(self, mock_get_sub):
+        mock_get_sub.return_value = {'status': 'Active'}
+        self.mock_cache.hget.return_value = {
+            "etag": "abc123", "config": {"pinLoadingMin": 5}}
+        frappe.local.response = {}
+
+        self.mock_request_header.return_value = '"abc123"'
+        self.assertIsNone(get_remote_config(app_type="Customer"))
+        self.assertEqual(frappe.local.response["http_status_code"], 304)
+        self.mock_get_doc.assert_not_called()
+
+        self.mock_request_header.return_value = 'W/"stale"'
+        self.assertEqual(
+            get_remote_config(app_type="Customer"), {"pinLoadingMin": 5})
@@ -1,8 +1,11 @@
 import frappe
 from frappe.tests.utils import FrappeTestCase
+from unittest.mock import patch
 
 # Import the functions to be tested
-from paas.api.shop.shop import create_shop, get_shops, get_shop_details
+from paas.api.shop.shop import (
+    clear_shop_card_cache, create_shop, get_shop_cards, get_shops,
+    get_shop_details, get_shops_by_ids)
 
 
 class TestShopAPI(FrappeTestCase):
@@ -291,6 +294,106 @@ class TestShopAPI(FrappeTestCase):
             self.assertEqual(our_shops_asc[0]['id'], "Test Shop 1")
             self.assertEqual(our_shops_asc[1]['id'], "Test Shop 2")
 
+    def test_get_shops_distance_sorting(self):
+        """Test that shops are ordered by distance and coordinates are synced."""
+        import json
+
+        def _point(lat, lng):
+            return json.dumps({
+                "type": "FeatureCollection",
+                "features": [{
+                    "type": "Feature",
+                    "properties": {},
+                    "geometry": {"type": "Point", "coordinates": [lng, lat]}
+                }]
+            })
+
+        shop1 = frappe.get_doc("Shop", "Test Shop 1")
+        shop1.location = _point(-26.2041, 28.0473)
+        shop1.save(ignore_permissions=True)
+        shop2 = frappe.get_doc("Shop", "Test Shop 2")
+        shop2.location = _point(-33.9249, 18.4241)
+        shop2.save(ignore_permissions=True)
+
+        self.assertAlmostEqual(
+            frappe.db.get_value("Shop", "Test Shop 1", "latitude"), -26.2041)
+
+        # Near Test Shop 2 (Cape Town)
+        response = get_shops(
+            limit_page_length=100,
+            order_by="distance",
+            latitude=-33.92,
+            longitude=18.42)
+        ids = [s['id'] for s in response.get("data")]
+        self.assertLess(ids.index("Test Shop 2"), ids.index("Test Shop 1"))
+        self.assertLess(response.get("data")[0]["distance"], 5)
+
+        # radius_km excludes the far shop
+        response = get_shops(
+            limit_page_length=100,
+            order_by="distance",
+            latitude=-33.92,
+            longitude=18.42,
+            radius_km=50)
+        ids = [s['id'] for s in response.get("data")]
+        self.assertIn("Test Shop 2", ids)
+        self.assertNotIn("Test Shop 1", ids)
+
+
+    def test_get_shops_by_ids_hydrates_schedule(self):
+        """Test that shop cards include child rows fetched in bulk."""
+        shop1 = frappe.get_doc("Shop", "Test Shop 1")
+        shop1.set("booking_working_days", [
+            {"day": "Monday", "from_time": "08:00:00", "to_time": "17:00:00"},
+            {"day": "Tuesday", "from_time": "08:00:00", "to_time": "17:00:00",
+             "disabled": 1},
+        ])
+        shop1.save(ignore_permissions=True)
+
+        response = get_shops_by_ids(shop_ids=["Test Shop 1", "Test Shop 2"])
+        cards = {s['id']: s for s in response.get("data")}
+
+        self.assertEqual(
+            [d['day'] for d in cards["Test Shop 1"]['working_hours']],
+            ["Monday", "Tuesday"])
+        self.assertEqual(
+            [d['disabled'] for d in cards["Test Shop 1"]['working_hours']],
+            [0, 1])
+        self.assertEqual(cards["Test Shop 2"]['working_hours'], [])
+        self.assertEqual(cards["Test Shop 2"]['closed_dates'], [])
+        self.assertIn('enable_cod', cards["Test Shop 1"])
+
+    def test_shop_card_cache_invalidated_on_save(self):
+        """Test that cached shop cards are refreshed when the Shop changes."""
+        uuid = self.shop1.get("data")['uuid']
+        first = get_shop_details(uuid=uuid).get("data")
+        self.assertEqual(first['phone'], "+14155552671")
+
+        shop1 = frappe.get_doc("Shop", "Test Shop 1")
+        shop1.phone = "+14155550000"
+        shop1.save(ignore_permissions=True)
+
+        second = get_shop_details(uuid=uuid).get("data")
+        self.assertEqual(second['phone'], "+14155550000")
+
+    def test_shop_cards_served_from_cache(self):
+        """Test that a second read of the same shops does not rebuild them."""
+        clear_shop_card_cache()
+        first = get_shop_cards(["Test Shop 1", "Test Shop 2"])
+
+        with patch("paas.api.shop.shop._build_shop_projections") as build:
+            second = get_shop_cards(["Test Shop 1", "Test Shop 2"])
+
+        build.assert_not_called()
+        self.assertEqual(second, first)
+
+        clear_shop_card_cache("Test Shop 1")
+        with patch(
+                "paas.api.shop.shop._build_shop_projections",
+                return_value={}) as build:
+            get_shop_cards(["Test Shop 1", "Test Shop 2"])
+        self.assertEqual(
+            [shop.name for shop in build.call_args.args[0]], ["Test Shop 1"])
 
 if __name__ == '__main__':
     # This allows running the tests directly
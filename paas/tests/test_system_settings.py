@@ -37,3 +37,15 @@ class TestSystemSettingsAPI(FrappeTestCase):
         self.assertEqual(get_value("deliveryman_order_acceptance_time"), "10")
         self.assertEqual(get_value("google_maps_key"), "TEST_API_KEY")
         self.assertEqual(get_value("default_language"), "en")
+
+    def test_settings_cache_reloads_on_save(self):
+        from paas.settings_cache import get_settings
+
+        cached = get_settings("Settings")
+        self.assertIs(get_settings("Settings"), cached)
+
+        settings = frappe.get_single("Settings")
+        settings.project_title = "Renamed App"
+        settings.save()
+
+        self.assertEqual(get_settings("Settings").project_title, "Renamed App")
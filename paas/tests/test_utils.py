@@ -1,9 +1,11 @@
 # Copyright (c) 2025 ROKCT INTELLIGENCE (PTY) LTD
 # For license information, please see license.txt
 
+import frappe
 import unittest
 from unittest.mock import MagicMock, patch
 import paas.utils as utils
+from paas.api.utils import decode_cursor, get_page
 
 
 class TestUtils(unittest.TestCase):
@@ -50,3 +52,52 @@ class TestUtils(unittest.TestCase):
                 res = utils.check_subscription_feature("Feat")
                 self.assertEqual(res, mock_dec)
                 mock_core_check.assert_called_with("Feat")
+
+
+class TestGetPage(unittest.TestCase):
+    def setUp(self):
+        meta = MagicMock()
+        meta.get_field.side_effect = lambda fieldname: {
+            "payout_date": MagicMock(reqd=1, fieldtype="Date"),
+            "note_date": MagicMock(reqd=0, fieldtype="Date"),
+        }.get(fieldname)
+        patcher = patch("frappe.get_meta", return_value=meta)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_cursor_keeps_requested_sort(self):
+        getter = MagicMock(return_value=[
+            {"name": "P-1", "payout_date": "2025-01-02"},
+        ])
+        _, next_cursor = get_page(
+            "Seller Payout", cursor="", limit_page_length=1,
+            order_by="payout_date desc", getter=getter)
+
+        self.assertEqual(
+            getter.call_args.kwargs["order_by"], "payout_date desc, name desc")
+        self.assertEqual(
+            decode_cursor(next_cursor, "Seller Payout:payout_date:desc"),
+            ("2025-01-02", "P-1"))
+
+        get_page(
+            "Seller Payout", cursor=next_cursor, limit_page_length=1,
+            order_by="payout_date desc", getter=getter)
+        self.assertIn(
+            ["payout_date", "<=", "2025-01-02"],
+            getter.call_args.kwargs["filters"])
+
+    def test_cursor_rejects_nullable_sort(self):
+        with patch("frappe.throw", side_effect=frappe.ValidationError):
+            with self.assertRaises(frappe.ValidationError):
+                get_page(
+                    "Seller Payout", cursor="", order_by="note_date desc",
+                    getter=MagicMock(return_value=[]))
+
+    def test_offset_mode_passes_limit_through(self):
+        getter = MagicMock(return_value=[])
+        get_page(
+            "Seller Payout", limit_page_length=0,
+            order_by="payout_date desc", getter=getter)
+        self.assertEqual(getter.call_args.kwargs["limit"], 0)
+        self.assertEqual(
+            getter.call_args.kwargs["order_by"], "payout_date desc")
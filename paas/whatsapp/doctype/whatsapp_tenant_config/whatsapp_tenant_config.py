@@ -3,6 +3,7 @@
 
 import frappe
 from frappe.model.document import Document
+from paas.settings_cache import get_settings
 from cryptography.hazmat.primitives.asymmetric import rsa
 from cryptography.hazmat.primitives import serialization
 
@@ -48,7 +49,7 @@ def get_config():
     Returns public configuration for the WhatsApp / Flutter Tenant.
     """
     try:
-        config = frappe.get_single("WhatsApp Tenant Config")
+        config = get_settings("WhatsApp Tenant Config")
         return {
             "is_multi_vendor": bool(config.is_multi_vendor),
             "default_shop": config.default_shop
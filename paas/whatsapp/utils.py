@@ -2,14 +2,16 @@
 # For license information, please see license.txt
 
 import frappe
+from paas.settings_cache import get_settings
 
 
 def get_whatsapp_config():
     """
     Fetches the WhatsApp Tenant Configuration.
     Assumes Single Tenant Config per Site.
+    The doc is shared across requests; use frappe.get_single to edit it.
     """
-    config = frappe.get_single("WhatsApp Tenant Config")
+    config = get_settings("WhatsApp Tenant Config")
     if not config.enabled:
         return None
     return config